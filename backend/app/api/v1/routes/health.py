@@ -4,6 +4,8 @@ from datetime import datetime, timezone
 from fastapi import APIRouter
 from pydantic import BaseModel
 
+from app.services.transcription import get_circuit_breakers
+
 router = APIRouter()
 
 
@@ -12,6 +14,7 @@ class HealthResponse(BaseModel):
     status: str
     version: str
     time: datetime
+    breakers: dict[str, str] = {}
 
 
 @router.get("/health", response_model=HealthResponse)
@@ -19,10 +22,15 @@ async def health_check() -> HealthResponse:
     """
     Health check endpoint.
     
-    Returns the current server status, version, and time.
+    Returns the current server status, version, and time, plus the state of
+    each provider/model circuit breaker. Status is "degraded" while any
+    breaker is open; the server itself still accepts requests.
     """
+    breakers = get_circuit_breakers()
+    states = breakers.states() if breakers is not None else {}
     return HealthResponse(
-        status="ok",
+        status="degraded" if "open" in states.values() else "ok",
         version="v1",
         time=datetime.now(timezone.utc),
+        breakers=states,
     )
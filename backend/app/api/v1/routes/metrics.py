@@ -0,0 +1,29 @@
+"""Operational metrics endpoints"""
+from fastapi import APIRouter, Depends
+
+from app.core.metrics import collect_metrics
+from app.deps.auth import require_admin
+from app.services.transcription import ProviderRegistry, get_adaptive_router
+
+router = APIRouter()
+
+
+@router.get("/metrics", dependencies=[Depends(require_admin)])
+async def get_metrics() -> dict[str, dict]:
+    """
+    Get in-process metrics (caches, limiters, etc.).
+    
+    Requires the X-Admin-Key header; disabled unless admin_api_key is set.
+    """
+    return collect_metrics()
+
+
+@router.get("/routing", dependencies=[Depends(require_admin)])
+async def get_routing_table() -> dict:
+    """
+    Get the provider routing table: per (provider, model) latency and error
+    statistics, health, and the traffic weight adaptive routing gives each.
+    
+    Requires the X-Admin-Key header; disabled unless admin_api_key is set.
+    """
+    return get_adaptive_router().routing_table(ProviderRegistry.routing_candidates())
@@ -1,52 +1,124 @@
 """OpenAI Realtime API WebSocket proxy for streaming transcription"""
 import asyncio
 import base64
+import binascii
 import json
+import uuid
 from typing import Optional
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query
-import websockets
+from websockets.asyncio.client import ClientConnection
 from websockets.exceptions import ConnectionClosed
 
 from app.core.config import get_settings
 from app.core.logging import get_logger
+from app.services.realtime_pool import (
+    DEFAULT_REALTIME_MODEL,
+    connection_model_for,
+    get_realtime_pool,
+    open_realtime_connection,
+    session_update_event,
+)
+from app.services.realtime_queue import QueueOverflow, SessionQueue, get_session_queues
+from app.services.realtime_transcript import TranscriptAccumulator
+from app.services.realtime_vad import AUDIO, SPEECH_STARTED, SPEECH_STOPPED, StreamingVAD
 
 router = APIRouter()
 logger = get_logger(__name__)
 
-# OpenAI Realtime API endpoint
-OPENAI_REALTIME_URL = "wss://api.openai.com/v1/realtime"
+# input_audio_buffer.append event framing around base64 audio, so binary PCM16
+# frames are forwarded without building and serializing a dict per chunk
+AUDIO_APPEND_PREFIX = b'{"type":"input_audio_buffer.append","audio":"'
+AUDIO_APPEND_SUFFIX = b'"}'
 
-# Realtime API requires a realtime model for the connection
-# The transcription model is configured separately in session.update
-DEFAULT_REALTIME_MODEL = "gpt-4o-mini-realtime-preview"
+# Control events sent to OpenAI, serialized once
+COMMIT_EVENT = json.dumps({"type": "input_audio_buffer.commit"})
+CLEAR_EVENT = json.dumps({"type": "input_audio_buffer.clear"})
 
-# Mapping from user-facing model names to realtime connection models
-REALTIME_CONNECTION_MODELS = {
-    "gpt-4o-mini-transcribe": "gpt-4o-mini-realtime-preview",
-    "gpt-4o-transcribe": "gpt-4o-realtime-preview",
-    # Direct realtime models
-    "gpt-4o-mini-realtime-preview": "gpt-4o-mini-realtime-preview",
-    "gpt-4o-realtime-preview": "gpt-4o-realtime-preview",
-}
+# Commits issued by the local VAD carry event ids with this prefix, so that
+# upstream errors about them can be told apart
+LOCAL_COMMIT_PREFIX = "local_commit_"
+
+# How long transcript_final waits for the transcripts of pending local commits
+FINAL_TRANSCRIPT_TIMEOUT_S = 5.0
+
+# How long a finished session may take to send what is already queued
+DRAIN_TIMEOUT_S = 2.0
+
+# Realtime API input audio: PCM16 mono at 24 kHz
+REALTIME_SAMPLE_RATE = 24000
+
+
+def merge_client_events(queued: dict, new: dict) -> dict:
+    """Coalesce two queued client events of the same type"""
+    if new["type"] == "transcript_delta":
+        return {**new, "delta": queued["delta"] + new["delta"]}
+    return new
 
 
 class RealtimeTranscriptionSession:
-    """Manages a realtime transcription session between client and OpenAI"""
+    """
+    Manages a realtime transcription session between client and OpenAI.
+    
+    Each direction has a reader that parses incoming messages and a writer
+    that sends from a bounded queue, so a slow client or a stuck upstream
+    cannot stall the other side. Under overload, non-audio events follow the
+    realtime_queue_policies (drop, coalesce or replace); audio and final
+    transcripts are never dropped, and the session ends with an error if
+    their queue overflows.
+    
+    With realtime_vad_mode "local", client audio passes through a
+    StreamingVAD: silence is held back, speech_started / speech_stopped are
+    sent from here, and the buffer is committed when speech stops.
+    """
     
     def __init__(
         self,
         client_ws: WebSocket,
         model: str = DEFAULT_REALTIME_MODEL,
         language: str = "en",
+        transcript_mode: str = "full",
     ):
         self.client_ws = client_ws
         self.model = model
         self.language = language
-        self.openai_ws: Optional[websockets.WebSocketClientProtocol] = None
+        self.transcript_mode = transcript_mode
+        self.openai_ws: Optional[ClientConnection] = None
         self.is_running = False
-        self.accumulated_transcript = ""
         
+        settings = get_settings()
+        self.transcript = TranscriptAccumulator(settings.realtime_checkpoint_min_chars)
+        policies = settings.realtime_queue_policies_map
+        self.session_id = uuid.uuid4().hex[:12]
+        self.upstream_queue = SessionQueue("upstream", settings.realtime_upstream_queue_size, policies)
+        self.client_queue = SessionQueue(
+            "client",
+            settings.realtime_client_queue_size,
+            policies,
+            merge=merge_client_events,
+        )
+        
+        self.vad: Optional[StreamingVAD] = None
+        if settings.realtime_vad_mode == "local":
+            self.vad = StreamingVAD(
+                REALTIME_SAMPLE_RATE,
+                threshold_dbfs=settings.realtime_vad_threshold_dbfs,
+                min_speech_ms=settings.realtime_vad_min_speech_ms,
+                prefix_padding_ms=settings.realtime_vad_prefix_padding_ms,
+                silence_duration_ms=settings.realtime_vad_silence_duration_ms,
+            )
+        self.auto_commit = settings.realtime_vad_auto_commit
+        self.uncommitted_audio = False  # Audio sent upstream since the last commit
+        self.commits_sent = 0
+        self.pending_commits = 0  # Local commits still awaiting their transcript
+        self.final_requested = False
+        self._final_timer: Optional[asyncio.TimerHandle] = None
+        
+    @property
+    def accumulated_transcript(self) -> str:
+        """The transcript accumulated from deltas so far"""
+        return self.transcript.text
+    
     async def connect_to_openai(self) -> bool:
         """Establish connection to OpenAI Realtime API"""
         settings = get_settings()
@@ -57,29 +129,14 @@ class RealtimeTranscriptionSession:
         
         try:
             # Map the user-selected model to the realtime connection model
-            connection_model = REALTIME_CONNECTION_MODELS.get(
-                self.model, 
-                DEFAULT_REALTIME_MODEL
-            )
-            
-            # Connect to OpenAI Realtime API
-            url = f"{OPENAI_REALTIME_URL}?model={connection_model}"
-            headers = {
-                "Authorization": f"Bearer {settings.openai_api_key}",
-                "OpenAI-Beta": "realtime=v1",
-            }
+            connection_model = connection_model_for(self.model)
             
             logger.info(f"Connecting to OpenAI Realtime API", {
                 "user_model": self.model,
                 "connection_model": connection_model,
             })
             
-            self.openai_ws = await websockets.connect(
-                url,
-                additional_headers=headers,
-                ping_interval=30,
-                ping_timeout=10,
-            )
+            self.openai_ws = await open_realtime_connection(connection_model)
             
             logger.info(f"Connected to OpenAI Realtime API with model {connection_model}")
             return True
@@ -94,35 +151,25 @@ class RealtimeTranscriptionSession:
             return
         
         # Configure for transcription-only mode
-        config = {
-            "type": "session.update",
-            "session": {
-                "modalities": ["text"],
-                "input_audio_format": "pcm16",
-                "input_audio_transcription": {
-                    "model": "whisper-1",  # Transcription model
-                },
-                "turn_detection": {
-                    "type": "server_vad",
-                    "threshold": 0.5,
-                    "prefix_padding_ms": 300,
-                    "silence_duration_ms": 500,
-                },
-            }
-        }
-        
-        await self.openai_ws.send(json.dumps(config))
+        self.upstream_queue.put("session_update", json.dumps(session_update_event()))
         logger.debug("Sent session configuration to OpenAI")
     
     async def handle_client_messages(self):
         """Receive messages from client and forward to OpenAI"""
         try:
-            async for message in self.client_ws.iter_text():
-                if not self.is_running:
+            while self.is_running:
+                message = await self.client_ws.receive()
+                if message["type"] == "websocket.disconnect":
+                    logger.info("Client disconnected")
                     break
+                
+                # Binary frames are raw PCM16 audio
+                if message.get("bytes") is not None:
+                    await self.send_pcm_to_openai(message["bytes"])
+                    continue
                     
                 try:
-                    data = json.loads(message)
+                    data = json.loads(message.get("text") or "")
                     msg_type = data.get("type")
                     
                     if msg_type == "audio_chunk":
@@ -144,6 +191,8 @@ class RealtimeTranscriptionSession:
                     
         except WebSocketDisconnect:
             logger.info("Client disconnected")
+        except QueueOverflow:
+            raise
         except Exception as e:
             logger.error(f"Error handling client messages: {e}")
         finally:
@@ -172,7 +221,7 @@ class RealtimeTranscriptionSession:
                         
                     elif event_type == "session.updated":
                         logger.info("OpenAI session configured")
-                        await self.client_ws.send_json({
+                        self.send_to_client({
                             "type": "session_ready"
                         })
                         
@@ -180,106 +229,328 @@ class RealtimeTranscriptionSession:
                         # Partial transcription
                         delta = event.get("delta", "")
                         if delta:
-                            self.accumulated_transcript += delta
-                            await self.client_ws.send_json({
-                                "type": "transcript_delta",
-                                "delta": delta,
-                                "transcript": self.accumulated_transcript,
-                            })
+                            self.send_transcript_delta(delta)
                             
                     elif event_type == "conversation.item.input_audio_transcription.completed":
                         # Final transcription for this segment
                         transcript = event.get("transcript", "")
-                        await self.client_ws.send_json({
+                        self.send_to_client({
                             "type": "transcript_completed",
                             "transcript": transcript,
                         })
+                        self.segment_done()
+                        
+                    elif event_type == "conversation.item.input_audio_transcription.failed":
+                        logger.warning(f"OpenAI transcription failed: {event.get('error', {})}")
+                        self.segment_done()
                         
                     elif event_type == "input_audio_buffer.speech_started":
-                        await self.client_ws.send_json({
+                        self.send_to_client({
                             "type": "speech_started"
                         })
                         
                     elif event_type == "input_audio_buffer.speech_stopped":
-                        await self.client_ws.send_json({
+                        self.send_to_client({
                             "type": "speech_stopped"
                         })
                         
                     elif event_type == "input_audio_buffer.committed":
-                        await self.client_ws.send_json({
+                        self.send_to_client({
                             "type": "audio_committed"
                         })
                         
                     elif event_type == "response.done":
                         # Response complete - send final transcript
-                        await self.client_ws.send_json({
+                        self.send_to_client({
                             "type": "transcript_final",
-                            "transcript": self.accumulated_transcript,
+                            "seq": self.transcript.seq,
+                            "transcript": self.transcript.checkpoint(),
                         })
                         
                     elif event_type == "error":
                         error = event.get("error", {})
                         logger.error(f"OpenAI error: {error}")
-                        await self.client_ws.send_json({
+                        self.send_to_client({
                             "type": "error",
                             "error": error.get("message", "Unknown error"),
                         })
+                        if str(error.get("event_id") or "").startswith(LOCAL_COMMIT_PREFIX):
+                            # The commit was rejected (e.g. buffer too small); no transcript follows
+                            self.segment_done()
                         
                 except json.JSONDecodeError:
                     logger.warning("Received invalid JSON from OpenAI")
                     
         except ConnectionClosed:
             logger.info("OpenAI connection closed")
+        except QueueOverflow:
+            raise
         except Exception as e:
             logger.error(f"Error handling OpenAI messages: {e}")
         finally:
             self.is_running = False
     
+    def send_to_client(self, event: dict):
+        """Queue an event for the client"""
+        self.client_queue.put(event["type"], event)
+    
+    def send_transcript_delta(self, delta: str):
+        """
+        Accumulate a transcript delta and send it to the client.
+        
+        In "full" mode each delta carries the whole transcript so far. In
+        "delta" mode it carries only the new text, and the whole transcript
+        goes out in occasional transcript_checkpoint events, keeping the
+        cost per delta constant however long the dictation runs.
+        """
+        seq = self.transcript.append(delta)
+        if self.transcript_mode == "delta":
+            self.send_to_client({
+                "type": "transcript_delta",
+                "seq": seq,
+                "delta": delta,
+            })
+            if self.transcript.checkpoint_due():
+                self.send_to_client({
+                    "type": "transcript_checkpoint",
+                    "seq": seq,
+                    "transcript": self.transcript.checkpoint(),
+                })
+        else:
+            self.send_to_client({
+                "type": "transcript_delta",
+                "seq": seq,
+                "delta": delta,
+                "transcript": self.transcript.text,
+            })
+    
     async def send_audio_to_openai(self, audio_base64: str):
-        """Send audio chunk to OpenAI"""
-        if not self.openai_ws:
+        """Queue an audio chunk for OpenAI"""
+        if self.vad is not None:
+            # The VAD needs the samples
+            try:
+                pcm = base64.b64decode(audio_base64, validate=True)
+            except binascii.Error:
+                logger.warning("Dropped audio chunk with invalid base64")
+                return
+            await self.send_pcm_to_openai(pcm)
             return
-            
+        
+        self.upstream_queue.put("audio", json.dumps({
+            "type": "input_audio_buffer.append",
+            "audio": audio_base64,
+        }))
+    
+    async def send_pcm_to_openai(self, pcm: bytes):
+        """
+        Queue a raw PCM16 chunk for OpenAI.
+        
+        The append event is framed around the base64 audio as bytes and sent
+        as a text frame, skipping JSON serialization and UTF-8 re-encoding.
+        """
+        if len(pcm) % 2:
+            logger.warning(f"Dropped binary audio frame with odd length {len(pcm)}")
+            self.send_to_client({
+                "type": "error",
+                "error": "Binary audio frames must be PCM16 (an even number of bytes)",
+            })
+            return
+        
+        if self.vad is not None:
+            self.apply_vad_events(self.vad.feed(pcm))
+            return
+        
+        self.queue_pcm(pcm)
+    
+    def queue_pcm(self, pcm: bytes):
+        """Queue PCM16 audio as an append event"""
+        self.upstream_queue.put(
+            "audio",
+            b"".join((AUDIO_APPEND_PREFIX, base64.b64encode(pcm), AUDIO_APPEND_SUFFIX)),
+        )
+        self.uncommitted_audio = True
+    
+    def apply_vad_events(self, events: list[tuple[str, bytes]]):
+        """Forward gated audio and report speech boundaries to the client"""
+        for event, audio in events:
+            if event == AUDIO:
+                self.queue_pcm(audio)
+            elif event == SPEECH_STARTED:
+                self.send_to_client({"type": "speech_started"})
+            elif event == SPEECH_STOPPED:
+                self.send_to_client({"type": "speech_stopped"})
+                if self.auto_commit:
+                    self.commit_upstream()
+    
+    def commit_upstream(self):
+        """Commit the upstream buffer if audio was sent since the last commit"""
+        if not self.uncommitted_audio:
+            return
+        # Never coalesced: each one is counted in pending_commits
+        self.commits_sent += 1
+        self.upstream_queue.put("local_commit", json.dumps({
+            "type": "input_audio_buffer.commit",
+            "event_id": f"{LOCAL_COMMIT_PREFIX}{self.commits_sent}",
+        }))
+        self.uncommitted_audio = False
+        self.pending_commits += 1
+    
+    def segment_done(self):
+        """Note that a committed segment has been transcribed"""
+        if self.vad is None:
+            return  # response.done marks the end with server VAD
+        self.pending_commits = max(0, self.pending_commits - 1)
+        self.send_final_if_ready()
+    
+    def send_final_if_ready(self, timed_out: bool = False):
+        """
+        Send the final transcript once the client asked and no commits are
+        pending, or when waiting for them timed out.
+        """
+        if not self.final_requested or (self.pending_commits and not timed_out):
+            return
+        if self.pending_commits:
+            logger.warning(
+                f"Sending final transcript with {self.pending_commits} commit(s) unanswered "
+                f"in session {self.session_id}"
+            )
+            self.pending_commits = 0
+        self.final_requested = False
+        if self._final_timer is not None:
+            self._final_timer.cancel()
+            self._final_timer = None
+        self.send_to_client({
+            "type": "transcript_final",
+            "seq": self.transcript.seq,
+            "transcript": self.transcript.checkpoint(),
+        })
+    
+    def _final_timed_out(self):
+        self._final_timer = None
         try:
-            await self.openai_ws.send(json.dumps({
-                "type": "input_audio_buffer.append",
-                "audio": audio_base64,
-            }))
-        except Exception as e:
-            logger.error(f"Error sending audio to OpenAI: {e}")
+            self.send_final_if_ready(timed_out=True)
+        except QueueOverflow as e:
+            logger.warning(f"Dropped final transcript in session {self.session_id}: {e}")
     
     async def commit_audio(self):
         """Commit the audio buffer to signal end of input"""
-        if not self.openai_ws:
-            return
-            
-        try:
-            await self.openai_ws.send(json.dumps({
-                "type": "input_audio_buffer.commit",
-            }))
+        if self.vad is not None:
+            # Without server turn detection there is no response.done, so the
+            # final transcript follows the transcripts of all pending commits
+            self.apply_vad_events(self.vad.flush())
+            self.commit_upstream()
+            self.final_requested = True
+            self.send_final_if_ready()
+            if self.final_requested and self._final_timer is None:
+                self._final_timer = asyncio.get_running_loop().call_later(
+                    FINAL_TRANSCRIPT_TIMEOUT_S, self._final_timed_out
+                )
             logger.debug("Audio buffer committed")
-        except Exception as e:
-            logger.error(f"Error committing audio: {e}")
+            return
+        
+        self.upstream_queue.put("commit", COMMIT_EVENT)
+        logger.debug("Audio buffer committed")
     
     async def cancel_transcription(self):
         """Cancel the current transcription"""
-        if not self.openai_ws:
-            return
-            
+        self.upstream_queue.put("clear", CLEAR_EVENT)
+        logger.debug("Transcription cancelled")
+    
+    async def forward_to_openai(self):
+        """Send queued messages to OpenAI in order"""
         try:
-            await self.openai_ws.send(json.dumps({
-                "type": "input_audio_buffer.clear",
-            }))
-            logger.debug("Transcription cancelled")
+            while (message := await self.upstream_queue.get()) is not None:
+                await self.openai_ws.send(message, text=True)
+        except ConnectionClosed:
+            logger.info("OpenAI connection closed")
         except Exception as e:
-            logger.error(f"Error cancelling transcription: {e}")
+            logger.error(f"Error sending to OpenAI: {e}")
+    
+    async def forward_to_client(self):
+        """Send queued events to the client in order"""
+        try:
+            while (event := await self.client_queue.get()) is not None:
+                await self.client_ws.send_json(event)
+        except WebSocketDisconnect:
+            logger.info("Client disconnected")
+        except Exception as e:
+            logger.error(f"Error sending to client: {e}")
+    
+    async def proxy(self):
+        """
+        Run both directions until either side stops.
+        
+        Then both readers stop and the writers get up to DRAIN_TIMEOUT_S to
+        send what is already queued (trailing transcripts and errors). If a
+        queue overflows, the client is told (best effort) and the session
+        ends without draining.
+        """
+        session_queues = get_session_queues()
+        session_queues.add(self.session_id, {"upstream": self.upstream_queue, "client": self.client_queue})
+        readers = [
+            asyncio.create_task(self.handle_client_messages()),
+            asyncio.create_task(self.handle_openai_messages()),
+        ]
+        writers = [
+            asyncio.create_task(self.forward_to_openai()),
+            asyncio.create_task(self.forward_to_client()),
+        ]
+        tasks = readers + writers
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            if not any(isinstance(task.exception(), QueueOverflow) for task in done):
+                for task in readers:
+                    task.cancel()
+                await asyncio.wait(readers)
+                self.upstream_queue.close()
+                self.client_queue.close()
+                await asyncio.wait(writers, timeout=DRAIN_TIMEOUT_S)
+        finally:
+            pending = [task for task in tasks if not task.done()]
+            for task in pending:
+                task.cancel()
+            if self._final_timer is not None:
+                self._final_timer.cancel()
+            session_queues.remove(self.session_id)
+        if pending:
+            await asyncio.wait(pending)
+        if self.vad is not None and self.vad.frames_in:
+            logger.info(
+                f"Local VAD forwarded {self.vad.frames_sent} of {self.vad.frames_in} audio frames "
+                f"in session {self.session_id}"
+            )
+        
+        for task in tasks:
+            error = None if task.cancelled() else task.exception()
+            if isinstance(error, QueueOverflow):
+                session_queues.overflows += 1
+                logger.warning(f"Ending realtime session {self.session_id}: {error}")
+                try:
+                    async with asyncio.timeout(1):
+                        await self.client_ws.send_json({
+                            "type": "error",
+                            "error": "Session overloaded",
+                        })
+                except Exception:
+                    pass
+            elif error is not None:
+                raise error
     
     async def run(self):
         """Run the bidirectional proxy"""
         self.is_running = True
         
-        # Connect to OpenAI
-        if not await self.connect_to_openai():
+        # Take a pre-warmed, already configured session when one is ready
+        pool = get_realtime_pool()
+        self.openai_ws = pool.acquire(connection_model_for(self.model)) if pool is not None else None
+        if self.openai_ws is not None:
+            logger.info("Using pre-warmed OpenAI Realtime session")
+            await self.client_ws.send_json({
+                "type": "session_ready"
+            })
+        
+        # Otherwise connect to OpenAI
+        elif not await self.connect_to_openai():
             await self.client_ws.send_json({
                 "type": "error",
                 "error": "Failed to connect to OpenAI Realtime API",
@@ -287,11 +558,7 @@ class RealtimeTranscriptionSession:
             return
         
         try:
-            # Run both message handlers concurrently
-            await asyncio.gather(
-                self.handle_client_messages(),
-                self.handle_openai_messages(),
-            )
+            await self.proxy()
         finally:
             await self.cleanup()
     
@@ -312,6 +579,7 @@ async def realtime_transcribe(
     websocket: WebSocket,
     model: str = Query(default=DEFAULT_REALTIME_MODEL),
     language: str = Query(default="en"),
+    transcript_mode: str = Query(default="full", pattern="^(full|delta)$"),
 ):
     """
     WebSocket endpoint for realtime audio transcription.
@@ -319,15 +587,18 @@ async def realtime_transcribe(
     Proxies audio to OpenAI Realtime API and streams transcription back.
     
     Client Protocol:
-    - Send: {"type": "audio_chunk", "data": "<base64 PCM audio>"}
+    - Send: binary frames of raw PCM16 audio (24 kHz mono, little-endian)
+    - Send: {"type": "audio_chunk", "data": "<base64 PCM audio>"} (same audio as text)
     - Send: {"type": "commit"} when done speaking
     - Send: {"type": "cancel"} to cancel
     
     Server Protocol:
     - Receive: {"type": "session_ready"}
-    - Receive: {"type": "transcript_delta", "delta": "...", "transcript": "..."}
+    - Receive: {"type": "transcript_delta", "seq": 1, "delta": "...", "transcript": "..."}
+      (with transcript_mode=delta: no "transcript", plus occasional
+      {"type": "transcript_checkpoint", "seq": 1, "transcript": "..."})
     - Receive: {"type": "transcript_completed", "transcript": "..."}
-    - Receive: {"type": "transcript_final", "transcript": "..."}
+    - Receive: {"type": "transcript_final", "seq": 1, "transcript": "..."}
     - Receive: {"type": "error", "error": "..."}
     """
     await websocket.accept()
@@ -340,6 +611,7 @@ async def realtime_transcribe(
         client_ws=websocket,
         model=model,
         language=language,
+        transcript_mode=transcript_mode,
     )
     
     try:
@@ -1,7 +1,8 @@
 """Stats endpoint"""
-from typing import Literal
+import hashlib
+from typing import Annotated, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
 
 from app.core.logging import get_logger
 from app.deps.auth import AuthenticatedUser
@@ -11,24 +12,53 @@ from app.services.usage import get_usage_service, UsageService
 router = APIRouter()
 logger = get_logger(__name__)
 
+# Clients may keep the response but must revalidate it (cheap 304) each poll
+STATS_CACHE_CONTROL = "private, no-cache"
+
+
+def stats_etag(stats: StatsResponse) -> str:
+    """Strong ETag over the serialized stats"""
+    digest = hashlib.sha256(stats.model_dump_json().encode()).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag"""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
 
 @router.get("/stats", response_model=StatsResponse)
 async def get_stats(
     user: AuthenticatedUser,
+    response: Response,
     range: Literal["today", "7d", "30d"] = Query(default="today", description="Time range for stats"),
+    if_none_match: Annotated[Optional[str], Header(alias="If-None-Match")] = None,
     usage_service: UsageService = Depends(get_usage_service),
 ) -> StatsResponse:
     """
     Get usage statistics for the authenticated user.
     
-    Returns transcription metrics for the specified time range.
+    Returns transcription metrics for the specified time range: since
+    midnight UTC for 'today', the rolling last 7 or 30 days otherwise.
+    Responses carry an ETag; send it back in If-None-Match to get a
+    304 Not Modified when nothing has changed.
     """
     try:
-        stats = await usage_service.get_stats(user.id, range)
-        return StatsResponse(**stats)
+        stats = StatsResponse(**await usage_service.get_stats(user.id, range))
     except Exception as e:
         logger.error(f"Failed to get stats: {e}", extra={"user_id": user.id})
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to retrieve statistics",
         )
+    
+    etag = stats_etag(stats)
+    headers = {"ETag": etag, "Cache-Control": STATS_CACHE_CONTROL}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    response.headers.update(headers)
+    return stats
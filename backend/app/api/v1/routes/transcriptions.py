@@ -1,17 +1,31 @@
-"""Transcription endpoint"""
+"""Transcription endpoints"""
+import math
 from datetime import datetime, timezone
-from typing import Annotated, Optional
+from typing import Annotated, Awaitable, Callable, Optional
 
-from fastapi import APIRouter, Depends, File, Form, Header, HTTPException, UploadFile, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, status
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
 
+from app.core.admission import AdmissionRejected, get_request_admission
 from app.core.config import get_settings, Settings
 from app.core.logging import get_logger
 from app.db.models import TranscriptionRequestCreate
 from app.deps.auth import AuthenticatedUser
 from app.deps.request_context import RequestTiming, generate_request_id
-from app.schemas.transcriptions import TranscriptionResponse, TimingInfo
-from app.services.transcription import get_provider, TranscriptionError
-from app.services.usage import get_usage_service, UsageService
+from app.deps.upload import read_multipart_upload, read_raw_upload
+from app.schemas.transcriptions import TranscriptionForm, TranscriptionResponse, TimingInfo
+from app.services.audio import get_audio_chunker, get_audio_transcoder, get_silence_trimmer
+from app.services.transcription import (
+    get_provider,
+    ProviderBusyError,
+    ProviderUnavailableError,
+    TranscriptionError,
+    TranscriptionResult,
+    transcribe_chunks,
+)
+from app.services.idempotency import get_inflight_transcriptions
+from app.services.usage import DuplicateTranscriptionError, get_usage_service, UsageService
 
 router = APIRouter()
 logger = get_logger(__name__)
@@ -20,62 +34,274 @@ logger = get_logger(__name__)
 ALLOWED_FORMATS = {"m4a", "mp4", "wav", "mp3", "aac", "ogg", "flac", "webm"}
 
 
-@router.post("/transcriptions", response_model=TranscriptionResponse)
+def response_from_record(record: dict, request_id: str) -> TranscriptionResponse:
+    """Build a response from a stored transcription_requests row"""
+    return TranscriptionResponse(
+        id=record["id"],
+        text=record["transcript_text"],
+        duration_ms=record["duration_ms"],
+        language=record.get("language", "en"),
+        provider=record.get("provider", "gemini"),
+        model=record.get("model", "gemini-2.5-flash-lite"),
+        created_at=record["created_at"],
+        request_id=request_id,
+        timing=TimingInfo(
+            provider_latency_ms=record.get("provider_latency_ms", 0),
+            total_latency_ms=record.get("total_latency_ms", 0),
+        ),
+    )
+
+
+def parse_transcription_form(fields: dict[str, str], has_audio: bool) -> TranscriptionForm:
+    """Validate multipart form fields, reporting errors like FastAPI's Form() params"""
+    errors = []
+    if not has_audio:
+        errors.append({"type": "missing", "loc": ("body", "audio"), "msg": "Field required", "input": None})
+    try:
+        form = TranscriptionForm.model_validate(fields)
+    except ValidationError as e:
+        errors.extend({**err, "loc": ("body", *err["loc"])} for err in e.errors())
+    if errors:
+        raise RequestValidationError(errors)
+    return form
+
+
+# Request body schema for the docs (the body is parsed by read_multipart_upload)
+MULTIPART_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["audio", "duration_ms", "audio_format"],
+                    "properties": {
+                        "audio": {"type": "string", "format": "binary", "description": "Audio file to transcribe"},
+                        **TranscriptionForm.model_json_schema()["properties"],
+                    },
+                },
+            },
+        },
+    },
+}
+
+
+# Headers accepted by the raw endpoint; a query parameter of the field's name wins
+RAW_METADATA_HEADERS = {
+    "duration_ms": "X-Duration-Ms",
+    "audio_format": "X-Audio-Format",
+    "language": "X-Language",
+    "noisy_room": "X-Noisy-Room",
+    "provider": "X-Provider",
+    "model": "X-Model",
+}
+
+
+def parse_raw_metadata(request: Request) -> TranscriptionForm:
+    """Validate raw-upload metadata from query parameters or X-* headers"""
+    fields = {}
+    sources = {}
+    for name, header in RAW_METADATA_HEADERS.items():
+        if name in request.query_params:
+            fields[name] = request.query_params[name]
+            sources[name] = ("query", name)
+        elif header in request.headers:
+            fields[name] = request.headers[header]
+            sources[name] = ("header", header)
+    try:
+        return TranscriptionForm.model_validate(fields)
+    except ValidationError as e:
+        raise RequestValidationError([
+            {**err, "loc": sources.get(err["loc"][0], ("query", *err["loc"]))}
+            for err in e.errors()
+        ])
+
+
+# Request body and metadata schema for the docs of the raw endpoint
+RAW_OPENAPI = {
+    "parameters": [
+        {
+            "name": name,
+            "in": "query",
+            "required": name in ("duration_ms", "audio_format"),
+            "schema": schema,
+            "description": f"{schema.get('description', '')} (or the {RAW_METADATA_HEADERS[name]} header)",
+        }
+        for name, schema in TranscriptionForm.model_json_schema()["properties"].items()
+    ],
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/octet-stream": {"schema": {"type": "string", "format": "binary"}},
+        },
+    },
+}
+
+
+@router.post("/transcriptions", response_model=TranscriptionResponse, openapi_extra=MULTIPART_OPENAPI)
 async def create_transcription(
+    request: Request,
     user: AuthenticatedUser,
-    audio: Annotated[UploadFile, File(description="Audio file to transcribe")],
-    duration_ms: Annotated[int, Form(description="Audio duration in milliseconds", gt=0)],
-    audio_format: Annotated[str, Form(description="Audio format (e.g., m4a, wav)")],
     idempotency_key: Annotated[str, Header(alias="Idempotency-Key")],
-    language: Annotated[str, Form(description="Target language")] = "en",
-    noisy_room: Annotated[bool, Form(description="Noisy room flag")] = False,
-    provider: Annotated[Optional[str], Form(description="Transcription provider (gemini, openai)")] = None,
-    model: Annotated[Optional[str], Form(description="Model to use for transcription")] = None,
     x_client_request_id: Annotated[Optional[str], Header(alias="X-Client-Request-Id")] = None,
     settings: Settings = Depends(get_settings),
     usage_service: UsageService = Depends(get_usage_service),
 ) -> TranscriptionResponse:
     """
-    Transcribe uploaded audio using Gemini.
+    Transcribe uploaded audio.
     
     Requires authentication via Supabase JWT.
     Supports idempotency via Idempotency-Key header.
     
-    Audio is processed in-memory and not stored on the server.
+    Audio is processed in-memory and not stored on the server. The multipart
+    body is streamed and rejected with 413 as soon as it passes the size
+    limit; it is not read at all when the idempotency key was already used.
     """
     timing = RequestTiming()
     request_id = x_client_request_id or generate_request_id()
     
-    # Validate audio format
-    format_lower = audio_format.lower()
-    if format_lower not in ALLOWED_FORMATS:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Unsupported audio format: {audio_format}. Allowed: {', '.join(ALLOWED_FORMATS)}",
+    async def run() -> TranscriptionResponse:
+        upload = await read_multipart_upload(request, "audio", settings.max_audio_bytes)
+        form = parse_transcription_form(upload.fields, has_audio=upload.file_bytes is not None)
+        return await transcribe_and_record(
+            user_id=user.id,
+            idempotency_key=idempotency_key,
+            audio_bytes=upload.file_bytes,
+            form=form,
+            request_id=request_id,
+            timing=timing,
+            settings=settings,
+            usage_service=usage_service,
         )
     
+    return await run_once(user.id, idempotency_key, request_id, usage_service, run)
+
+
+@router.post("/transcriptions:raw", response_model=TranscriptionResponse, openapi_extra=RAW_OPENAPI)
+async def create_raw_transcription(
+    request: Request,
+    user: AuthenticatedUser,
+    idempotency_key: Annotated[str, Header(alias="Idempotency-Key")],
+    x_client_request_id: Annotated[Optional[str], Header(alias="X-Client-Request-Id")] = None,
+    settings: Settings = Depends(get_settings),
+    usage_service: UsageService = Depends(get_usage_service),
+) -> TranscriptionResponse:
+    """
+    Transcribe audio sent as the raw request body.
+    
+    Same behaviour as POST /v1/transcriptions, without multipart framing:
+    the body is the audio (application/octet-stream or audio/*) and the
+    metadata comes from query parameters or X-* headers.
+    """
+    timing = RequestTiming()
+    request_id = x_client_request_id or generate_request_id()
+    
+    async def run() -> TranscriptionResponse:
+        form = parse_raw_metadata(request)
+        audio_bytes = await read_raw_upload(request, settings.max_audio_bytes)
+        return await transcribe_and_record(
+            user_id=user.id,
+            idempotency_key=idempotency_key,
+            audio_bytes=audio_bytes,
+            form=form,
+            request_id=request_id,
+            timing=timing,
+            settings=settings,
+            usage_service=usage_service,
+        )
+    
+    return await run_once(user.id, idempotency_key, request_id, usage_service, run)
+
+
+async def run_once(
+    user_id: str,
+    idempotency_key: str,
+    request_id: str,
+    usage_service: UsageService,
+    run: Callable[[], Awaitable[TranscriptionResponse]],
+) -> TranscriptionResponse:
+    """
+    Run a transcription at most once per (user, Idempotency-Key).
+    
+    Returns the stored result when the key was already used, and joins an
+    in-flight request for the same key (outbox retries) instead of running
+    a second one.
+    """
     # Check idempotency - return existing result if found
-    existing = await usage_service.check_idempotency(user.id, idempotency_key)
+    existing = await usage_service.check_idempotency(user_id, idempotency_key)
     if existing:
         logger.info(f"Returning cached transcription for idempotency key", extra={"request_id": request_id})
-        return TranscriptionResponse(
-            id=existing["id"],
-            text=existing["transcript_text"],
-            duration_ms=existing["duration_ms"],
-            language=existing.get("language", "en"),
-            provider=existing.get("provider", "gemini"),
-            model=existing.get("model", "gemini-2.5-flash-lite"),
-            created_at=existing["created_at"],
-            request_id=request_id,
-            timing=TimingInfo(
-                provider_latency_ms=existing.get("provider_latency_ms", 0),
-                total_latency_ms=existing.get("total_latency_ms", 0),
+        return response_from_record(existing, request_id)
+    
+    response = await get_inflight_transcriptions().do(
+        (user_id, idempotency_key),
+        lambda: run_admitted(request_id, run),
+    )
+    return response.model_copy(update={"request_id": request_id})
+
+
+async def run_admitted(
+    request_id: str,
+    run: Callable[[], Awaitable[TranscriptionResponse]],
+) -> TranscriptionResponse:
+    """
+    Run a transcription once admission control lets it in.
+    
+    The slot is taken before the audio is read, bounding how much audio the
+    process holds at once. Requests are rejected with 429 when the wait queue
+    is full and 503 when their wait would pass the deadline.
+    """
+    admission = get_request_admission()
+    if admission is None:
+        return await run()
+    
+    try:
+        await admission.acquire()
+    except AdmissionRejected as e:
+        logger.warning(f"Request not admitted: {e}", extra={"request_id": request_id})
+        raise HTTPException(
+            status_code=(
+                status.HTTP_429_TOO_MANY_REQUESTS
+                if e.reason == "queue_full"
+                else status.HTTP_503_SERVICE_UNAVAILABLE
             ),
+            detail="Too many transcriptions in progress. Please retry.",
+            headers={"Retry-After": str(math.ceil(e.retry_after_s))},
         )
+    try:
+        return await run()
+    finally:
+        admission.release()
+
+
+async def transcribe_and_record(
+    *,
+    user_id: str,
+    idempotency_key: str,
+    audio_bytes: bytes,
+    form: TranscriptionForm,
+    request_id: str,
+    timing: RequestTiming,
+    settings: Settings,
+    usage_service: UsageService,
+) -> TranscriptionResponse:
+    """
+    Validate audio, transcribe it with the selected provider and record usage.
     
-    # Read and validate audio file
-    audio_bytes = await audio.read()
+    Shared by the transcription endpoints once the idempotency check missed.
+    """
+    duration_ms = form.duration_ms
+    language = form.language
     
+    # Validate audio format
+    audio_format = form.audio_format.lower()
+    if audio_format not in ALLOWED_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported audio format: {audio_format}. Allowed: {', '.join(ALLOWED_FORMATS)}",
+        )
+    
+    # Validate audio file
     if len(audio_bytes) > settings.max_audio_bytes:
         raise HTTPException(
             status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
@@ -88,31 +314,103 @@ async def create_transcription(
             detail="Audio file is empty",
         )
     
-    # Validate duration
-    max_duration_ms = settings.max_audio_seconds * 1000
-    if duration_ms > max_duration_ms:
+    # Validate duration (longer recordings are allowed when they can be chunked)
+    chunker = get_audio_chunker()
+    max_audio_seconds = settings.chunking_max_audio_seconds if chunker else settings.max_audio_seconds
+    if duration_ms > max_audio_seconds * 1000:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Audio duration exceeds maximum of {settings.max_audio_seconds} seconds",
+            detail=f"Audio duration exceeds maximum of {max_audio_seconds} seconds",
         )
     
     # Get the transcription provider
     try:
-        transcriber = get_provider(provider)
+        transcriber = get_provider(form.provider, form.model)
     except TranscriptionError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e),
         )
     
-    # Transcribe audio
+    # Trim leading/trailing silence and detect clips with no speech (optional)
+    silent = False
+    processed = False  # Already re-encoded as Opus by the trim or chunk stage
+    provider_format = audio_format
+    trimmer = get_silence_trimmer()
+    if trimmer is not None:
+        trimmed = await trimmer.trim(audio_bytes, audio_format)
+        if trimmed.silent:
+            logger.info(f"No speech detected, skipping provider call", extra={"request_id": request_id})
+        elif trimmed.trimmed_ms:
+            logger.info(f"Trimmed {trimmed.trimmed_ms}ms of silence", extra={"request_id": request_id})
+        silent = trimmed.silent
+        processed = trimmed.processed
+        audio_bytes = trimmed.audio_bytes
+        provider_format = trimmed.audio_format
+    
+    # Split long recordings into overlapping Opus chunks (optional)
+    chunks = None
+    if chunker is not None and not silent:
+        chunks = await chunker.split(audio_bytes, duration_ms)
+        if chunks:
+            processed = True
+            provider_format = "ogg"
+            logger.info(f"Split audio into {len(chunks)} chunks", extra={"request_id": request_id})
+    
+    # Shrink the provider payload (optional; trimmed and chunked audio is already Opus)
+    transcoder = get_audio_transcoder()
+    if transcoder is not None and not silent and not processed:
+        transcoded = await transcoder.transcode(audio_bytes, audio_format)
+        if transcoded.transcoded:
+            logger.info(
+                f"Transcoded {audio_format} to {transcoded.audio_format}, "
+                f"{len(audio_bytes)} -> {len(transcoded.audio_bytes)} bytes "
+                f"(saved {transcoded.bytes_saved})",
+                extra={"request_id": request_id},
+            )
+        audio_bytes = transcoded.audio_bytes
+        provider_format = transcoded.audio_format
+    
+    # Transcribe audio (a clip without speech has an empty transcript)
     try:
-        result = await transcriber.transcribe(
-            audio_bytes=audio_bytes,
-            audio_format=format_lower,
-            model=model,
-            noisy_room=noisy_room,
-            language=language,
+        if silent:
+            result = TranscriptionResult(
+                text="",
+                provider=transcriber.name,
+                model=transcriber.validate_model(form.model),
+                latency_ms=0,
+            )
+        elif chunks:
+            result = await transcribe_chunks(
+                transcriber,
+                chunks,
+                chunker.encode,
+                audio_format=provider_format,
+                model=form.model,
+                noisy_room=form.noisy_room,
+                language=language,
+            )
+        else:
+            result = await transcriber.transcribe(
+                audio_bytes=audio_bytes,
+                audio_format=provider_format,
+                model=form.model,
+                noisy_room=form.noisy_room,
+                language=language,
+            )
+    except ProviderUnavailableError as e:
+        logger.warning(f"Provider unavailable: {e}", extra={"request_id": request_id, "provider": e.provider})
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Transcription service is temporarily unavailable. Please retry.",
+            headers={"Retry-After": str(max(1, math.ceil(e.retry_after_s)))},
+        )
+    except ProviderBusyError as e:
+        logger.warning(f"Provider at capacity: {e}", extra={"request_id": request_id, "provider": e.provider})
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Transcription service is busy. Please retry.",
+            headers={"Retry-After": str(max(1, math.ceil(e.retry_after_s)))},
         )
     except TranscriptionError as e:
         logger.error(f"Transcription failed: {e}", extra={"request_id": request_id, "provider": e.provider})
@@ -127,10 +425,10 @@ async def create_transcription(
     try:
         record = await usage_service.record_transcription(
             TranscriptionRequestCreate(
-                user_id=user.id,
+                user_id=user_id,
                 idempotency_key=idempotency_key,
                 duration_ms=duration_ms,
-                audio_format=format_lower,
+                audio_format=audio_format,
                 language=language,
                 transcript_text=result.text,
                 provider=result.provider,
@@ -140,6 +438,10 @@ async def create_transcription(
                 status="success",
             )
         )
+    except DuplicateTranscriptionError as e:
+        # Another request recorded this key first (e.g. a retry on another worker)
+        logger.info(f"Idempotency key recorded concurrently, returning stored result", extra={"request_id": request_id})
+        return response_from_record(e.existing, request_id)
     except Exception as e:
         # Log but don't fail the request - transcription succeeded
         logger.error(f"Failed to record usage: {e}", extra={"request_id": request_id})
@@ -163,7 +465,7 @@ async def create_transcription(
         f"Transcription completed",
         extra={
             "request_id": request_id,
-            "user_id": user.id,
+            "user_id": user_id,
             "duration_ms": duration_ms,
             "provider": result.provider,
             "model": result.model,
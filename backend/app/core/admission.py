@@ -0,0 +1,185 @@
+"""Admission control: bounded concurrency with a bounded, deadline-shedding wait queue"""
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Optional
+
+from app.core.config import get_settings
+from app.core.metrics import register_metrics
+
+
+# Recent wait times kept for the wait-time percentiles in stats()
+WAIT_WINDOW_SIZE = 512
+
+# Smoothing of the slot hold time behind the expected-wait estimate
+HOLD_EWMA_ALPHA = 0.2
+
+
+class AdmissionRejected(Exception):
+    """
+    Raised when work is not admitted.
+
+    reason is "queue_full" (the wait queue was full) or "deadline" (the
+    expected or actual wait passed max_wait_ms); retry_after_s is how long
+    the queue is expected to take to drain.
+    """
+
+    def __init__(self, message: str, reason: str, retry_after_s: float):
+        self.reason = reason
+        self.retry_after_s = retry_after_s
+        super().__init__(message)
+
+
+class AdmissionController:
+    """
+    Admits at most max_concurrent holders at once.
+
+    Up to max_queued more wait in FIFO order; anything beyond that is
+    rejected at once. A waiter is shed when it has waited max_wait_ms, or
+    immediately when the expected wait for its queue position is already
+    longer than that. The expected wait is the average slot hold time times
+    the number of holders ahead, spread over max_concurrent slots.
+
+    Use as `async with controller:`.
+    """
+
+    def __init__(self, name: str, max_concurrent: int, max_queued: int, max_wait_ms: Optional[int] = None):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self.max_wait_s = max_wait_ms / 1000 if max_wait_ms else None
+        self._waiters: deque[asyncio.Future] = deque()
+        self._waits_ms: deque[float] = deque(maxlen=WAIT_WINDOW_SIZE)
+        self._held_since: dict[Optional[asyncio.Task], float] = {}
+        self._hold_s: Optional[float] = None
+        self.in_flight = 0
+        self.admitted = 0
+        self.rejected_queue_full = 0
+        self.shed_deadline = 0
+
+    @property
+    def queued(self) -> int:
+        """Number of waiters"""
+        return len(self._waiters)
+
+    def expected_wait_s(self, position: int) -> float:
+        """Expected wait of the waiter at a 1-based queue position"""
+        if self._hold_s is None:
+            return 0.0
+        return position * self._hold_s / self.max_concurrent
+
+    def retry_after_s(self) -> float:
+        """Seconds a rejected caller should wait before retrying"""
+        return max(1.0, self.expected_wait_s(self.queued + 1))
+
+    async def __aenter__(self) -> "AdmissionController":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self.release()
+
+    async def acquire(self) -> None:
+        """Take a slot, waiting in the queue if all are held"""
+        if self.in_flight < self.max_concurrent and not self._waiters:
+            self.in_flight += 1
+            self._admit(0.0)
+            return
+
+        if self.queued >= self.max_queued:
+            self.rejected_queue_full += 1
+            raise AdmissionRejected(f"{self.name} queue is full", "queue_full", self.retry_after_s())
+        if self.max_wait_s is not None and self.expected_wait_s(self.queued + 1) > self.max_wait_s:
+            self.shed_deadline += 1
+            raise AdmissionRejected(f"{self.name} queue is too slow", "deadline", self.retry_after_s())
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        start = time.monotonic()
+        try:
+            async with asyncio.timeout(self.max_wait_s):
+                await waiter
+        except BaseException as e:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as we gave up; pass it on
+                self.release()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            if isinstance(e, TimeoutError):
+                self.shed_deadline += 1
+                raise AdmissionRejected(
+                    f"{self.name} queue wait passed its deadline", "deadline", self.retry_after_s()
+                ) from None
+            raise
+        self._admit((time.monotonic() - start) * 1000)
+
+    def release(self) -> None:
+        """Give a slot back (from the task that took it), handing it straight to the oldest waiter"""
+        started = self._held_since.pop(asyncio.current_task(), None)
+        if started is not None:
+            hold = time.monotonic() - started
+            self._hold_s = (
+                hold if self._hold_s is None else HOLD_EWMA_ALPHA * hold + (1 - HOLD_EWMA_ALPHA) * self._hold_s
+            )
+
+        while self._waiters and self._waiters[0].done():
+            # Cancelled waiters leave the queue once their task resumes
+            self._waiters.popleft()
+        if not self._waiters:
+            self.in_flight -= 1
+            return
+        self._waiters.popleft().set_result(None)
+
+    def _admit(self, wait_ms: float) -> None:
+        self.admitted += 1
+        self._waits_ms.append(wait_ms)
+        self._held_since[asyncio.current_task()] = time.monotonic()
+
+    def stats(self) -> dict:
+        """Get admission metrics"""
+        waits = sorted(self._waits_ms)
+
+        def percentile(p: float) -> Optional[float]:
+            if not waits:
+                return None
+            return round(waits[min(len(waits) - 1, math.ceil(p / 100 * len(waits)) - 1)], 1)
+
+        return {
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "max_concurrent": self.max_concurrent,
+            "max_queued": self.max_queued,
+            "admitted": self.admitted,
+            "rejected_queue_full": self.rejected_queue_full,
+            "shed_deadline": self.shed_deadline,
+            "wait_ms_p50": percentile(50),
+            "wait_ms_p95": percentile(95),
+            "wait_ms_max": round(waits[-1], 1) if waits else None,
+            "hold_ms_avg": round(self._hold_s * 1000) if self._hold_s is not None else None,
+            "expected_wait_ms": round(self.expected_wait_s(self.queued + 1) * 1000),
+        }
+
+
+# Singleton instance
+_request_admission: Optional[AdmissionController] = None
+
+
+def get_request_admission() -> Optional[AdmissionController]:
+    """
+    Get the controller bounding transcription requests that are reading or
+    holding audio in this process, or None if disabled.
+    """
+    global _request_admission
+    settings = get_settings()
+    if not settings.admission_enabled:
+        return None
+    if _request_admission is None:
+        _request_admission = AdmissionController(
+            "transcriptions",
+            max_concurrent=settings.admission_max_concurrent,
+            max_queued=settings.admission_max_queue,
+            max_wait_ms=settings.admission_max_wait_ms,
+        )
+        register_metrics("admission", _request_admission.stats)
+    return _request_admission
@@ -18,6 +18,34 @@ class Settings(BaseSettings):
     supabase_anon_key: str = ""
     supabase_service_role_key: str = ""
     
+    # Auth verification: "remote" calls Supabase Auth per request, "local"
+    # verifies JWTs in-process (HS256 secret or cached JWKS)
+    auth_verification_mode: str = "remote"
+    supabase_jwt_secret: str = ""
+    supabase_jwt_audience: str = "authenticated"
+    jwks_refresh_seconds: int = 600
+    
+    # Cache of remotely verified tokens (TTL is capped by the token's exp;
+    # 0 disables the cache)
+    auth_cache_ttl_seconds: int = 60
+    auth_cache_max_entries: int = 10000
+    
+    # GET /v1/stats response cache ("memory" or "none")
+    stats_cache_backend: str = "memory"
+    stats_cache_ttl_seconds: int = 300
+    stats_cache_max_users: int = 10000
+    
+    # In-memory Bloom filter that skips the idempotency DB lookup for keys
+    # this process has never recorded. Only safe with a single long-lived
+    # worker: a retry of a key recorded by another worker (or before a
+    # restart) skips the lookup and pays for a second provider call
+    idempotency_filter_enabled: bool = False
+    idempotency_filter_capacity: int = 1_000_000
+    idempotency_filter_error_rate: float = 0.01
+    
+    # Admin endpoints (/v1/metrics) are disabled unless a key is set
+    admin_api_key: str = ""
+    
     # Transcription Providers
     gemini_api_key: str = ""
     openai_api_key: str = ""
@@ -26,6 +54,137 @@ class Settings(BaseSettings):
     default_provider: str = "gemini"
     default_model: str = "gemini-2.5-flash-lite"
     
+    # Per-provider call limits (calls beyond max_concurrency wait in a queue
+    # of at most max_queue, for at most max_wait_ms, before being rejected)
+    provider_max_concurrency: int = 32
+    provider_max_queue: int = 64
+    provider_max_wait_ms: int = 15000
+    
+    # Admission control for transcription requests (each holds up to
+    # max_audio_mb of audio): at most admission_max_concurrent are read and
+    # processed at once; up to admission_max_queue more wait, for at most
+    # admission_max_wait_ms. Beyond that requests get 429 (queue full) or
+    # 503 (wait too long) with Retry-After. Off by default: enabling it
+    # starts shedding load at these limits
+    admission_enabled: bool = False
+    admission_max_concurrent: int = 32
+    admission_max_queue: int = 64
+    admission_max_wait_ms: int = 10000
+    
+    # Shared outbound HTTP connection pool (Supabase, Gemini)
+    http_http2: bool = False
+    http_timeout_seconds: float = 10.0
+    gemini_timeout_seconds: float = 60.0
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry_seconds: float = 30.0
+    
+    # OpenAI HTTP connection pool
+    openai_http2: bool = True
+    openai_max_connections: int = 100
+    openai_max_keepalive_connections: int = 20
+    openai_keepalive_expiry_seconds: float = 30.0
+    
+    # Server-side audio processing before the provider call
+    # (requires the optional PyAV dependency)
+    audio_workers: int = 2
+    audio_sample_rate: int = 16000
+    audio_opus_bitrate: int = 24000
+    transcode_enabled: bool = False
+    transcode_formats: str = "wav,flac"
+    transcode_min_bytes: int = 256 * 1024
+    silence_trim_enabled: bool = False
+    silence_threshold_dbfs: float = -45.0
+    silence_padding_ms: int = 250
+    silence_min_speech_ms: int = 100
+    silence_min_trim_ms: int = 500
+    chunking_enabled: bool = False
+    chunking_min_seconds: int = 60
+    chunking_target_seconds: int = 30
+    chunking_overlap_ms: int = 1000
+    chunking_max_audio_seconds: int = 600
+    
+    # Hedged provider requests: after the primary's recent latency percentile,
+    # send the same audio to a secondary provider/model and take the first
+    # answer (empty provider = same as primary, empty model = its default)
+    hedging_enabled: bool = False
+    hedge_secondary_provider: str = "openai"
+    hedge_secondary_model: str = ""
+    hedge_percentile: float = 95.0
+    hedge_min_delay_ms: int = 1000
+    hedge_initial_delay_ms: int = 4000
+    hedge_window_size: int = 200
+    hedge_min_samples: int = 20
+    
+    # Provider routing for requests without a provider: "static" uses
+    # default_provider, "adaptive" picks the fastest healthy backend from
+    # routing_backends ("provider:model,..."; empty = each provider's default)
+    routing_mode: str = "static"
+    routing_backends: str = ""
+    routing_ewma_alpha: float = 0.2
+    routing_reservoir_size: int = 256
+    routing_exploration_rate: float = 0.05
+    routing_max_error_rate: float = 0.3
+    routing_min_samples: int = 5
+    
+    # Pre-warmed OpenAI Realtime sessions handed to /v1/realtime/transcribe
+    # clients on connect: realtime_pool_size per model in realtime_pool_models
+    # (comma-separated; empty = the default realtime model), retired after
+    # realtime_pool_max_age_seconds idle. Off (0) by default: every worker
+    # keeps its idle sessions open and re-opens them even without traffic
+    realtime_pool_size: int = 0
+    realtime_pool_models: str = ""
+    realtime_pool_max_age_seconds: float = 600.0
+    
+    # Bounded outbound queues of each realtime session (in messages; 250
+    # audio chunks of 20ms = 5s). When a queue is full, event types listed
+    # in realtime_queue_policies ("type:drop|coalesce|replace,...") are
+    # dropped, merged into the last queued event if it has the same type, or
+    # replace the queued event of their type at the tail; anything else
+    # (audio, final transcripts, errors) ends the session
+    realtime_upstream_queue_size: int = 250
+    realtime_client_queue_size: int = 100
+    realtime_queue_policies: str = (
+        "transcript_delta:coalesce,transcript_checkpoint:replace,"
+        "speech_started:drop,speech_stopped:drop,audio_committed:drop,commit:coalesce"
+    )
+    
+    # Delta-only realtime transcripts (transcript_mode=delta) get a full-text
+    # checkpoint once the text has grown by this many characters, or by its
+    # length at the previous checkpoint if that is more
+    realtime_checkpoint_min_chars: int = 500
+    
+    # Turn detection for realtime sessions. "server" uses OpenAI's server_vad
+    # (realtime_vad_threshold is its 0-1 activation threshold); "local" turns
+    # it off and gates audio in the proxy: only voiced audio (level above
+    # realtime_vad_threshold_dbfs for realtime_vad_min_speech_ms) and its
+    # prefix padding go upstream, and the buffer is committed after
+    # realtime_vad_silence_duration_ms of silence if realtime_vad_auto_commit
+    realtime_vad_mode: str = "server"
+    realtime_vad_threshold: float = 0.5
+    realtime_vad_prefix_padding_ms: int = 300
+    realtime_vad_silence_duration_ms: int = 500
+    realtime_vad_threshold_dbfs: float = -45.0
+    realtime_vad_min_speech_ms: int = 60
+    realtime_vad_auto_commit: bool = True
+    
+    # Circuit breakers per provider/model: open on a high error or slow-call
+    # rate over the last breaker_window_size calls, refuse calls for
+    # breaker_open_seconds, then probe. Requests fail over to another
+    # registered provider, trying at most breaker_failover_attempts providers;
+    # requests naming a provider only fail over if breaker_failover_pinned.
+    # Off by default: enabling it sends failed requests to other vendors
+    breaker_enabled: bool = False
+    breaker_window_size: int = 20
+    breaker_min_calls: int = 10
+    breaker_error_rate: float = 0.5
+    breaker_slow_call_ms: int = 30000
+    breaker_slow_rate: float = 0.8
+    breaker_open_seconds: float = 30.0
+    breaker_half_open_max_calls: int = 1
+    breaker_failover_attempts: int = 2
+    breaker_failover_pinned: bool = False
+    
     # Application
     env: str = "dev"
     log_level: str = "INFO"
@@ -47,6 +206,41 @@ class Settings(BaseSettings):
             return []
         return [origin.strip() for origin in self.cors_origins.split(",")]
     
+    @property
+    def transcode_formats_set(self) -> set[str]:
+        """Parse transcodable upload formats from comma-separated string"""
+        return {fmt.strip().lower() for fmt in self.transcode_formats.split(",") if fmt.strip()}
+    
+    @property
+    def routing_backends_list(self) -> list[tuple[str, str]]:
+        """Parse routing backends from comma-separated provider:model pairs"""
+        backends = []
+        for item in self.routing_backends.split(","):
+            provider, _, model = item.strip().partition(":")
+            if provider and model:
+                backends.append((provider.strip(), model.strip()))
+        return backends
+    
+    @property
+    def realtime_pool_models_list(self) -> list[str]:
+        """Parse pre-warmed realtime models from comma-separated string"""
+        return [model.strip() for model in self.realtime_pool_models.split(",") if model.strip()]
+    
+    @property
+    def realtime_queue_policies_map(self) -> dict[str, str]:
+        """Parse realtime queue overload policies from comma-separated type:policy pairs"""
+        policies = {}
+        for item in self.realtime_queue_policies.split(","):
+            kind, _, policy = item.strip().partition(":")
+            if kind and policy:
+                policies[kind.strip()] = policy.strip().lower()
+        return policies
+    
+    @property
+    def supabase_jwks_url(self) -> str:
+        """Supabase Auth JWKS endpoint for asymmetric signing keys"""
+        return f"{self.supabase_url}/auth/v1/.well-known/jwks.json"
+    
     @property
     def is_production(self) -> bool:
         """Check if running in production"""
@@ -0,0 +1,94 @@
+"""Shared outbound HTTP clients
+
+One pooled httpx.AsyncClient per upstream, created at startup and closed at
+shutdown by the FastAPI lifespan, so requests reuse keep-alive connections
+instead of paying TCP+TLS setup each time.
+"""
+from typing import Optional
+
+import httpx
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Upstream names
+SUPABASE = "supabase"  # Auth API, JWKS and REST
+OPENAI = "openai"
+GEMINI = "gemini"
+
+
+def _build_client(name: str) -> httpx.AsyncClient:
+    """Create the pooled client for an upstream"""
+    settings = get_settings()
+
+    if name == OPENAI:
+        return httpx.AsyncClient(
+            http2=settings.openai_http2,
+            limits=httpx.Limits(
+                max_connections=settings.openai_max_connections,
+                max_keepalive_connections=settings.openai_max_keepalive_connections,
+                keepalive_expiry=settings.openai_keepalive_expiry_seconds,
+            ),
+        )
+
+    # Gemini generations run far longer than Supabase round-trips
+    timeout = settings.gemini_timeout_seconds if name == GEMINI else settings.http_timeout_seconds
+    return httpx.AsyncClient(
+        http2=settings.http_http2,
+        timeout=timeout,
+        limits=httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry_seconds,
+        ),
+    )
+
+
+class HTTPClients:
+    """App-lifetime set of outbound HTTP clients, one per upstream"""
+
+    def __init__(self):
+        self._clients: dict[str, httpx.AsyncClient] = {}
+
+    def get(self, name: str) -> httpx.AsyncClient:
+        """
+        Get the client for an upstream.
+
+        Created on first use if startup hasn't run (e.g. in scripts).
+        """
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            client = _build_client(name)
+            self._clients[name] = client
+        return client
+
+    def start(self) -> None:
+        """Create all upstream clients"""
+        for name in (SUPABASE, OPENAI, GEMINI):
+            self.get(name)
+        logger.info(f"Started HTTP clients: {list(self._clients.keys())}")
+
+    async def aclose(self) -> None:
+        """Close all clients and their pooled connections"""
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients = {}
+
+
+# Singleton instance
+_http_clients: Optional[HTTPClients] = None
+
+
+def get_http_clients() -> HTTPClients:
+    """Get the shared HTTP client set"""
+    global _http_clients
+    if _http_clients is None:
+        _http_clients = HTTPClients()
+    return _http_clients
+
+
+def get_supabase_http_client() -> httpx.AsyncClient:
+    """Dependency function to get the shared Supabase HTTP client"""
+    return get_http_clients().get(SUPABASE)
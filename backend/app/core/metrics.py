@@ -0,0 +1,18 @@
+"""In-process metrics registry
+
+Components that keep their own counters register a snapshot function here;
+GET /v1/metrics collects them all into one document.
+"""
+from typing import Callable
+
+_sources: dict[str, Callable[[], dict]] = {}
+
+
+def register_metrics(name: str, source: Callable[[], dict]) -> None:
+    """Register (or replace) a named metrics snapshot function"""
+    _sources[name] = source
+
+
+def collect_metrics() -> dict[str, dict]:
+    """Collect a snapshot from every registered source"""
+    return {name: source() for name, source in _sources.items()}
@@ -1,7 +1,7 @@
 """Pydantic models for database rows"""
 from datetime import datetime
 from typing import Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, computed_field
 
 
 class TranscriptionRequest(BaseModel):
@@ -14,6 +14,7 @@ class TranscriptionRequest(BaseModel):
     audio_format: Optional[str] = None
     language: str = "en"
     transcript_text: str
+    word_count: int = 0
     provider: str = "gemini"
     model: str = "gemini-2.5-flash-lite"
     provider_latency_ms: Optional[int] = None
@@ -34,3 +35,9 @@ class TranscriptionRequestCreate(BaseModel):
     provider_latency_ms: Optional[int] = None
     total_latency_ms: Optional[int] = None
     status: str = "success"
+    
+    @computed_field
+    @property
+    def word_count(self) -> int:
+        """Estimated word count, stored so stats never need the transcript text"""
+        return len(self.transcript_text.split())
@@ -1,26 +1,46 @@
 """Supabase client initialization"""
-from functools import lru_cache
+from typing import Optional
 
-from supabase import create_client, Client
+from supabase import AsyncClient, AsyncClientOptions, create_async_client
 
 from app.core.config import get_settings
+from app.core.http import SUPABASE, get_http_clients
 
+# Singleton instance
+_supabase_client: Optional[AsyncClient] = None
 
-@lru_cache
-def get_supabase_client() -> Client:
+
+async def get_supabase_client() -> AsyncClient:
     """
-    Get cached Supabase client using service role key.
-    
+    Get shared async Supabase client using service role key.
+
     Uses service role key for backend operations (DB writes).
     This key should NEVER be exposed to clients.
+
+    REST calls go through the app's pooled Supabase HTTP client, so DB
+    round-trips never block the event loop and reuse keep-alive connections.
     """
-    settings = get_settings()
-    return create_client(
-        settings.supabase_url,
-        settings.supabase_service_role_key
-    )
+    global _supabase_client
+    if _supabase_client is None:
+        settings = get_settings()
+        _supabase_client = await create_async_client(
+            settings.supabase_url,
+            settings.supabase_service_role_key,
+            options=AsyncClientOptions(
+                httpx_client=get_http_clients().get(SUPABASE),
+                auto_refresh_token=False,
+                persist_session=False,
+            ),
+        )
+    return _supabase_client
+
+
+def reset_supabase_client() -> None:
+    """Drop the shared client (its HTTP pool is closed with the app's clients)"""
+    global _supabase_client
+    _supabase_client = None
 
 
-def get_supabase() -> Client:
+async def get_supabase() -> AsyncClient:
     """Dependency function to get Supabase client"""
-    return get_supabase_client()
+    return await get_supabase_client()
@@ -1,15 +1,23 @@
 """Authentication dependency using Supabase"""
-from typing import Annotated
+import hmac
+from typing import Annotated, Optional
 
 import httpx
 from fastapi import Depends, HTTPException, Header, status
+from jose import JWTError, jwt
 from pydantic import BaseModel
 
 from app.core.config import get_settings, Settings
+from app.core.http import get_supabase_http_client
 from app.core.logging import get_logger
+from app.deps.jwks import get_jwks_cache
+from app.deps.token_cache import get_token_cache
 
 logger = get_logger(__name__)
 
+# Asymmetric algorithms Supabase may sign access tokens with
+ASYMMETRIC_ALGORITHMS = {"RS256", "ES256"}
+
 
 class CurrentUser(BaseModel):
     """Authenticated user model"""
@@ -17,14 +25,113 @@ class CurrentUser(BaseModel):
     email: str | None = None
     
     
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+async def verify_token_remote(
+    token: str,
+    settings: Settings,
+    http_client: httpx.AsyncClient,
+) -> CurrentUser:
+    """
+    Verify Supabase JWT by calling Supabase Auth API.
+    
+    This is Option A from the PRD - simple token verification via API call.
+    """
+    try:
+        response = await http_client.get(
+            f"{settings.supabase_url}/auth/v1/user",
+            headers={
+                "Authorization": f"Bearer {token}",
+                "apikey": settings.supabase_service_role_key,
+            },
+            timeout=10.0,
+        )
+        
+        if response.status_code == 401:
+            raise _unauthorized("Invalid or expired token")
+        
+        if response.status_code != 200:
+            logger.error(f"Supabase auth error: {response.status_code} - {response.text}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Authentication service error",
+            )
+        
+        user_data = response.json()
+        return CurrentUser(
+            id=user_data["id"],
+            email=user_data.get("email"),
+        )
+        
+    except httpx.RequestError as e:
+        logger.error(f"Failed to verify token: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Authentication service unavailable",
+        )
+
+
+async def verify_token_local(token: str, settings: Settings) -> Optional[CurrentUser]:
+    """
+    Verify Supabase JWT in-process.
+    
+    HS256 tokens are checked against the project JWT secret; asymmetric
+    tokens against the cached JWKS. Returns None when no key is available
+    for the token, so the caller can fall back to remote verification.
+    """
+    try:
+        header = jwt.get_unverified_header(token)
+    except JWTError:
+        raise _unauthorized("Invalid or expired token")
+    
+    algorithm = header.get("alg")
+    if algorithm == "HS256":
+        if not settings.supabase_jwt_secret:
+            return None
+        key = settings.supabase_jwt_secret
+    elif algorithm in ASYMMETRIC_ALGORITHMS:
+        jwks_cache = get_jwks_cache(settings.supabase_jwks_url, settings.jwks_refresh_seconds)
+        key = await jwks_cache.get_key(header.get("kid", ""))
+        if key is None:
+            return None
+    else:
+        raise _unauthorized("Invalid or expired token")
+    
+    try:
+        claims = jwt.decode(
+            token,
+            key,
+            algorithms=[algorithm],
+            audience=settings.supabase_jwt_audience,
+        )
+    except JWTError:
+        raise _unauthorized("Invalid or expired token")
+    
+    if not claims.get("sub"):
+        raise _unauthorized("Invalid or expired token")
+    
+    return CurrentUser(id=claims["sub"], email=claims.get("email"))
+
+
 async def verify_supabase_token(
     authorization: Annotated[str | None, Header()] = None,
     settings: Settings = Depends(get_settings),
+    http_client: httpx.AsyncClient = Depends(get_supabase_http_client),
 ) -> CurrentUser:
     """
-    Verify Supabase JWT by calling Supabase Auth API.
+    Verify the bearer token on a request.
     
-    This is Option A from the PRD - simple token verification via API call.
+    Uses local JWT verification when auth_verification_mode is "local",
+    falling back to the Supabase Auth API for tokens whose signing key
+    isn't available locally. Otherwise always verifies remotely.
+    
+    Remote results are cached per token (see auth_cache_ttl_seconds).
     """
     if not authorization:
         raise HTTPException(
@@ -44,43 +151,33 @@ async def verify_supabase_token(
     
     token = parts[1]
     
-    # Verify token by calling Supabase Auth API
-    try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{settings.supabase_url}/auth/v1/user",
-                headers={
-                    "Authorization": f"Bearer {token}",
-                    "apikey": settings.supabase_service_role_key,
-                },
-                timeout=10.0,
-            )
-            
-            if response.status_code == 401:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Invalid or expired token",
-                    headers={"WWW-Authenticate": "Bearer"},
-                )
-            
-            if response.status_code != 200:
-                logger.error(f"Supabase auth error: {response.status_code} - {response.text}")
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail="Authentication service error",
-                )
-            
-            user_data = response.json()
-            return CurrentUser(
-                id=user_data["id"],
-                email=user_data.get("email"),
-            )
-            
-    except httpx.RequestError as e:
-        logger.error(f"Failed to verify token: {e}")
+    if settings.auth_verification_mode == "local":
+        user = await verify_token_local(token, settings)
+        if user is not None:
+            return user
+        logger.debug("No local signing key for token, verifying remotely")
+    
+    if settings.auth_cache_ttl_seconds <= 0:
+        return await verify_token_remote(token, settings, http_client)
+    
+    token_cache = get_token_cache(settings.auth_cache_max_entries, settings.auth_cache_ttl_seconds)
+    return await token_cache.get_or_verify(
+        token, lambda: verify_token_remote(token, settings, http_client)
+    )
+
+
+async def require_admin(
+    x_admin_key: Annotated[str | None, Header(alias="X-Admin-Key")] = None,
+    settings: Settings = Depends(get_settings),
+) -> None:
+    """Guard for operator endpoints; they don't exist unless admin_api_key is set"""
+    if not settings.admin_api_key:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    
+    if not x_admin_key or not hmac.compare_digest(x_admin_key, settings.admin_api_key):
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Authentication service unavailable",
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid admin key",
         )
 
 
@@ -0,0 +1,78 @@
+"""Cached JWKS (JSON Web Key Set) for local Supabase JWT verification"""
+import asyncio
+import time
+from functools import lru_cache
+from typing import Optional
+
+import httpx
+
+from app.core.http import SUPABASE, get_http_clients
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Minimum gap between forced refetches for unknown key IDs, so a flood of
+# tokens with bogus `kid` headers can't hammer the JWKS endpoint
+MIN_REFETCH_INTERVAL_S = 30.0
+
+
+class JWKSCache:
+    """
+    In-process cache of signing keys keyed by `kid`.
+
+    The first lookup loads the key set inline. After that, stale keys keep
+    being served while a background task refreshes them, so verification
+    never waits on the network except for a genuinely unknown `kid`.
+    """
+
+    def __init__(self, url: str, refresh_seconds: float):
+        self.url = url
+        self.refresh_seconds = refresh_seconds
+        self._keys: dict[str, dict] = {}
+        self._fetched_at = 0.0
+        self._last_attempt = float("-inf")
+        self._lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    @property
+    def is_stale(self) -> bool:
+        return time.monotonic() - self._fetched_at > self.refresh_seconds
+
+    async def get_key(self, kid: str) -> Optional[dict]:
+        """Get the JWK for a key ID, or None if it isn't published"""
+        if self._keys and self.is_stale:
+            self._schedule_refresh()
+
+        key = self._keys.get(kid)
+        if key is None and time.monotonic() - self._last_attempt > MIN_REFETCH_INTERVAL_S:
+            # First use, or keys may have been rotated since the last fetch
+            await self.refresh()
+            key = self._keys.get(kid)
+        return key
+
+    async def refresh(self) -> None:
+        """Fetch the key set, keeping the previous keys on failure"""
+        async with self._lock:
+            self._last_attempt = time.monotonic()
+            try:
+                client = get_http_clients().get(SUPABASE)
+                response = await client.get(self.url, timeout=10.0)
+                response.raise_for_status()
+                keys = response.json().get("keys", [])
+            except (httpx.HTTPError, ValueError) as e:
+                logger.error(f"Failed to fetch JWKS: {e}")
+                return
+
+            self._keys = {k["kid"]: k for k in keys if "kid" in k}
+            self._fetched_at = time.monotonic()
+            logger.debug(f"Loaded {len(self._keys)} JWKS keys")
+
+    def _schedule_refresh(self) -> None:
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self.refresh())
+
+
+@lru_cache
+def get_jwks_cache(url: str, refresh_seconds: float) -> JWKSCache:
+    """Get the shared JWKS cache for a key set URL"""
+    return JWKSCache(url, refresh_seconds)
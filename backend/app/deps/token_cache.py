@@ -0,0 +1,105 @@
+"""TTL + LRU cache of verified tokens for the remote auth path"""
+import hashlib
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Awaitable, Callable, Generic, Optional, TypeVar
+
+from jose import JWTError, jwt
+
+from app.core.metrics import register_metrics
+from app.core.singleflight import SingleFlight
+
+T = TypeVar("T")
+
+
+def _token_key(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def _token_expiry(token: str) -> Optional[float]:
+    """Get the token's `exp` claim (unverified) as a wall-clock timestamp"""
+    try:
+        exp = jwt.get_unverified_claims(token).get("exp")
+    except JWTError:
+        return None
+    return float(exp) if isinstance(exp, (int, float)) else None
+
+
+class TokenCache(Generic[T]):
+    """
+    Bounded token -> user cache keyed by a SHA-256 of the token.
+
+    Entries expire at the earlier of the JWT `exp` and the configured TTL.
+    Concurrent misses for the same token share a single verification call.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[T, float]] = OrderedDict()
+        self._singleflight: SingleFlight[T] = SingleFlight()
+        self.hits = 0
+        self.evictions = 0
+
+    async def get_or_verify(self, token: str, verify: Callable[[], Awaitable[T]]) -> T:
+        """Return the cached user for a token, verifying it on a miss"""
+        key = _token_key(token)
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            user, expires_at = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return user
+            del self._entries[key]
+
+        async def verify_and_store() -> T:
+            user = await verify()
+            self._store(key, token, user)
+            return user
+
+        return await self._singleflight.do(key, verify_and_store)
+
+    def _store(self, key: str, token: str, user: T) -> None:
+        ttl = self.ttl_seconds
+        exp = _token_expiry(token)
+        if exp is not None:
+            ttl = min(ttl, exp - time.time())
+        if ttl <= 0:
+            return
+
+        self._entries[key] = (user, time.monotonic() + ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all cached entries"""
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        """Get cache metrics"""
+        misses = self._singleflight.calls
+        coalesced = self._singleflight.coalesced
+        lookups = self.hits + misses + coalesced
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": misses,
+            "coalesced": coalesced,
+            "evictions": self.evictions,
+            # Share of lookups answered without an upstream call
+            "hit_ratio": round((self.hits + coalesced) / lookups, 4) if lookups else 0.0,
+        }
+
+
+@lru_cache
+def get_token_cache(max_entries: int, ttl_seconds: float) -> TokenCache:
+    """Get the shared token cache"""
+    cache = TokenCache(max_entries, ttl_seconds)
+    register_metrics("auth_token_cache", cache.stats)
+    return cache
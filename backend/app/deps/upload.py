@@ -0,0 +1,177 @@
+"""Streaming upload parsing (multipart and raw bodies) with early size rejection"""
+from dataclasses import dataclass, field
+from typing import Optional
+
+from fastapi import HTTPException, Request, status
+from python_multipart.exceptions import MultipartParseError
+from python_multipart.multipart import MultipartParser, parse_options_header
+
+# Allowance on top of the file limit for multipart framing and form fields
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+# Maximum size of a single non-file form field
+MAX_FIELD_BYTES = 16 * 1024
+
+
+@dataclass
+class MultipartUpload:
+    """Form fields and the single file part of a multipart request"""
+    fields: dict[str, str] = field(default_factory=dict)
+    file_bytes: Optional[bytes] = None
+    filename: Optional[str] = None
+
+
+def _too_large(max_file_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Audio file too large. Maximum size: {max_file_bytes // (1024 * 1024)}MB",
+    )
+
+
+def _malformed(detail: str = "Malformed multipart body") -> HTTPException:
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+
+
+class _UploadCollector:
+    """python-multipart callbacks that keep the file part in memory, bounded"""
+
+    def __init__(self, file_field: str, max_file_bytes: int):
+        self.file_field = file_field
+        self.max_file_bytes = max_file_bytes
+        self.upload = MultipartUpload()
+        self._header_field = b""
+        self._header_value = b""
+        self._disposition = b""
+        self._name: Optional[str] = None
+        self._filename: Optional[str] = None
+        self._data = bytearray()
+
+    def on_part_begin(self) -> None:
+        self._disposition = b""
+        self._name = None
+        self._filename = None
+        self._data = bytearray()
+
+    def on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_field += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def on_header_end(self) -> None:
+        if self._header_field.lower() == b"content-disposition":
+            self._disposition = self._header_value
+        self._header_field = b""
+        self._header_value = b""
+
+    def on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._disposition)
+        if b"name" not in options:
+            raise _malformed('Multipart part is missing a Content-Disposition "name"')
+        self._name = options[b"name"].decode("utf-8", errors="replace")
+        if b"filename" in options:
+            self._filename = options[b"filename"].decode("utf-8", errors="replace")
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        limit = self.max_file_bytes if self._name == self.file_field else MAX_FIELD_BYTES
+        if len(self._data) + (end - start) > limit:
+            if self._name == self.file_field:
+                raise _too_large(self.max_file_bytes)
+            raise _malformed(f"Form field '{self._name}' is too large")
+        self._data += data[start:end]
+
+    def on_part_end(self) -> None:
+        if self._name == self.file_field:
+            self.upload.file_bytes = bytes(self._data)
+            self.upload.filename = self._filename
+        elif self._name is not None and self._filename is None:
+            self.upload.fields[self._name] = self._data.decode("utf-8", errors="replace")
+        self._data = bytearray()
+
+
+async def read_multipart_upload(
+    request: Request,
+    file_field: str,
+    max_file_bytes: int,
+) -> MultipartUpload:
+    """
+    Stream a multipart/form-data body, keeping at most max_file_bytes of file data.
+
+    Unlike FastAPI's UploadFile, nothing is spooled to disk: the body is parsed
+    chunk by chunk as it arrives, and the request is rejected with 413 as soon
+    as its Content-Length or the received file data passes the limit.
+
+    Raises:
+        HTTPException: 413 if the upload is too large, 400 if it is malformed
+    """
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data" or b"boundary" not in params:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Expected multipart/form-data",
+        )
+
+    max_body_bytes = max_file_bytes + MULTIPART_OVERHEAD_BYTES
+    content_length = request.headers.get("content-length")
+    if content_length is not None and content_length.isdigit() and int(content_length) > max_body_bytes:
+        raise _too_large(max_file_bytes)
+
+    collector = _UploadCollector(file_field, max_file_bytes)
+    parser = MultipartParser(
+        params[b"boundary"],
+        callbacks={
+            name: getattr(collector, name)
+            for name in (
+                "on_part_begin",
+                "on_header_field",
+                "on_header_value",
+                "on_header_end",
+                "on_headers_finished",
+                "on_part_data",
+                "on_part_end",
+            )
+        },
+    )
+
+    received = 0
+    try:
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > max_body_bytes:
+                raise _too_large(max_file_bytes)
+            parser.write(chunk)
+        parser.finalize()
+    except MultipartParseError:
+        raise _malformed()
+
+    return collector.upload
+
+
+async def read_raw_upload(request: Request, max_bytes: int) -> bytes:
+    """
+    Read a raw (application/octet-stream or audio/*) body of at most max_bytes.
+
+    The body is the audio itself, so there is no multipart framing to parse.
+    The request is rejected with 413 as soon as its Content-Length or the
+    received data passes the limit.
+
+    Raises:
+        HTTPException: 415 for a form or JSON body, 413 if the body is too large
+    """
+    content_type, _ = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"application/octet-stream" and not content_type.startswith(b"audio/"):
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Expected application/octet-stream or audio/* body",
+        )
+
+    content_length = request.headers.get("content-length")
+    if content_length is not None and content_length.isdigit() and int(content_length) > max_bytes:
+        raise _too_large(max_bytes)
+
+    body = bytearray()
+    async for chunk in request.stream():
+        if len(body) + len(chunk) > max_bytes:
+            raise _too_large(max_bytes)
+        body += chunk
+    return bytes(body)
@@ -5,8 +5,12 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import get_settings
+from app.core.http import get_http_clients
+from app.db.supabase import get_supabase_client, reset_supabase_client
+from app.services.audio import shutdown_audio_pool
+from app.services.realtime_pool import get_realtime_pool
 from app.core.logging import setup_logging, get_logger
-from app.api.v1.routes import health, transcriptions, stats, realtime
+from app.api.v1.routes import health, transcriptions, stats, realtime, metrics
 
 # Setup logging on import
 setup_logging()
@@ -18,8 +22,20 @@ async def lifespan(app: FastAPI):
     """Application lifespan handler"""
     settings = get_settings()
     logger.info(f"Starting sayFlow backend (env={settings.env})")
+    http_clients = get_http_clients()
+    http_clients.start()
+    if settings.supabase_url:
+        await get_supabase_client()
+    realtime_pool = get_realtime_pool()
+    if realtime_pool is not None:
+        realtime_pool.start()
     yield
     logger.info("Shutting down sayFlow backend")
+    reset_supabase_client()
+    shutdown_audio_pool()
+    if realtime_pool is not None:
+        await realtime_pool.close()
+    await http_clients.aclose()
 
 
 def create_app() -> FastAPI:
@@ -48,6 +64,7 @@ def create_app() -> FastAPI:
     app.include_router(transcriptions.router, prefix="/v1", tags=["transcriptions"])
     app.include_router(stats.router, prefix="/v1", tags=["stats"])
     app.include_router(realtime.router, prefix="/v1", tags=["realtime"])
+    app.include_router(metrics.router, prefix="/v1", tags=["metrics"])
     
     return app
 
@@ -28,8 +28,8 @@ class TranscriptionForm(BaseModel):
     """
     Form data for transcription request.
     
-    Note: This is used for documentation/validation.
-    Actual form parsing is done in the route.
+    The route streams the multipart body itself (see
+    app.deps.upload.read_multipart_upload) and validates the fields here.
     """
     duration_ms: int = Field(..., gt=0, description="Audio duration in milliseconds")
     audio_format: str = Field(..., description="Audio format (e.g., m4a, wav)")
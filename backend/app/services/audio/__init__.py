@@ -0,0 +1,26 @@
+"""Audio processing applied to uploads before they reach a provider"""
+from app.services.audio.chunker import AudioChunker, get_audio_chunker
+from app.services.audio.pool import get_audio_pool, shutdown_audio_pool
+from app.services.audio.transcoder import (
+    AudioTranscoder,
+    TranscodeResult,
+    get_audio_transcoder,
+)
+from app.services.audio.trimmer import (
+    SilenceTrimmer,
+    TrimmedAudio,
+    get_silence_trimmer,
+)
+
+__all__ = [
+    "AudioChunker",
+    "AudioTranscoder",
+    "SilenceTrimmer",
+    "TranscodeResult",
+    "TrimmedAudio",
+    "get_audio_chunker",
+    "get_audio_pool",
+    "get_audio_transcoder",
+    "get_silence_trimmer",
+    "shutdown_audio_pool",
+]
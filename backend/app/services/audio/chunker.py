@@ -0,0 +1,124 @@
+"""Optional splitting of long recordings into overlapping chunks"""
+import asyncio
+from concurrent.futures import Executor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Optional
+
+import numpy as np
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.core.metrics import register_metrics
+from app.services.audio import codec, vad
+from app.services.audio.pool import get_audio_pool
+
+
+logger = get_logger(__name__)
+
+
+class AudioChunker:
+    """
+    Splits recordings of at least min_duration_ms at pauses so the chunks
+    can be transcribed concurrently.
+
+    Decoding and splitting run as one job in the audio process pool; each
+    chunk is then Opus-encoded by encode() as its own job, so encoding is
+    spread across the workers and the first chunks can reach the provider
+    while later ones are still encoding.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        min_duration_ms: int,
+        target_ms: int,
+        overlap_ms: int,
+        bitrate: int,
+        pool: Executor,
+    ):
+        self.sample_rate = sample_rate
+        self.min_duration_ms = min_duration_ms
+        self.bitrate = bitrate
+        self.pool = pool
+        self._split = partial(
+            vad.split_audio,
+            sample_rate=sample_rate,
+            min_duration_ms=min_duration_ms,
+            target_ms=target_ms,
+            overlap_ms=overlap_ms,
+        )
+        self.split_recordings = 0
+        self.chunks = 0
+        self.failed = 0
+
+    async def split(self, audio_bytes: bytes, duration_ms: int) -> Optional[list[np.ndarray]]:
+        """
+        Split a long recording into chunks of mono int16 samples.
+
+        Returns None (transcribe as one piece) for short recordings, judged
+        first by the client-reported duration and then by the decoded
+        audio, and for audio that fails to decode.
+        """
+        if duration_ms < self.min_duration_ms:
+            return None
+        try:
+            chunks = await asyncio.get_running_loop().run_in_executor(self.pool, self._split, audio_bytes)
+        except (ValueError, BrokenProcessPool) as e:
+            self.failed += 1
+            logger.warning(f"Audio chunking failed, transcribing as one piece: {e}")
+            return None
+        if chunks is None or len(chunks) < 2:
+            return None
+
+        self.split_recordings += 1
+        self.chunks += len(chunks)
+        return chunks
+
+    async def encode(self, samples: np.ndarray) -> bytes:
+        """Encode a chunk as Opus/OGG"""
+        return await asyncio.get_running_loop().run_in_executor(
+            self.pool,
+            codec.encode_opus,
+            samples,
+            self.sample_rate,
+            self.bitrate,
+        )
+
+    def stats(self) -> dict:
+        """Get chunking metrics"""
+        return {
+            "split_recordings": self.split_recordings,
+            "chunks": self.chunks,
+            "avg_chunks": round(self.chunks / self.split_recordings, 1) if self.split_recordings else 0.0,
+            "failed": self.failed,
+        }
+
+
+# Singleton instance
+_audio_chunker: Optional[AudioChunker] = None
+_missing_codec_logged = False
+
+
+def get_audio_chunker() -> Optional[AudioChunker]:
+    """Get the shared chunker, or None if chunking is disabled or unavailable"""
+    global _audio_chunker, _missing_codec_logged
+    settings = get_settings()
+    if not settings.chunking_enabled:
+        return None
+    if not codec.is_available():
+        if not _missing_codec_logged:
+            logger.warning("CHUNKING_ENABLED is set but PyAV is not installed; long audio is not split")
+            _missing_codec_logged = True
+        return None
+    if _audio_chunker is None:
+        _audio_chunker = AudioChunker(
+            sample_rate=settings.audio_sample_rate,
+            min_duration_ms=settings.chunking_min_seconds * 1000,
+            target_ms=settings.chunking_target_seconds * 1000,
+            overlap_ms=settings.chunking_overlap_ms,
+            bitrate=settings.audio_opus_bitrate,
+            pool=get_audio_pool(),
+        )
+        register_metrics("audio_chunker", _audio_chunker.stats)
+    return _audio_chunker
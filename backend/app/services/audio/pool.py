@@ -0,0 +1,25 @@
+"""Shared process pool for CPU-bound audio work"""
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from app.core.config import get_settings
+
+
+# Singleton instance
+_audio_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_audio_pool() -> ProcessPoolExecutor:
+    """Get the audio worker pool, starting it on first use"""
+    global _audio_pool
+    if _audio_pool is None:
+        _audio_pool = ProcessPoolExecutor(max_workers=get_settings().audio_workers)
+    return _audio_pool
+
+
+def shutdown_audio_pool() -> None:
+    """Stop the audio worker processes (app shutdown)"""
+    global _audio_pool
+    if _audio_pool is not None:
+        _audio_pool.shutdown(wait=False, cancel_futures=True)
+        _audio_pool = None
@@ -0,0 +1,137 @@
+"""Optional transcoding of uploads to compact Opus before the provider call"""
+import asyncio
+import time
+from concurrent.futures import Executor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Optional
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.core.metrics import register_metrics
+from app.services.audio import codec
+from app.services.audio.pool import get_audio_pool
+
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class TranscodeResult:
+    """Audio to send to the provider, and what transcoding saved"""
+    audio_bytes: bytes
+    audio_format: str
+    bytes_saved: int = 0
+    transcoded: bool = False
+
+
+class AudioTranscoder:
+    """
+    Re-encodes uploads as mono Opus/OGG in the audio process pool.
+
+    Only inputs in `formats` (by default the uncompressed and lossless ones,
+    where the savings dwarf the encode time) of at least min_bytes are
+    re-encoded. Everything else is passed through untouched, as are inputs
+    that fail to decode (the provider gets the original bytes and reports its
+    own error) or would not shrink.
+    """
+
+    def __init__(
+        self,
+        formats: set[str],
+        min_bytes: int,
+        sample_rate: int,
+        bitrate: int,
+        pool: Executor,
+    ):
+        self.formats = formats
+        self.min_bytes = min_bytes
+        self.sample_rate = sample_rate
+        self.bitrate = bitrate
+        self.pool = pool
+        self.transcoded = 0
+        self.skipped = 0
+        self.not_smaller = 0
+        self.failed = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.transcode_ms = 0
+
+    async def transcode(self, audio_bytes: bytes, audio_format: str) -> TranscodeResult:
+        """Shrink audio for the provider if it is worth it"""
+        original = TranscodeResult(audio_bytes, audio_format)
+        if audio_format not in self.formats or len(audio_bytes) < self.min_bytes:
+            self.skipped += 1
+            return original
+
+        start = time.perf_counter()
+        try:
+            encoded = await asyncio.get_running_loop().run_in_executor(
+                self.pool,
+                codec.transcode_to_opus,
+                audio_bytes,
+                self.sample_rate,
+                self.bitrate,
+            )
+        except (ValueError, BrokenProcessPool) as e:
+            self.failed += 1
+            logger.warning(f"Audio transcoding failed, sending original: {e}")
+            return original
+        self.transcode_ms += int((time.perf_counter() - start) * 1000)
+
+        if len(encoded) >= len(audio_bytes):
+            self.not_smaller += 1
+            return original
+
+        self.transcoded += 1
+        self.bytes_in += len(audio_bytes)
+        self.bytes_out += len(encoded)
+        return TranscodeResult(
+            audio_bytes=encoded,
+            audio_format="ogg",
+            bytes_saved=len(audio_bytes) - len(encoded),
+            transcoded=True,
+        )
+
+    def stats(self) -> dict:
+        """Get transcoding metrics"""
+        encoded = self.transcoded + self.not_smaller
+        return {
+            "transcoded": self.transcoded,
+            "skipped": self.skipped,
+            "not_smaller": self.not_smaller,
+            "failed": self.failed,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "bytes_saved": self.bytes_in - self.bytes_out,
+            "avg_transcode_ms": round(self.transcode_ms / encoded, 1) if encoded else 0.0,
+        }
+
+
+# Singleton instance
+_audio_transcoder: Optional[AudioTranscoder] = None
+_missing_codec_logged = False
+
+
+def get_audio_transcoder() -> Optional[AudioTranscoder]:
+    """Get the shared transcoder, or None if transcoding is disabled or unavailable"""
+    global _audio_transcoder, _missing_codec_logged
+    settings = get_settings()
+    if not settings.transcode_enabled:
+        return None
+    if not codec.is_available():
+        if not _missing_codec_logged:
+            logger.warning("TRANSCODE_ENABLED is set but PyAV is not installed; sending audio as uploaded")
+            _missing_codec_logged = True
+        return None
+    if _audio_transcoder is None:
+        _audio_transcoder = AudioTranscoder(
+            formats=settings.transcode_formats_set,
+            min_bytes=settings.transcode_min_bytes,
+            sample_rate=settings.audio_sample_rate,
+            bitrate=settings.audio_opus_bitrate,
+            pool=get_audio_pool(),
+        )
+        register_metrics("audio_transcoder", _audio_transcoder.stats)
+    return _audio_transcoder
+
@@ -0,0 +1,124 @@
+"""Optional silence trimming and silent-clip detection before the provider call"""
+import asyncio
+from concurrent.futures import Executor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from functools import partial
+from typing import Optional
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.core.metrics import register_metrics
+from app.services.audio import codec, vad
+from app.services.audio.pool import get_audio_pool
+
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class TrimmedAudio:
+    """Audio to send to the provider after silence trimming"""
+    audio_bytes: bytes
+    audio_format: str
+    silent: bool = False
+    trimmed_ms: int = 0
+    processed: bool = False  # audio_bytes were re-encoded (Opus/OGG)
+
+
+class SilenceTrimmer:
+    """
+    Cuts leading and trailing silence in the audio process pool.
+
+    Clips with no speech at all are flagged silent so the caller can skip
+    the provider call. Clips that fail to decode are passed through as-is.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        threshold_dbfs: float,
+        padding_ms: int,
+        min_speech_ms: int,
+        min_trim_ms: int,
+        bitrate: int,
+        pool: Executor,
+    ):
+        self.pool = pool
+        self._trim = partial(
+            vad.trim_silence,
+            sample_rate=sample_rate,
+            threshold_dbfs=threshold_dbfs,
+            padding_ms=padding_ms,
+            min_speech_ms=min_speech_ms,
+            min_trim_ms=min_trim_ms,
+            bitrate=bitrate,
+        )
+        self.checked = 0
+        self.trimmed = 0
+        self.trimmed_ms = 0
+        self.silent = 0
+        self.silent_ms = 0
+        self.failed = 0
+
+    async def trim(self, audio_bytes: bytes, audio_format: str) -> TrimmedAudio:
+        """Trim silence, or flag the clip as silent"""
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(self.pool, self._trim, audio_bytes)
+        except (ValueError, BrokenProcessPool) as e:
+            self.failed += 1
+            logger.warning(f"Silence detection failed, sending original: {e}")
+            return TrimmedAudio(audio_bytes, audio_format)
+
+        self.checked += 1
+        if result.silent:
+            self.silent += 1
+            self.silent_ms += result.duration_ms
+            return TrimmedAudio(audio_bytes, audio_format, silent=True, trimmed_ms=result.duration_ms)
+        if result.audio_bytes is None:
+            return TrimmedAudio(audio_bytes, audio_format)
+
+        self.trimmed += 1
+        self.trimmed_ms += result.trimmed_ms
+        return TrimmedAudio(result.audio_bytes, "ogg", trimmed_ms=result.trimmed_ms, processed=True)
+
+    def stats(self) -> dict:
+        """Get trimming metrics"""
+        return {
+            "checked": self.checked,
+            "trimmed": self.trimmed,
+            "trimmed_ms": self.trimmed_ms,
+            "provider_calls_skipped": self.silent,
+            "silent_ms": self.silent_ms,
+            "failed": self.failed,
+        }
+
+
+# Singleton instance
+_silence_trimmer: Optional[SilenceTrimmer] = None
+_missing_codec_logged = False
+
+
+def get_silence_trimmer() -> Optional[SilenceTrimmer]:
+    """Get the shared silence trimmer, or None if disabled or unavailable"""
+    global _silence_trimmer, _missing_codec_logged
+    settings = get_settings()
+    if not settings.silence_trim_enabled:
+        return None
+    if not codec.is_available():
+        if not _missing_codec_logged:
+            logger.warning("SILENCE_TRIM_ENABLED is set but PyAV is not installed; sending audio untrimmed")
+            _missing_codec_logged = True
+        return None
+    if _silence_trimmer is None:
+        _silence_trimmer = SilenceTrimmer(
+            sample_rate=settings.audio_sample_rate,
+            threshold_dbfs=settings.silence_threshold_dbfs,
+            padding_ms=settings.silence_padding_ms,
+            min_speech_ms=settings.silence_min_speech_ms,
+            min_trim_ms=settings.silence_min_trim_ms,
+            bitrate=settings.audio_opus_bitrate,
+            pool=get_audio_pool(),
+        )
+        register_metrics("silence_trimmer", _silence_trimmer.stats)
+    return _silence_trimmer
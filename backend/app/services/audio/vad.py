@@ -0,0 +1,165 @@
+"""Energy-based voice activity detection over decoded PCM (NumPy)
+
+The worker functions run in the audio process pool. trim_silence decodes
+the upload, finds the span between the first and last voiced frames, and
+re-encodes that span as Opus when enough silence was cut to be worth it.
+split_audio cuts long recordings at the quietest point near each chunk
+boundary into overlapping PCM chunks.
+"""
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from app.services.audio import codec
+
+
+# Analysis frame length
+FRAME_MS = 20
+
+# Full-scale amplitude of int16 PCM
+INT16_FULL_SCALE = 32768.0
+
+# How far from each chunk's target length to look for a pause
+SPLIT_SEARCH_MS = 5000
+
+# Window the frame levels are averaged over when looking for a pause
+PAUSE_WINDOW_MS = 200
+
+
+@dataclass
+class TrimResult:
+    """Outcome of a silence trimming pass"""
+    duration_ms: int
+    speech_ms: int
+    audio_bytes: Optional[bytes] = None  # Trimmed Opus/OGG, None if left as-is
+
+    @property
+    def silent(self) -> bool:
+        return self.speech_ms == 0
+
+    @property
+    def trimmed_ms(self) -> int:
+        return self.duration_ms - self.speech_ms if self.audio_bytes is not None else 0
+
+
+def frame_levels_dbfs(samples: np.ndarray, sample_rate: int, frame_ms: int = FRAME_MS) -> np.ndarray:
+    """RMS level of each complete frame in dBFS"""
+    frame_len = sample_rate * frame_ms // 1000
+    num_frames = samples.size // frame_len
+    if num_frames == 0:
+        return np.zeros(0)
+    frames = samples[:num_frames * frame_len].reshape(num_frames, frame_len).astype(np.float32)
+    rms = np.sqrt(np.mean(np.square(frames / INT16_FULL_SCALE), axis=1))
+    return 20 * np.log10(np.maximum(rms, 1e-10))
+
+
+def speech_bounds(
+    samples: np.ndarray,
+    sample_rate: int,
+    threshold_dbfs: float,
+    padding_ms: int,
+    min_speech_ms: int,
+) -> Optional[tuple[int, int]]:
+    """
+    Sample range from the first to the last voiced frame, widened by padding.
+
+    Returns None when fewer than min_speech_ms of frames are above
+    threshold_dbfs (clicks and breaths alone do not count as speech).
+    """
+    voiced = np.flatnonzero(frame_levels_dbfs(samples, sample_rate) > threshold_dbfs)
+    if voiced.size * FRAME_MS < max(min_speech_ms, 1):
+        return None
+    frame_len = sample_rate * FRAME_MS // 1000
+    padding = sample_rate * padding_ms // 1000
+    start = max(0, int(voiced[0]) * frame_len - padding)
+    end = min(samples.size, (int(voiced[-1]) + 1) * frame_len + padding)
+    return start, end
+
+
+def trim_silence(
+    audio_bytes: bytes,
+    sample_rate: int,
+    threshold_dbfs: float,
+    padding_ms: int,
+    min_speech_ms: int,
+    min_trim_ms: int,
+    bitrate: int,
+) -> TrimResult:
+    """
+    Decode audio and cut leading and trailing silence.
+
+    Raises:
+        ValueError: If the input cannot be decoded
+    """
+    samples = codec.decode_pcm16(audio_bytes, sample_rate)
+    duration_ms = samples.size * 1000 // sample_rate
+    bounds = speech_bounds(samples, sample_rate, threshold_dbfs, padding_ms, min_speech_ms)
+    if bounds is None:
+        return TrimResult(duration_ms=duration_ms, speech_ms=0)
+
+    start, end = bounds
+    speech_ms = (end - start) * 1000 // sample_rate
+    if duration_ms - speech_ms < min_trim_ms:
+        return TrimResult(duration_ms=duration_ms, speech_ms=speech_ms)
+    return TrimResult(
+        duration_ms=duration_ms,
+        speech_ms=speech_ms,
+        audio_bytes=codec.encode_opus(samples[start:end], sample_rate, bitrate),
+    )
+
+
+def split_points(samples: np.ndarray, sample_rate: int, target_ms: int) -> list[int]:
+    """
+    Sample offsets to cut at so each piece is about target_ms long.
+
+    Each cut is placed at the quietest PAUSE_WINDOW_MS stretch within
+    SPLIT_SEARCH_MS (at most a third of target_ms) of the target length.
+    """
+    levels = frame_levels_dbfs(samples, sample_rate)
+    window = max(1, PAUSE_WINDOW_MS // FRAME_MS)
+    if levels.size >= window:
+        levels = np.convolve(levels, np.ones(window) / window, mode="same")
+    frame_len = sample_rate * FRAME_MS // 1000
+    target = max(1, target_ms // FRAME_MS)
+    search = min(SPLIT_SEARCH_MS, target_ms // 3) // FRAME_MS
+
+    points = []
+    pos = 0
+    while levels.size - pos > target + search:
+        lo = pos + target - search
+        cut = lo + int(np.argmin(levels[lo:pos + target + search + 1]))
+        points.append(cut * frame_len)
+        pos = cut
+    return points
+
+
+def split_audio(
+    audio_bytes: bytes,
+    sample_rate: int,
+    min_duration_ms: int,
+    target_ms: int,
+    overlap_ms: int,
+) -> Optional[list[np.ndarray]]:
+    """
+    Decode audio and cut it into overlapping mono int16 chunks.
+
+    Adjacent chunks share overlap_ms of audio around each cut, so a word
+    split by a cut that found no real pause is heard whole by one of them.
+
+    Returns:
+        The chunks, or None if the audio is shorter than min_duration_ms
+
+    Raises:
+        ValueError: If the input cannot be decoded
+    """
+    samples = codec.decode_pcm16(audio_bytes, sample_rate)
+    if samples.size * 1000 // sample_rate < min_duration_ms:
+        return None
+
+    half_overlap = sample_rate * overlap_ms // 2000
+    bounds = [0, *split_points(samples, sample_rate, target_ms), samples.size]
+    return [
+        samples[max(0, start - half_overlap):min(samples.size, end + half_overlap)]
+        for start, end in zip(bounds, bounds[1:])
+    ]
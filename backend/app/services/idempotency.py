@@ -0,0 +1,107 @@
+"""In-memory idempotency helpers (fast-path filter, in-flight coalescing)"""
+import hashlib
+import math
+from typing import Optional
+
+from app.core.config import get_settings
+from app.core.metrics import register_metrics
+from app.core.singleflight import SingleFlight
+
+
+class IdempotencyFilter:
+    """
+    Bloom filter over (user_id, idempotency_key) pairs recorded by this process.
+
+    A negative answer means the key was never recorded here, letting
+    create_transcription skip the DB lookup for fresh keys. A positive answer
+    may be a false positive, so callers still confirm against the DB.
+
+    The filter only sees this process's writes. Keys recorded by other workers
+    (or before a restart) look new, so their retries skip the lookup and make
+    a second, billed provider call; the insert then hits the
+    unique_user_idempotency constraint and the stored row is returned. It is
+    therefore off by default and meant for single-worker deployments.
+    Past `capacity` insertions the false-positive rate rises above
+    `error_rate`, which costs DB lookups but never correctness.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self.added = 0
+        self.definitely_new = 0
+        self.maybe_seen = 0
+
+    def _positions(self, user_id: str, idempotency_key: str) -> list[int]:
+        # Double hashing (Kirsch-Mitzenmacher) from a single 128-bit digest
+        digest = hashlib.blake2b(
+            f"{user_id}\x00{idempotency_key}".encode(), digest_size=16
+        ).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, user_id: str, idempotency_key: str) -> None:
+        """Record that a key exists"""
+        for pos in self._positions(user_id, idempotency_key):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+        self.added += 1
+
+    def might_contain(self, user_id: str, idempotency_key: str) -> bool:
+        """False if the key was definitely never added"""
+        for pos in self._positions(user_id, idempotency_key):
+            if not self._bits[pos >> 3] & (1 << (pos & 7)):
+                self.definitely_new += 1
+                return False
+        self.maybe_seen += 1
+        return True
+
+    def stats(self) -> dict:
+        """Get filter metrics"""
+        checks = self.definitely_new + self.maybe_seen
+        return {
+            "added": self.added,
+            "capacity": self.capacity,
+            "checks": checks,
+            "db_lookups_skipped": self.definitely_new,
+            "skip_ratio": round(self.definitely_new / checks, 4) if checks else 0.0,
+            "memory_bytes": len(self._bits),
+        }
+
+
+# Singleton instances
+_idempotency_filter: Optional[IdempotencyFilter] = None
+_inflight_transcriptions: Optional[SingleFlight] = None
+
+
+def get_idempotency_filter() -> Optional[IdempotencyFilter]:
+    """Get the shared idempotency filter, or None if disabled"""
+    global _idempotency_filter
+    settings = get_settings()
+    if not settings.idempotency_filter_enabled:
+        return None
+    if _idempotency_filter is None:
+        _idempotency_filter = IdempotencyFilter(
+            settings.idempotency_filter_capacity,
+            settings.idempotency_filter_error_rate,
+        )
+        register_metrics("idempotency_filter", _idempotency_filter.stats)
+    return _idempotency_filter
+
+
+def get_inflight_transcriptions() -> SingleFlight:
+    """
+    Get the registry of in-progress transcriptions keyed by
+    (user_id, idempotency_key).
+
+    A retry that arrives while the first attempt is still waiting on the
+    provider awaits that attempt's result instead of paying for a second call.
+    """
+    global _inflight_transcriptions
+    if _inflight_transcriptions is None:
+        _inflight_transcriptions = SingleFlight()
+        register_metrics("inflight_transcriptions", _inflight_transcriptions.stats)
+    return _inflight_transcriptions
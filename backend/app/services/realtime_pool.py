@@ -0,0 +1,249 @@
+"""Pool of pre-warmed OpenAI Realtime sessions"""
+import asyncio
+import json
+import time
+from collections import deque
+from typing import Optional
+
+import websockets
+from websockets.asyncio.client import ClientConnection
+from websockets.protocol import State
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.core.metrics import register_metrics
+
+
+logger = get_logger(__name__)
+
+# OpenAI Realtime API endpoint
+OPENAI_REALTIME_URL = "wss://api.openai.com/v1/realtime"
+
+# Realtime API requires a realtime model for the connection
+# The transcription model is configured separately in session.update
+DEFAULT_REALTIME_MODEL = "gpt-4o-mini-realtime-preview"
+
+# Mapping from user-facing model names to realtime connection models
+REALTIME_CONNECTION_MODELS = {
+    "gpt-4o-mini-transcribe": "gpt-4o-mini-realtime-preview",
+    "gpt-4o-transcribe": "gpt-4o-realtime-preview",
+    # Direct realtime models
+    "gpt-4o-mini-realtime-preview": "gpt-4o-mini-realtime-preview",
+    "gpt-4o-realtime-preview": "gpt-4o-realtime-preview",
+}
+
+# How long a warm-up may wait for session.created / session.updated
+HANDSHAKE_TIMEOUT_S = 10.0
+
+# Pause before warming again after a failed warm-up
+WARM_RETRY_DELAY_S = 5.0
+
+
+def connection_model_for(model: str) -> str:
+    """Map a user-selected model to its realtime connection model"""
+    return REALTIME_CONNECTION_MODELS.get(model, DEFAULT_REALTIME_MODEL)
+
+
+def session_update_event() -> dict:
+    """
+    The session.update event configuring a transcription-only session.
+
+    With local VAD, server turn detection is off and the proxy commits.
+    """
+    settings = get_settings()
+    turn_detection = None
+    if settings.realtime_vad_mode != "local":
+        turn_detection = {
+            "type": "server_vad",
+            "threshold": settings.realtime_vad_threshold,
+            "prefix_padding_ms": settings.realtime_vad_prefix_padding_ms,
+            "silence_duration_ms": settings.realtime_vad_silence_duration_ms,
+        }
+    return {
+        "type": "session.update",
+        "session": {
+            "modalities": ["text"],
+            "input_audio_format": "pcm16",
+            "input_audio_transcription": {
+                "model": "whisper-1",  # Transcription model
+            },
+            "turn_detection": turn_detection,
+        }
+    }
+
+
+async def open_realtime_connection(connection_model: str) -> ClientConnection:
+    """Open a WebSocket to the OpenAI Realtime API for a connection model"""
+    settings = get_settings()
+    return await websockets.connect(
+        f"{OPENAI_REALTIME_URL}?model={connection_model}",
+        additional_headers={
+            "Authorization": f"Bearer {settings.openai_api_key}",
+            "OpenAI-Beta": "realtime=v1",
+        },
+        ping_interval=30,
+        ping_timeout=10,
+    )
+
+
+async def _wait_for_event(ws: ClientConnection, event_type: str) -> None:
+    """Read events until one of event_type arrives"""
+    while True:
+        event = json.loads(await ws.recv())
+        if event.get("type") == event_type:
+            return
+        if event.get("type") == "error":
+            raise RuntimeError(event.get("error", {}).get("message", "Unknown error"))
+
+
+async def open_configured_session(connection_model: str) -> ClientConnection:
+    """
+    Open a realtime session and apply session_update_event(), returning once
+    OpenAI confirms it with session.updated.
+    """
+    ws = await open_realtime_connection(connection_model)
+    try:
+        async with asyncio.timeout(HANDSHAKE_TIMEOUT_S):
+            await _wait_for_event(ws, "session.created")
+            await ws.send(json.dumps(session_update_event()))
+            await _wait_for_event(ws, "session.updated")
+    except BaseException:
+        await ws.close()
+        raise
+    return ws
+
+
+class RealtimeSessionPool:
+    """
+    Keeps `size` configured, idle upstream sessions per connection model.
+
+    Upstream sessions carry per-client audio buffers, so each is handed to a
+    single client and never returned; a background task opens replacements
+    and retires idle sessions older than max_age_seconds (OpenAI ends
+    sessions after a fixed lifetime).
+    """
+
+    def __init__(self, connection_models: list[str], size: int, max_age_seconds: float):
+        self.connection_models = connection_models
+        self.size = size
+        self.max_age_seconds = max_age_seconds
+        self._idle: dict[str, deque[tuple[ClientConnection, float]]] = {
+            model: deque() for model in connection_models
+        }
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._closing: set[asyncio.Task] = set()
+        self.hits = 0
+        self.misses = 0
+        self.warmed = 0
+        self.warm_failures = 0
+        self.retired = 0
+        self._warm_ms_total = 0.0
+
+    def acquire(self, connection_model: str) -> Optional[ClientConnection]:
+        """Take a warm session, or None if none is ready"""
+        idle = self._idle.get(connection_model)
+        while idle:
+            ws, created_at = idle.popleft()
+            if ws.state is State.OPEN and time.monotonic() - created_at < self.max_age_seconds:
+                self.hits += 1
+                self._wake.set()
+                return ws
+            self._retire(ws)
+        self.misses += 1
+        return None
+
+    def start(self) -> None:
+        """Start warming sessions in the background"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._maintain())
+            logger.info(f"Started realtime session pool ({self.size} per model: {self.connection_models})")
+
+    async def close(self) -> None:
+        """Stop warming and close idle sessions"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for idle in self._idle.values():
+            while idle:
+                ws, _ = idle.popleft()
+                await ws.close()
+
+    async def _maintain(self) -> None:
+        while True:
+            self._wake.clear()
+            for model, idle in self._idle.items():
+                for ws, created_at in list(idle):
+                    if ws.state is not State.OPEN or time.monotonic() - created_at >= self.max_age_seconds:
+                        idle.remove((ws, created_at))
+                        self._retire(ws)
+            missing = [
+                model for model, idle in self._idle.items() for _ in range(self.size - len(idle))
+            ]
+            results = await asyncio.gather(*(self._warm(model) for model in missing))
+            delay = self.max_age_seconds / 4
+            if not all(results):
+                delay = min(delay, WARM_RETRY_DELAY_S)
+            try:
+                async with asyncio.timeout(delay):
+                    await self._wake.wait()
+            except TimeoutError:
+                pass
+
+    async def _warm(self, connection_model: str) -> bool:
+        start = time.monotonic()
+        try:
+            ws = await open_configured_session(connection_model)
+        except Exception as e:
+            self.warm_failures += 1
+            logger.warning(f"Failed to warm realtime session for {connection_model}: {e}")
+            return False
+        self.warmed += 1
+        self._warm_ms_total += (time.monotonic() - start) * 1000
+        self._idle[connection_model].append((ws, time.monotonic()))
+        return True
+
+    def _retire(self, ws: ClientConnection) -> None:
+        self.retired += 1
+        task = asyncio.create_task(ws.close())
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    def stats(self) -> dict:
+        """Get pool metrics"""
+        acquisitions = self.hits + self.misses
+        return {
+            "idle": {model: len(idle) for model, idle in self._idle.items()},
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / acquisitions, 4) if acquisitions else 0.0,
+            "warmed": self.warmed,
+            "warm_failures": self.warm_failures,
+            "retired": self.retired,
+            "warm_ms_avg": round(self._warm_ms_total / self.warmed) if self.warmed else None,
+        }
+
+
+# Singleton instance
+_realtime_pool: Optional[RealtimeSessionPool] = None
+
+
+def get_realtime_pool() -> Optional[RealtimeSessionPool]:
+    """Get the shared session pool, or None if disabled or OpenAI is not configured"""
+    global _realtime_pool
+    settings = get_settings()
+    if settings.realtime_pool_size <= 0 or not settings.openai_api_key:
+        return None
+    if _realtime_pool is None:
+        models = settings.realtime_pool_models_list or [DEFAULT_REALTIME_MODEL]
+        _realtime_pool = RealtimeSessionPool(
+            sorted({connection_model_for(model) for model in models}),
+            size=settings.realtime_pool_size,
+            max_age_seconds=settings.realtime_pool_max_age_seconds,
+        )
+        register_metrics("realtime_pool", _realtime_pool.stats)
+    return _realtime_pool
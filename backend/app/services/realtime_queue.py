@@ -0,0 +1,164 @@
+"""Bounded outbound message queues for realtime sessions"""
+import asyncio
+import time
+from collections import deque
+from itertools import islice
+from typing import Any, Callable, Optional
+
+from app.core.metrics import register_metrics
+
+
+# Overload policies for message kinds
+DROP = "drop"
+COALESCE = "coalesce"
+REPLACE = "replace"
+
+
+class QueueOverflow(Exception):
+    """Raised when a message that must be delivered finds its queue full"""
+
+    def __init__(self, queue: str, kind: str):
+        self.queue = queue
+        self.kind = kind
+        super().__init__(f"{queue} queue is full ({kind})")
+
+
+def _keep_newest(queued: Any, new: Any) -> Any:
+    return new
+
+
+class SessionQueue:
+    """
+    Bounded FIFO of outbound messages for one direction of a realtime session.
+
+    Every message has a kind. While the queue is full, a kind with the
+    "drop" policy is discarded; a kind with the "coalesce" policy is merged
+    into the last queued message if that is of the same kind, so nothing
+    queued after it is overtaken; and a kind with the "replace" policy
+    supersedes any queued message of its kind and goes to the tail. A
+    coalesce or replace message that can't do that is queued past the limit,
+    at most once per kind; after that it must be delivered like the kinds
+    without a policy (audio, final transcripts, errors): if one finds the
+    queue full, QueueOverflow is raised and the caller ends the session
+    instead of buffering without bound.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        maxsize: int,
+        policies: dict[str, str],
+        merge: Callable[[Any, Any], Any] = _keep_newest,
+    ):
+        self.name = name
+        self.maxsize = maxsize
+        self.policies = policies
+        self.merge = merge
+        self._items: deque[list] = deque()  # [kind, message, enqueued_at]
+        self._ready = asyncio.Event()
+        self.closed = False
+        self.max_depth = 0
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.lag_ms = 0.0
+        self.max_lag_ms = 0.0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def put(self, kind: str, message: Any) -> None:
+        """Queue a message, applying its kind's policy when the queue is full"""
+        if len(self._items) >= self.maxsize:
+            policy = self.policies.get(kind)
+            if policy == DROP:
+                self.dropped += 1
+                return
+            if policy == COALESCE and self._items and self._items[-1][0] == kind:
+                self._items[-1][1] = self.merge(self._items[-1][1], message)
+                self.coalesced += 1
+                return
+            if policy == REPLACE:
+                replaced = [item for item in self._items if item[0] == kind]
+                for item in replaced:
+                    self._items.remove(item)
+                self.coalesced += len(replaced)
+            if policy not in (COALESCE, REPLACE) or any(
+                item[0] == kind for item in islice(self._items, self.maxsize, None)
+            ):
+                raise QueueOverflow(self.name, kind)
+
+        self._items.append([kind, message, time.monotonic()])
+        self.max_depth = max(self.max_depth, len(self._items))
+        self._ready.set()
+
+    def close(self) -> None:
+        """Stop waiting for new messages; get() returns None once the queue is empty"""
+        self.closed = True
+        self._ready.set()
+
+    async def get(self) -> Any:
+        """Wait for and remove the oldest message (None once closed and empty)"""
+        while not self._items:
+            if self.closed:
+                return None
+            self._ready.clear()
+            await self._ready.wait()
+        _, message, enqueued_at = self._items.popleft()
+        self.sent += 1
+        self.lag_ms = (time.monotonic() - enqueued_at) * 1000
+        self.max_lag_ms = max(self.max_lag_ms, self.lag_ms)
+        return message
+
+    def stats(self) -> dict:
+        """Get queue metrics"""
+        oldest_ms = (time.monotonic() - self._items[0][2]) * 1000 if self._items else 0.0
+        return {
+            "depth": len(self._items),
+            "max_depth": self.max_depth,
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "lag_ms": round(max(self.lag_ms, oldest_ms), 1),
+            "max_lag_ms": round(max(self.max_lag_ms, oldest_ms), 1),
+        }
+
+
+class SessionQueueRegistry:
+    """Queues of the active realtime sessions, reported as "realtime_sessions" """
+
+    def __init__(self):
+        self._sessions: dict[str, dict[str, SessionQueue]] = {}
+        self.overflows = 0
+
+    def add(self, session_id: str, queues: dict[str, SessionQueue]) -> None:
+        """Track a session's queues by direction"""
+        self._sessions[session_id] = queues
+
+    def remove(self, session_id: str) -> None:
+        """Stop tracking a session"""
+        self._sessions.pop(session_id, None)
+
+    def stats(self) -> dict:
+        """Get per-session queue metrics"""
+        return {
+            "active": len(self._sessions),
+            "overflows": self.overflows,
+            "sessions": {
+                session_id: {direction: queue.stats() for direction, queue in queues.items()}
+                for session_id, queues in self._sessions.items()
+            },
+        }
+
+
+# Singleton instance
+_session_queues: Optional[SessionQueueRegistry] = None
+
+
+def get_session_queues() -> SessionQueueRegistry:
+    """Get the registry of active realtime session queues"""
+    global _session_queues
+    if _session_queues is None:
+        _session_queues = SessionQueueRegistry()
+        register_metrics("realtime_sessions", _session_queues.stats)
+    return _session_queues
@@ -0,0 +1,50 @@
+"""Transcript accumulation for realtime sessions"""
+
+
+class TranscriptAccumulator:
+    """
+    Transcript built from streamed deltas.
+
+    Appends are O(1): deltas are kept in a list and joined only when the
+    full text is read, after which the joined text replaces the parts.
+    Every delta gets the next sequence number.
+
+    Checkpoints (the full text, for delta-only clients to verify or resync)
+    fall due once the text has grown by max(min_checkpoint_chars, its length
+    at the last checkpoint), so their spacing doubles and the total size of
+    all checkpoints stays linear in the transcript length.
+    """
+
+    def __init__(self, min_checkpoint_chars: int):
+        self.min_checkpoint_chars = min_checkpoint_chars
+        self._parts: list[str] = []
+        self._length = 0
+        self._checkpoint_length = 0
+        self.seq = 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    def append(self, delta: str) -> int:
+        """Add a delta and return its sequence number"""
+        self._parts.append(delta)
+        self._length += len(delta)
+        self.seq += 1
+        return self.seq
+
+    @property
+    def text(self) -> str:
+        """The full transcript so far"""
+        if len(self._parts) > 1:
+            self._parts = ["".join(self._parts)]
+        return self._parts[0] if self._parts else ""
+
+    def checkpoint_due(self) -> bool:
+        """Check whether enough text arrived since the last checkpoint"""
+        grown = self._length - self._checkpoint_length
+        return grown >= max(self.min_checkpoint_chars, self._checkpoint_length)
+
+    def checkpoint(self) -> str:
+        """Mark a checkpoint and return the full text"""
+        self._checkpoint_length = self._length
+        return self.text
@@ -0,0 +1,110 @@
+"""Streaming voice activity detection for realtime sessions (NumPy)"""
+from collections import deque
+
+import numpy as np
+
+from app.services.audio.vad import FRAME_MS, INT16_FULL_SCALE
+
+
+# Gate events, in stream order
+SPEECH_STARTED = "speech_started"
+AUDIO = "audio"
+SPEECH_STOPPED = "speech_stopped"
+
+
+class StreamingVAD:
+    """
+    Gates a PCM16 stream down to its voiced stretches.
+
+    Chunks are cut into FRAME_MS frames whose energies are compared with the
+    threshold (converted once from dBFS) in one vectorized pass. While closed,
+    frames are held in a pre-roll buffer of prefix_padding_ms; speech starts
+    once min_speech_ms of consecutive frames are above threshold_dbfs, and the
+    buffered frames go out first so the onset is not clipped. Speech stops
+    after silence_duration_ms below the threshold (that silence is still
+    sent, as trailing padding).
+
+    feed() and flush() return (event, audio) pairs in order: SPEECH_STARTED,
+    AUDIO with the bytes to forward, SPEECH_STOPPED.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        threshold_dbfs: float,
+        min_speech_ms: int,
+        prefix_padding_ms: int,
+        silence_duration_ms: int,
+    ):
+        self.sample_rate = sample_rate
+        self.frame_len = sample_rate * FRAME_MS // 1000
+        self.frame_bytes = self.frame_len * 2
+        # Sum of squared samples of a frame whose RMS level is threshold_dbfs
+        threshold_rms = INT16_FULL_SCALE * 10 ** (threshold_dbfs / 20)
+        self._energy_threshold = self.frame_len * threshold_rms ** 2
+        self.min_speech_frames = max(1, min_speech_ms // FRAME_MS)
+        self.silence_frames = max(1, silence_duration_ms // FRAME_MS)
+        preroll_frames = prefix_padding_ms // FRAME_MS + self.min_speech_frames
+        self._preroll: deque[bytes] = deque(maxlen=preroll_frames)
+        self._remainder = b""
+        self._run = 0  # Voiced frames while closed, silent frames while speaking
+        self.speaking = False
+        self.frames_in = 0
+        self.frames_sent = 0
+
+    def feed(self, pcm: bytes) -> list[tuple[str, bytes]]:
+        """Process a chunk of PCM16 audio"""
+        data = self._remainder + pcm if self._remainder else pcm
+        usable = len(data) - len(data) % self.frame_bytes
+        self._remainder = data[usable:]
+        if not usable:
+            return []
+
+        frames = np.frombuffer(data, dtype="<i2", count=usable // 2).reshape(-1, self.frame_len)
+        frames = frames.astype(np.float32)
+        voiced = np.einsum("ij,ij->i", frames, frames) > self._energy_threshold
+        self.frames_in += voiced.size
+
+        events = []
+        sent_from = 0 if self.speaking else None  # Start of the frames to forward
+        for i, is_voiced in enumerate(voiced.tolist()):
+            if not self.speaking:
+                self._preroll.append(data[i * self.frame_bytes:(i + 1) * self.frame_bytes])
+                self._run = self._run + 1 if is_voiced else 0
+                if self._run >= self.min_speech_frames:
+                    self.speaking = True
+                    self._run = 0
+                    events.append((SPEECH_STARTED, b""))
+                    events.append(self._send(b"".join(self._preroll)))
+                    self._preroll.clear()
+                    sent_from = (i + 1) * self.frame_bytes
+                continue
+
+            self._run = 0 if is_voiced else self._run + 1
+            if self._run >= self.silence_frames:
+                events.append(self._send(data[sent_from:(i + 1) * self.frame_bytes]))
+                events.append((SPEECH_STOPPED, b""))
+                self.speaking = False
+                self._run = 0
+                sent_from = None
+
+        if sent_from is not None and sent_from < usable:
+            events.append(self._send(data[sent_from:usable]))
+        return [event for event in events if event[0] != AUDIO or event[1]]
+
+    def flush(self) -> list[tuple[str, bytes]]:
+        """End any speech in progress, forwarding the partial frame left over"""
+        events = []
+        if self.speaking:
+            if self._remainder:
+                events.append((AUDIO, self._remainder))
+            events.append((SPEECH_STOPPED, b""))
+        self._remainder = b""
+        self._preroll.clear()
+        self._run = 0
+        self.speaking = False
+        return events
+
+    def _send(self, audio: bytes) -> tuple[str, bytes]:
+        self.frames_sent += len(audio) // self.frame_bytes
+        return AUDIO, audio
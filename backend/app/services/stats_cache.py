@@ -0,0 +1,128 @@
+"""Cache of per-user stats responses"""
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from app.core.config import get_settings
+from app.core.metrics import register_metrics
+
+
+def _seconds_until_utc_midnight() -> float:
+    """Stats ranges are built from UTC days, so every entry goes stale at midnight"""
+    now = datetime.now(timezone.utc)
+    midnight = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    return (midnight - now).total_seconds()
+
+
+class StatsCache(ABC):
+    """Interface for stats caches keyed by (user_id, range)"""
+
+    @abstractmethod
+    async def get(self, user_id: str, range_type: str) -> Optional[dict]:
+        """Get cached stats, or None on a miss"""
+        pass
+
+    @abstractmethod
+    async def set(self, user_id: str, range_type: str, stats: dict) -> None:
+        """Store stats for a user and range"""
+        pass
+
+    @abstractmethod
+    async def invalidate(self, user_id: str) -> None:
+        """Drop every cached range for a user"""
+        pass
+
+
+class NullStatsCache(StatsCache):
+    """Cache that never stores anything (caching disabled)"""
+
+    async def get(self, user_id: str, range_type: str) -> Optional[dict]:
+        return None
+
+    async def set(self, user_id: str, range_type: str, stats: dict) -> None:
+        pass
+
+    async def invalidate(self, user_id: str) -> None:
+        pass
+
+
+class InMemoryStatsCache(StatsCache):
+    """
+    Per-process LRU stats cache.
+
+    Entries live until the user records a transcription, the TTL passes, or
+    the UTC day rolls over. The TTL bounds staleness across workers, since
+    invalidation only reaches the worker that handled the write.
+    """
+
+    def __init__(self, max_users: int, ttl_seconds: float):
+        self.max_users = max_users
+        self.ttl_seconds = ttl_seconds
+        # user_id -> range -> (stats, expires_at), LRU-ordered by user
+        self._entries: OrderedDict[str, dict[str, tuple[dict, float]]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    async def get(self, user_id: str, range_type: str) -> Optional[dict]:
+        entry = self._entries.get(user_id, {}).get(range_type)
+        if entry is not None:
+            stats, expires_at = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return stats
+            del self._entries[user_id][range_type]
+        self.misses += 1
+        return None
+
+    async def set(self, user_id: str, range_type: str, stats: dict) -> None:
+        ttl = min(self.ttl_seconds, _seconds_until_utc_midnight())
+        self._entries.setdefault(user_id, {})[range_type] = (stats, time.monotonic() + ttl)
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_users:
+            self._entries.popitem(last=False)
+
+    async def invalidate(self, user_id: str) -> None:
+        if self._entries.pop(user_id, None) is not None:
+            self.invalidations += 1
+
+    def stats(self) -> dict:
+        """Get cache metrics"""
+        lookups = self.hits + self.misses
+        return {
+            "users": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+# Singleton instance
+_stats_cache: Optional[StatsCache] = None
+
+
+def get_stats_cache() -> StatsCache:
+    """Get the stats cache configured by stats_cache_backend"""
+    global _stats_cache
+    if _stats_cache is None:
+        settings = get_settings()
+        if settings.stats_cache_backend == "memory":
+            cache = InMemoryStatsCache(
+                settings.stats_cache_max_users,
+                settings.stats_cache_ttl_seconds,
+            )
+            register_metrics("stats_cache", cache.stats)
+            _stats_cache = cache
+        else:
+            _stats_cache = NullStatsCache()
+    return _stats_cache
+
+
+def set_stats_cache(cache: StatsCache) -> None:
+    """Install a custom stats cache implementation (e.g. a shared Redis cache)"""
+    global _stats_cache
+    _stats_cache = cache
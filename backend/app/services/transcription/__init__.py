@@ -1,22 +1,49 @@
 """Transcription providers module"""
 from app.services.transcription.base import (
+    ConcurrencyLimiter,
     Provider,
+    ProviderBusyError,
+    ProviderUnavailableError,
     TranscriptionError,
     TranscriptionProvider,
     TranscriptionResult,
 )
+from app.services.transcription.breaker import (
+    CircuitBreaker,
+    CircuitBreakers,
+    FailoverProvider,
+    get_circuit_breakers,
+)
+from app.services.transcription.chunked import stitch_transcripts, transcribe_chunks
+from app.services.transcription.hedging import HedgedProvider, HedgingPolicy, get_hedging_policy
 from app.services.transcription.registry import (
     ProviderRegistry,
     get_provider,
     get_provider_registry,
 )
+from app.services.transcription.routing import AdaptiveRouter, MeteredProvider, get_adaptive_router
 
 __all__ = [
+    "AdaptiveRouter",
+    "CircuitBreaker",
+    "CircuitBreakers",
+    "ConcurrencyLimiter",
+    "FailoverProvider",
+    "HedgedProvider",
+    "HedgingPolicy",
+    "MeteredProvider",
     "Provider",
+    "ProviderBusyError",
     "ProviderRegistry",
+    "ProviderUnavailableError",
     "TranscriptionError",
     "TranscriptionProvider",
     "TranscriptionResult",
+    "get_adaptive_router",
+    "get_circuit_breakers",
+    "get_hedging_policy",
     "get_provider",
     "get_provider_registry",
+    "stitch_transcripts",
+    "transcribe_chunks",
 ]
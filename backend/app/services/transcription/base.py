@@ -1,9 +1,14 @@
 """Base classes and types for transcription providers"""
+import asyncio
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from enum import Enum
 from typing import Optional
 
+from app.core.admission import AdmissionController, AdmissionRejected
+from app.core.config import get_settings
+from app.core.metrics import register_metrics
+
 
 class Provider(str, Enum):
     """Supported transcription providers"""
@@ -28,6 +33,65 @@ class TranscriptionError(Exception):
         super().__init__(message)
 
 
+class ProviderBusyError(TranscriptionError):
+    """Raised when a provider's call queue is full or too slow"""
+    def __init__(self, message: str, provider: str, model: Optional[str] = None, retry_after_s: float = 1.0):
+        self.retry_after_s = retry_after_s
+        super().__init__(message, provider=provider, model=model)
+
+
+class ProviderUnavailableError(TranscriptionError):
+    """Raised without calling a provider whose circuit breaker is open"""
+    def __init__(self, message: str, provider: str, model: Optional[str] = None, retry_after_s: float = 1.0):
+        self.retry_after_s = retry_after_s
+        super().__init__(message, provider=provider, model=model)
+
+
+# Provider HTTP statuses that reject the request itself (the audio or its
+# parameters), so sending it to another provider would not help
+CLIENT_ERROR_STATUSES = {400, 413, 415, 422}
+
+
+def is_client_error(error: TranscriptionError) -> bool:
+    """Check whether a provider failure was caused by the request rather than the provider"""
+    cause = error.__cause__
+    status = getattr(cause, "status_code", None) or getattr(cause, "code", None)
+    return status in CLIENT_ERROR_STATUSES
+
+
+class ConcurrencyLimiter(AdmissionController):
+    """
+    Bounds concurrent and queued calls to a provider.
+    
+    At most max_concurrent calls run at once; up to max_queued more may wait
+    for a slot, for at most max_wait_ms. Anything beyond that fails fast with
+    ProviderBusyError.
+    """
+    
+    def __init__(self, provider: str, max_concurrent: int, max_queued: int, max_wait_ms: Optional[int] = None):
+        super().__init__(provider, max_concurrent, max_queued, max_wait_ms)
+        self.provider = provider
+    
+    async def __aenter__(self) -> "ConcurrencyLimiter":
+        try:
+            await self.acquire()
+        except AdmissionRejected as e:
+            raise ProviderBusyError(
+                f"Provider '{self.provider}' is at capacity ({e.reason})",
+                provider=self.provider,
+                retry_after_s=e.retry_after_s,
+            )
+        return self
+
+
+# Limiters of every provider, reported together as "provider_limiters"
+_limiters: dict[str, ConcurrencyLimiter] = {}
+
+
+def _limiter_stats() -> dict:
+    return {name: limiter.stats() for name, limiter in _limiters.items()}
+
+
 class TranscriptionProvider(ABC):
     """Abstract base class for transcription providers"""
     
@@ -35,6 +99,23 @@ class TranscriptionProvider(ABC):
     supported_models: list[str]
     default_model: str
     
+    _limiter: Optional[ConcurrencyLimiter] = None
+    
+    @property
+    def limiter(self) -> ConcurrencyLimiter:
+        """Get the per-provider concurrency limiter"""
+        if self._limiter is None:
+            settings = get_settings()
+            self._limiter = ConcurrencyLimiter(
+                self.name,
+                max_concurrent=settings.provider_max_concurrency,
+                max_queued=settings.provider_max_queue,
+                max_wait_ms=settings.provider_max_wait_ms,
+            )
+            _limiters[self.name] = self._limiter
+            register_metrics("provider_limiters", _limiter_stats)
+        return self._limiter
+    
     @abstractmethod
     async def transcribe(
         self,
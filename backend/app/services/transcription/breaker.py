@@ -0,0 +1,264 @@
+"""Circuit breakers per (provider, model) and failover between providers"""
+import time
+from collections import deque
+from enum import Enum
+from typing import Optional
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.core.metrics import register_metrics
+from app.services.transcription.base import (
+    ProviderBusyError,
+    ProviderUnavailableError,
+    TranscriptionError,
+    TranscriptionProvider,
+    TranscriptionResult,
+    is_client_error,
+)
+
+
+logger = get_logger(__name__)
+
+
+class BreakerState(str, Enum):
+    """Circuit breaker states"""
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Stops calls to a failing or very slow (provider, model).
+
+    Closed: calls flow and their outcomes fill a window of the last
+    window_size calls. Once it holds min_calls, an error rate of at least
+    error_rate or a share of calls slower than slow_call_ms of at least
+    slow_rate opens the breaker.
+    Open: calls are refused for open_seconds.
+    Half-open: up to half_open_max_calls probe calls are let through; a
+    good probe closes the breaker, a failed or slow one re-opens it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        window_size: int,
+        min_calls: int,
+        error_rate: float,
+        slow_call_ms: int,
+        slow_rate: float,
+        open_seconds: float,
+        half_open_max_calls: int,
+    ):
+        self.name = name
+        self.min_calls = min_calls
+        self.error_rate = error_rate
+        self.slow_call_ms = slow_call_ms
+        self.slow_rate = slow_rate
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self._window: deque[tuple[bool, bool]] = deque(maxlen=window_size)  # (failed, slow)
+        self._state = BreakerState.CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+        self.opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> BreakerState:
+        """Current state (an open breaker turns half-open after open_seconds)"""
+        if self._state == BreakerState.OPEN and self.retry_after_s() == 0:
+            self._state = BreakerState.HALF_OPEN
+            self._probes = 0
+        return self._state
+
+    def retry_after_s(self) -> float:
+        """Seconds until an open breaker lets a probe through"""
+        if self._state != BreakerState.OPEN:
+            return 0.0
+        return max(0.0, self._opened_at + self.open_seconds - time.monotonic())
+
+    def allow(self) -> bool:
+        """Check (and reserve, when half-open) permission for one call"""
+        state = self.state
+        if state == BreakerState.CLOSED:
+            return True
+        if state == BreakerState.HALF_OPEN and self._probes < self.half_open_max_calls:
+            self._probes += 1
+            return True
+        self.rejected += 1
+        return False
+
+    def record(self, latency_ms: float, ok: bool) -> None:
+        """Record the outcome of an allowed call"""
+        slow = latency_ms > self.slow_call_ms
+        if self._state == BreakerState.HALF_OPEN:
+            self._probes = max(0, self._probes - 1)
+            if ok and not slow:
+                self._close()
+            else:
+                self._open()
+            return
+
+        self._window.append((not ok, slow))
+        if self._state == BreakerState.CLOSED and len(self._window) >= self.min_calls:
+            failed = sum(f for f, _ in self._window) / len(self._window)
+            slowed = sum(s for _, s in self._window) / len(self._window)
+            if failed >= self.error_rate or slowed >= self.slow_rate:
+                self._open()
+
+    def release(self) -> None:
+        """Give back a half-open probe slot for a call with no verdict (cancelled, busy)"""
+        if self._state == BreakerState.HALF_OPEN:
+            self._probes = max(0, self._probes - 1)
+
+    def _open(self) -> None:
+        if self._state != BreakerState.OPEN:
+            self.opened += 1
+            logger.warning(f"Circuit breaker opened for {self.name}")
+        self._state = BreakerState.OPEN
+        self._opened_at = time.monotonic()
+
+    def _close(self) -> None:
+        logger.info(f"Circuit breaker closed for {self.name}")
+        self._state = BreakerState.CLOSED
+        self._window.clear()
+
+
+class CircuitBreakers:
+    """Circuit breakers keyed by (provider, model), created on first use"""
+
+    def __init__(self, **breaker_options):
+        self.breaker_options = breaker_options
+        self._breakers: dict[tuple[str, str], CircuitBreaker] = {}
+        self.failovers = 0
+
+    def get(self, provider: str, model: str) -> CircuitBreaker:
+        """Get the breaker of a (provider, model)"""
+        key = (provider, model)
+        if key not in self._breakers:
+            self._breakers[key] = CircuitBreaker(f"{provider}/{model}", **self.breaker_options)
+        return self._breakers[key]
+
+    def is_open(self, provider: str, model: str) -> bool:
+        """Check whether calls to a (provider, model) are currently refused"""
+        breaker = self._breakers.get((provider, model))
+        return breaker is not None and breaker.state == BreakerState.OPEN
+
+    def states(self) -> dict[str, str]:
+        """Current state of every breaker, by "provider/model" """
+        return {breaker.name: breaker.state.value for breaker in self._breakers.values()}
+
+    def stats(self) -> dict:
+        """Get breaker metrics"""
+        return {
+            "failovers": self.failovers,
+            "breakers": {
+                breaker.name: {
+                    "state": breaker.state.value,
+                    "opened": breaker.opened,
+                    "rejected": breaker.rejected,
+                    "retry_after_s": round(breaker.retry_after_s(), 1),
+                }
+                for breaker in self._breakers.values()
+            },
+        }
+
+
+class FailoverProvider(TranscriptionProvider):
+    """
+    Tries a list of providers in order until one answers.
+
+    A provider whose breaker is open refuses instantly, so the next one is
+    tried without waiting; a provider that fails upstream is followed by the
+    next one too, up to max_attempts calls. If every breaker is open, the
+    ProviderUnavailableError with the shortest wait is raised.
+
+    Errors that another provider would not fix are raised at once: an
+    unsupported model (checked before the first call), our own limiter's
+    ProviderBusyError, and provider rejections of the request itself.
+    """
+
+    def __init__(
+        self,
+        candidates: list[tuple[TranscriptionProvider, Optional[str]]],
+        breakers: CircuitBreakers,
+        max_attempts: int,
+    ):
+        self.candidates = candidates
+        self.breakers = breakers
+        self.max_attempts = max_attempts
+        primary = candidates[0][0]
+        self.name = primary.name
+        self.supported_models = primary.supported_models
+        self.default_model = primary.default_model
+
+    async def transcribe(
+        self,
+        audio_bytes: bytes,
+        audio_format: str,
+        model: Optional[str] = None,
+        language: str = "en",
+        noisy_room: bool = False,
+    ) -> TranscriptionResult:
+        """Transcribe with the first provider that is available and succeeds"""
+        self.candidates[0][0].validate_model(model)
+        attempts = 0
+        unavailable: Optional[ProviderUnavailableError] = None
+        error: Optional[TranscriptionError] = None
+        for index, (provider, candidate_model) in enumerate(self.candidates):
+            if attempts >= self.max_attempts:
+                break
+            try:
+                result = await provider.transcribe(
+                    audio_bytes=audio_bytes,
+                    audio_format=audio_format,
+                    model=model if index == 0 else candidate_model,
+                    language=language,
+                    noisy_room=noisy_room,
+                )
+            except ProviderUnavailableError as e:
+                if unavailable is None or e.retry_after_s < unavailable.retry_after_s:
+                    unavailable = e
+                continue
+            except ProviderBusyError:
+                raise
+            except TranscriptionError as e:
+                if is_client_error(e):
+                    raise
+                attempts += 1
+                error = error or e
+                continue
+            if index > 0:
+                self.breakers.failovers += 1
+                logger.info(f"Failed over from {self.name} to {provider.name}")
+            return result
+        if error is None and unavailable is None:
+            # max_attempts < 1: nothing was tried
+            raise ProviderUnavailableError(f"No {self.name} provider attempts allowed", provider=self.name)
+        raise error or unavailable
+
+
+# Singleton instance
+_circuit_breakers: Optional[CircuitBreakers] = None
+
+
+def get_circuit_breakers() -> Optional[CircuitBreakers]:
+    """Get the shared circuit breakers, or None if disabled"""
+    global _circuit_breakers
+    settings = get_settings()
+    if not settings.breaker_enabled:
+        return None
+    if _circuit_breakers is None:
+        _circuit_breakers = CircuitBreakers(
+            window_size=settings.breaker_window_size,
+            min_calls=settings.breaker_min_calls,
+            error_rate=settings.breaker_error_rate,
+            slow_call_ms=settings.breaker_slow_call_ms,
+            slow_rate=settings.breaker_slow_rate,
+            open_seconds=settings.breaker_open_seconds,
+            half_open_max_calls=settings.breaker_half_open_max_calls,
+        )
+        register_metrics("circuit_breakers", _circuit_breakers.stats)
+    return _circuit_breakers
@@ -0,0 +1,133 @@
+"""Concurrent transcription of overlapping audio chunks"""
+import asyncio
+import re
+import time
+from difflib import SequenceMatcher
+from typing import Any, Awaitable, Callable, Optional
+
+from app.core.logging import get_logger
+from app.services.transcription.base import TranscriptionProvider, TranscriptionResult
+
+
+logger = get_logger(__name__)
+
+# Words at each side of a seam compared when looking for repeated text
+OVERLAP_WINDOW_WORDS = 12
+
+# Shortest run of matching words treated as text repeated by the overlap
+MIN_OVERLAP_WORDS = 2
+
+# Words a repeated run may sit away from the seam (misheard edge words)
+EDGE_SLACK_WORDS = 2
+
+_NON_WORD = re.compile(r"[^\w']+")
+
+
+def _normalize(word: str) -> str:
+    return _NON_WORD.sub("", word.lower())
+
+
+def stitch_transcripts(texts: list[str]) -> str:
+    """
+    Join transcripts of overlapping chunks, dropping the words both sides of
+    each seam heard.
+
+    The longest run of matching words (ignoring case and punctuation) between
+    the end of the text so far and the start of the next chunk is kept once,
+    provided it sits at the seam; the next chunk continues after it.
+    Otherwise the texts are joined as they are.
+    """
+    words: list[str] = []
+    for text in texts:
+        next_words = text.split()
+        if not next_words:
+            continue
+        tail = words[-OVERLAP_WINDOW_WORDS:]
+        head = next_words[:OVERLAP_WINDOW_WORDS]
+        match = SequenceMatcher(
+            None,
+            [_normalize(w) for w in tail],
+            [_normalize(w) for w in head],
+            autojunk=False,
+        ).find_longest_match(0, len(tail), 0, len(head))
+        at_seam = (
+            match.a + match.size >= len(tail) - EDGE_SLACK_WORDS
+            and match.b <= EDGE_SLACK_WORDS
+        )
+        if match.size >= MIN_OVERLAP_WORDS and at_seam:
+            keep = len(words) - len(tail) + match.a + match.size
+            words = words[:keep] + next_words[match.b + match.size:]
+        else:
+            words.extend(next_words)
+    return " ".join(words)
+
+
+def _joined(values: list[str]) -> str:
+    """Distinct values in order of first appearance, joined with '+'"""
+    return "+".join(dict.fromkeys(values))
+
+
+async def _transcribe_chunk(
+    transcriber: TranscriptionProvider,
+    encode: Callable[[Any], Awaitable[bytes]],
+    chunk: Any,
+    **kwargs,
+) -> TranscriptionResult:
+    return await transcriber.transcribe(audio_bytes=await encode(chunk), **kwargs)
+
+
+async def transcribe_chunks(
+    transcriber: TranscriptionProvider,
+    chunks: list[Any],
+    encode: Callable[[Any], Awaitable[bytes]],
+    audio_format: str,
+    model: Optional[str] = None,
+    language: str = "en",
+    noisy_room: bool = False,
+) -> TranscriptionResult:
+    """
+    Transcribe chunks concurrently and stitch the texts in order.
+
+    Each chunk is encoded with encode() by its own task, so encoding and
+    transcription of different chunks overlap, and every call goes through
+    the provider's own concurrency limiter. If any chunk fails, the others
+    are cancelled and its error is raised.
+
+    With failover or hedging, chunks may be served by different backends;
+    the result then names all of them, e.g. provider "gemini+openai", so
+    the usage row is not attributed to the first chunk's backend alone.
+    """
+    start_time = time.time()
+    try:
+        async with asyncio.TaskGroup() as group:
+            tasks = [
+                group.create_task(_transcribe_chunk(
+                    transcriber,
+                    encode,
+                    chunk,
+                    audio_format=audio_format,
+                    model=model,
+                    language=language,
+                    noisy_room=noisy_room,
+                ))
+                for chunk in chunks
+            ]
+    except ExceptionGroup as e:
+        raise e.exceptions[0]
+
+    results = [task.result() for task in tasks]
+    latency_ms = int((time.time() - start_time) * 1000)
+    logger.info(
+        f"Chunked transcription completed",
+        extra={
+            "provider": transcriber.name,
+            "duration_ms": latency_ms,
+            "chunks": len(chunks),
+        }
+    )
+    return TranscriptionResult(
+        text=stitch_transcripts([r.text for r in results]),
+        latency_ms=latency_ms,
+        provider=_joined([r.provider for r in results]),
+        model=_joined([r.model for r in results]),
+    )
@@ -3,12 +3,15 @@ import time
 from functools import lru_cache
 from typing import Optional
 
+import httpx
 from google import genai
 from google.genai import types
 
 from app.core.config import get_settings
+from app.core.http import GEMINI, get_http_clients
 from app.core.logging import get_logger
 from app.services.transcription.base import (
+    ProviderBusyError,
     TranscriptionError,
     TranscriptionProvider,
     TranscriptionResult,
@@ -31,11 +34,18 @@ MIME_TYPE_MAP = {
 }
 
 
-@lru_cache
 def get_genai_client() -> genai.Client:
-    """Get cached Gemini client"""
+    """Get Gemini client backed by the app's shared Gemini HTTP pool"""
+    return _build_genai_client(get_http_clients().get(GEMINI))
+
+
+@lru_cache(maxsize=1)
+def _build_genai_client(http_client: httpx.AsyncClient) -> genai.Client:
     settings = get_settings()
-    return genai.Client(api_key=settings.gemini_api_key)
+    return genai.Client(
+        api_key=settings.gemini_api_key,
+        http_options=types.HttpOptions(httpx_async_client=http_client),
+    )
 
 
 def get_transcription_prompt(noisy_room: bool = False) -> str:
@@ -111,15 +121,17 @@ class GeminiTranscriptionProvider(TranscriptionProvider):
             
             prompt = get_transcription_prompt(noisy_room)
             
-            # Generate transcription using new SDK
-            response = client.models.generate_content(
-                model=model_name,
-                contents=[prompt, audio_part],
-                config=types.GenerateContentConfig(
-                    temperature=0.0,  # Deterministic for transcription
-                    max_output_tokens=8192,
-                ),
-            )
+            # Generate transcription via the SDK's async client so the
+            # provider call does not block the event loop
+            async with self.limiter:
+                response = await client.aio.models.generate_content(
+                    model=model_name,
+                    contents=[prompt, audio_part],
+                    config=types.GenerateContentConfig(
+                        temperature=0.0,  # Deterministic for transcription
+                        max_output_tokens=8192,
+                    ),
+                )
             
             latency_ms = int((time.time() - start_time) * 1000)
             
@@ -147,6 +159,9 @@ class GeminiTranscriptionProvider(TranscriptionProvider):
                 model=model_name,
             )
             
+        except ProviderBusyError:
+            raise
+            
         except Exception as e:
             latency_ms = int((time.time() - start_time) * 1000)
             logger.error(
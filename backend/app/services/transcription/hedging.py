@@ -0,0 +1,231 @@
+"""Hedged provider requests to cut tail latency"""
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Optional
+
+from app.core.config import get_settings
+from app.core.logging import get_logger
+from app.core.metrics import register_metrics
+from app.services.transcription.base import (
+    TranscriptionError,
+    TranscriptionProvider,
+    TranscriptionResult,
+)
+from app.services.transcription.breaker import get_circuit_breakers
+from app.services.transcription.routing import MeteredProvider, get_adaptive_router
+
+
+logger = get_logger(__name__)
+
+
+class LatencyWindow:
+    """Most recent call latencies of one (provider, model)"""
+
+    def __init__(self, size: int):
+        self._samples: deque[float] = deque(maxlen=size)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def add(self, latency_ms: float) -> None:
+        self._samples.append(latency_ms)
+
+    def percentile(self, p: float) -> float:
+        """Nearest-rank percentile of the window (0 when empty)"""
+        if not self._samples:
+            return 0.0
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, max(0, math.ceil(p / 100 * len(ordered)) - 1))]
+
+
+class HedgingPolicy:
+    """
+    Decides when and where to send a hedge request, and counts outcomes.
+
+    The hedge delay for a (provider, model) is the configured percentile of
+    its recent latencies, floored at min_delay_ms; until min_samples calls
+    have been seen, initial_delay_ms is used. A p95 delay hedges roughly 5%
+    of calls.
+    """
+
+    def __init__(
+        self,
+        secondary_provider: str,
+        secondary_model: Optional[str],
+        percentile: float,
+        min_delay_ms: int,
+        initial_delay_ms: int,
+        window_size: int,
+        min_samples: int,
+    ):
+        self.secondary_provider = secondary_provider
+        self.secondary_model = secondary_model
+        self.percentile = percentile
+        self.min_delay_ms = min_delay_ms
+        self.initial_delay_ms = initial_delay_ms
+        self.window_size = window_size
+        self.min_samples = min_samples
+        self._windows: dict[tuple[str, str], LatencyWindow] = {}
+        self.calls = 0
+        self.hedged = 0
+        self.primary_wins = 0
+        self.secondary_wins = 0
+        self.both_failed = 0
+
+    def record(self, provider: str, model: str, latency_ms: float) -> None:
+        """Record a successful or cancelled call's latency"""
+        key = (provider, model)
+        if key not in self._windows:
+            self._windows[key] = LatencyWindow(self.window_size)
+        self._windows[key].add(latency_ms)
+
+    def delay_ms(self, provider: str, model: str) -> float:
+        """How long to wait for provider/model before hedging"""
+        window = self._windows.get((provider, model))
+        if window is None or len(window) < self.min_samples:
+            return self.initial_delay_ms
+        return max(self.min_delay_ms, window.percentile(self.percentile))
+
+    def wrap(self, provider: TranscriptionProvider) -> TranscriptionProvider:
+        """Hedge calls to provider, unless the secondary is not registered"""
+        from app.services.transcription.registry import ProviderRegistry
+
+        name = self.secondary_provider or provider.name
+        try:
+            secondary = ProviderRegistry.get(name)
+        except TranscriptionError:
+            return provider
+        return HedgedProvider(
+            provider,
+            MeteredProvider(secondary, get_adaptive_router(), breakers=get_circuit_breakers()),
+            self.secondary_model,
+            self,
+        )
+
+    def stats(self) -> dict:
+        """Get hedging metrics"""
+        return {
+            "calls": self.calls,
+            "hedged": self.hedged,
+            "hedge_rate": round(self.hedged / self.calls, 4) if self.calls else 0.0,
+            "primary_wins": self.primary_wins,
+            "secondary_wins": self.secondary_wins,
+            "secondary_win_rate": round(self.secondary_wins / self.hedged, 4) if self.hedged else 0.0,
+            "both_failed": self.both_failed,
+            "delay_ms": {
+                f"{provider}/{model}": round(self.delay_ms(provider, model))
+                for provider, model in self._windows
+            },
+        }
+
+
+class HedgedProvider(TranscriptionProvider):
+    """
+    Calls the primary provider and, if it has not answered within the
+    policy's delay, the secondary too. The first success wins and the other
+    call is cancelled; if both fail, the primary's error is raised.
+    """
+
+    def __init__(
+        self,
+        primary: TranscriptionProvider,
+        secondary: TranscriptionProvider,
+        secondary_model: Optional[str],
+        policy: HedgingPolicy,
+    ):
+        self.primary = primary
+        self.secondary = secondary
+        self.secondary_model = secondary_model
+        self.policy = policy
+        self.name = primary.name
+        self.supported_models = primary.supported_models
+        self.default_model = primary.default_model
+
+    async def _timed(
+        self,
+        provider: TranscriptionProvider,
+        model: str,
+        **kwargs,
+    ) -> TranscriptionResult:
+        start = time.monotonic()
+        try:
+            result = await provider.transcribe(model=model, **kwargs)
+        except asyncio.CancelledError:
+            # A lower bound, but leaving out slow losers would skew the delay low
+            self.policy.record(provider.name, model, (time.monotonic() - start) * 1000)
+            raise
+        self.policy.record(provider.name, model, (time.monotonic() - start) * 1000)
+        return result
+
+    async def transcribe(
+        self,
+        audio_bytes: bytes,
+        audio_format: str,
+        model: Optional[str] = None,
+        language: str = "en",
+        noisy_room: bool = False,
+    ) -> TranscriptionResult:
+        """Transcribe with a hedge request after the policy's delay"""
+        primary_model = self.primary.validate_model(model)
+        secondary_model = self.secondary.validate_model(self.secondary_model)
+        kwargs = {
+            "audio_bytes": audio_bytes,
+            "audio_format": audio_format,
+            "language": language,
+            "noisy_room": noisy_room,
+        }
+        self.policy.calls += 1
+
+        primary = asyncio.create_task(self._timed(self.primary, primary_model, **kwargs))
+        tasks = [primary]
+        try:
+            delay_s = self.policy.delay_ms(self.primary.name, primary_model) / 1000
+            done, _ = await asyncio.wait(tasks, timeout=delay_s)
+            if done:
+                return primary.result()
+
+            self.policy.hedged += 1
+            tasks.append(asyncio.create_task(self._timed(self.secondary, secondary_model, **kwargs)))
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is primary:
+                            self.policy.primary_wins += 1
+                        else:
+                            self.policy.secondary_wins += 1
+                        return task.result()
+
+            self.policy.both_failed += 1
+            return primary.result()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+# Singleton instance
+_hedging_policy: Optional[HedgingPolicy] = None
+
+
+def get_hedging_policy() -> Optional[HedgingPolicy]:
+    """Get the shared hedging policy, or None if hedging is disabled"""
+    global _hedging_policy
+    settings = get_settings()
+    if not settings.hedging_enabled:
+        return None
+    if _hedging_policy is None:
+        _hedging_policy = HedgingPolicy(
+            secondary_provider=settings.hedge_secondary_provider,
+            secondary_model=settings.hedge_secondary_model or None,
+            percentile=settings.hedge_percentile,
+            min_delay_ms=settings.hedge_min_delay_ms,
+            initial_delay_ms=settings.hedge_initial_delay_ms,
+            window_size=settings.hedge_window_size,
+            min_samples=settings.hedge_min_samples,
+        )
+        register_metrics("provider_hedging", _hedging_policy.stats)
+    return _hedging_policy
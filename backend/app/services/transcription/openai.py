@@ -1,13 +1,17 @@
 """OpenAI transcription provider"""
 import io
 import time
+from functools import lru_cache
 from typing import Optional
 
-from openai import OpenAI
+import httpx
+from openai import AsyncOpenAI
 
 from app.core.config import get_settings
+from app.core.http import OPENAI, get_http_clients
 from app.core.logging import get_logger
 from app.services.transcription.base import (
+    ProviderBusyError,
     TranscriptionError,
     TranscriptionProvider,
     TranscriptionResult,
@@ -31,6 +35,22 @@ OPENAI_FORMAT_MAP = {
 }
 
 
+def get_openai_client() -> AsyncOpenAI:
+    """
+    Get the async OpenAI client.
+    
+    Backed by the app's shared OpenAI HTTP pool so keep-alive connections
+    (and their TLS sessions) are reused across transcriptions.
+    """
+    return _build_openai_client(get_http_clients().get(OPENAI))
+
+
+@lru_cache(maxsize=1)
+def _build_openai_client(http_client: httpx.AsyncClient) -> AsyncOpenAI:
+    settings = get_settings()
+    return AsyncOpenAI(api_key=settings.openai_api_key, http_client=http_client)
+
+
 class OpenAITranscriptionProvider(TranscriptionProvider):
     """Transcription provider using OpenAI's speech-to-text API"""
     
@@ -43,16 +63,10 @@ class OpenAITranscriptionProvider(TranscriptionProvider):
     ]
     default_model = "gpt-4o-mini-transcribe"
     
-    def __init__(self):
-        self._client: Optional[OpenAI] = None
-    
     @property
-    def client(self) -> OpenAI:
-        """Get or create the OpenAI client"""
-        if self._client is None:
-            settings = get_settings()
-            self._client = OpenAI(api_key=settings.openai_api_key)
-        return self._client
+    def client(self) -> AsyncOpenAI:
+        """Get the shared async OpenAI client"""
+        return get_openai_client()
     
     async def transcribe(
         self,
@@ -98,13 +112,14 @@ class OpenAITranscriptionProvider(TranscriptionProvider):
                 )
             
             # Call OpenAI transcription API
-            response = self.client.audio.transcriptions.create(
-                model=model_name,
-                file=audio_file,
-                language=language if language != "en" else None,  # None for auto-detect or English
-                response_format="text",
-                prompt=prompt,
-            )
+            async with self.limiter:
+                response = await self.client.audio.transcriptions.create(
+                    model=model_name,
+                    file=audio_file,
+                    language=language if language != "en" else None,  # None for auto-detect or English
+                    response_format="text",
+                    prompt=prompt,
+                )
             
             latency_ms = int((time.time() - start_time) * 1000)
             
@@ -129,6 +144,9 @@ class OpenAITranscriptionProvider(TranscriptionProvider):
                 model=model_name,
             )
             
+        except ProviderBusyError:
+            raise
+            
         except Exception as e:
             latency_ms = int((time.time() - start_time) * 1000)
             logger.error(
@@ -8,6 +8,9 @@ from app.services.transcription.base import (
     TranscriptionError,
     TranscriptionProvider,
 )
+from app.services.transcription.breaker import FailoverProvider, get_circuit_breakers
+from app.services.transcription.hedging import get_hedging_policy
+from app.services.transcription.routing import MeteredProvider, get_adaptive_router
 
 
 logger = get_logger(__name__)
@@ -62,6 +65,78 @@ class ProviderRegistry:
         cls._ensure_initialized()
         return list(cls._providers.keys())
     
+    @classmethod
+    def routing_candidates(cls, model: Optional[str] = None) -> list[tuple[str, str]]:
+        """
+        Get the (provider, model) backends a request may be routed to.
+        
+        Args:
+            model: Model the request asked for; only providers supporting
+                it are candidates
+        """
+        cls._ensure_initialized()
+        if model is not None:
+            return [
+                (name, model)
+                for name, provider in cls._providers.items()
+                if model in provider.supported_models
+            ]
+        configured = get_settings().routing_backends_list or [
+            (name, provider.default_model) for name, provider in cls._providers.items()
+        ]
+        return [
+            (name, backend_model)
+            for name, backend_model in configured
+            if name in cls._providers and backend_model in cls._providers[name].supported_models
+        ]
+    
+    @classmethod
+    def get_routed(cls, model: Optional[str] = None) -> TranscriptionProvider:
+        """
+        Get the backend adaptive routing picks for a request without a provider.
+        
+        Backends whose circuit breaker is open are skipped while any other
+        is routable. Falls back to the default provider when no backend is
+        routable.
+        """
+        router = get_adaptive_router()
+        breakers = get_circuit_breakers()
+        candidates = cls.routing_candidates(model)
+        if breakers is not None:
+            candidates = [
+                candidate for candidate in candidates if not breakers.is_open(*candidate)
+            ] or candidates
+        if not candidates:
+            return MeteredProvider(cls.get_default(), router, breakers=breakers)
+        name, routed_model = router.choose(candidates)
+        return MeteredProvider(cls.get(name), router, routed_model, breakers=breakers)
+    
+    @classmethod
+    def with_failover(cls, primary: MeteredProvider) -> TranscriptionProvider:
+        """
+        Wrap a backend so that failed or refused calls move on to the other
+        registered providers (each with its default model).
+        
+        Returns the backend unchanged when breakers are disabled or no other
+        provider is registered.
+        """
+        breakers = get_circuit_breakers()
+        if breakers is None:
+            return primary
+        router = get_adaptive_router()
+        fallbacks = [
+            (MeteredProvider(provider, router, breakers=breakers), provider.default_model)
+            for name, provider in cls._providers.items()
+            if name != primary.name
+        ]
+        if not fallbacks:
+            return primary
+        return FailoverProvider(
+            [(primary, None)] + fallbacks,
+            breakers,
+            get_settings().breaker_failover_attempts,
+        )
+    
     @classmethod
     def get_provider_info(cls) -> dict[str, dict]:
         """Get info about all registered providers"""
@@ -106,19 +181,33 @@ class ProviderRegistry:
         cls._initialized = False
 
 
-def get_provider(name: Optional[str] = None) -> TranscriptionProvider:
+def get_provider(name: Optional[str] = None, model: Optional[str] = None) -> TranscriptionProvider:
     """
     Get a transcription provider.
     
     Args:
-        name: Provider name, or None for default
+        name: Provider name, or None for default (or, in adaptive routing
+            mode, the backend the router picks)
+        model: Model the request asked for, if any
     
     Returns:
-        The transcription provider instance
+        The transcription provider instance, recording call statistics for
+        routing, guarded by circuit breakers with failover to the other
+        providers (for a named provider only if breaker_failover_pinned),
+        and wrapped in the hedging policy when hedging is enabled
     """
-    if name is None:
-        return ProviderRegistry.get_default()
-    return ProviderRegistry.get(name)
+    settings = get_settings()
+    breakers = get_circuit_breakers()
+    if name is not None:
+        provider = MeteredProvider(ProviderRegistry.get(name), get_adaptive_router(), breakers=breakers)
+    elif settings.routing_mode == "adaptive":
+        provider = ProviderRegistry.get_routed(model)
+    else:
+        provider = MeteredProvider(ProviderRegistry.get_default(), get_adaptive_router(), breakers=breakers)
+    if name is None or settings.breaker_failover_pinned:
+        provider = ProviderRegistry.with_failover(provider)
+    policy = get_hedging_policy()
+    return policy.wrap(provider) if policy is not None else provider
 
 
 def get_provider_registry() -> type[ProviderRegistry]:
@@ -0,0 +1,284 @@
+"""Latency-aware routing across (provider, model) backends"""
+import asyncio
+import math
+import random
+import time
+from typing import Optional
+
+from app.core.config import get_settings
+from app.services.transcription.breaker import CircuitBreaker, CircuitBreakers
+from app.services.transcription.base import (
+    ProviderBusyError,
+    ProviderUnavailableError,
+    TranscriptionError,
+    TranscriptionProvider,
+    TranscriptionResult,
+    is_client_error,
+)
+
+
+# A backend's error rate halves every ERROR_HALF_LIFE_S without calls, so a
+# backend that stopped getting traffic for being unhealthy is retried later
+ERROR_HALF_LIFE_S = 30.0
+
+# Traffic share falls off as (fastest / latency) ** WEIGHT_EXPONENT, so a
+# backend 10% slower than the fastest gets ~47% of its weight, 2x slower ~0.4%
+WEIGHT_EXPONENT = 8
+
+
+def _round_ms(value: Optional[float]) -> Optional[int]:
+    return round(value) if value is not None else None
+
+
+class BackendStats:
+    """
+    Rolling latency and error statistics of one (provider, model).
+
+    Latency and error rate are EWMAs; the error rate also decays with time
+    since the last call. Percentiles come from a reservoir sample whose
+    seen-count is capped at twice its size, so every new sample replaces an
+    old one with probability >= 1/2 and the reservoir tracks recent traffic
+    rather than all of history.
+    """
+
+    def __init__(self, alpha: float, reservoir_size: int, rng: random.Random):
+        self.alpha = alpha
+        self.reservoir_size = reservoir_size
+        self._rng = rng
+        self._reservoir: list[float] = []
+        self._seen = 0
+        self.calls = 0
+        self.errors = 0
+        self.ewma_latency_ms: Optional[float] = None
+        self._error_rate = 0.0
+        self._error_rate_at = 0.0
+
+    @property
+    def error_rate(self) -> float:
+        """EWMA error rate, decayed by the time since the last call"""
+        quiet_s = time.monotonic() - self._error_rate_at
+        return self._error_rate * 0.5 ** (quiet_s / ERROR_HALF_LIFE_S)
+
+    def record(self, latency_ms: float, ok: bool) -> None:
+        """Record the outcome of one call"""
+        self.calls += 1
+        error_rate = self.error_rate
+        self._error_rate = error_rate + self.alpha * ((0.0 if ok else 1.0) - error_rate)
+        self._error_rate_at = time.monotonic()
+        if not ok:
+            self.errors += 1
+            return
+
+        if self.ewma_latency_ms is None:
+            self.ewma_latency_ms = latency_ms
+        else:
+            self.ewma_latency_ms += self.alpha * (latency_ms - self.ewma_latency_ms)
+
+        self._seen = min(self._seen + 1, 2 * self.reservoir_size)
+        if len(self._reservoir) < self.reservoir_size:
+            self._reservoir.append(latency_ms)
+        else:
+            slot = self._rng.randrange(self._seen)
+            if slot < self.reservoir_size:
+                self._reservoir[slot] = latency_ms
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Nearest-rank latency percentile, or None before any success"""
+        if not self._reservoir:
+            return None
+        ordered = sorted(self._reservoir)
+        return ordered[min(len(ordered) - 1, max(0, math.ceil(p / 100 * len(ordered)) - 1))]
+
+
+class AdaptiveRouter:
+    """
+    Keeps BackendStats for every (provider, model) called and, in adaptive
+    mode, picks the backend for requests that did not name a provider.
+
+    A backend is healthy while its error rate is below max_error_rate.
+    Healthy backends with fewer than min_samples calls are tried first;
+    otherwise traffic is split by latency weight, with exploration_rate of
+    requests sent to a uniformly random healthy backend so the others'
+    statistics stay current.
+    """
+
+    def __init__(
+        self,
+        alpha: float,
+        reservoir_size: int,
+        exploration_rate: float,
+        max_error_rate: float,
+        min_samples: int,
+        seed: Optional[int] = None,
+    ):
+        self.alpha = alpha
+        self.reservoir_size = reservoir_size
+        self.exploration_rate = exploration_rate
+        self.max_error_rate = max_error_rate
+        self.min_samples = min_samples
+        self._rng = random.Random(seed)
+        self._stats: dict[tuple[str, str], BackendStats] = {}
+        self.routed = 0
+        self.explored = 0
+
+    def stats_for(self, provider: str, model: str) -> BackendStats:
+        """Get (creating if needed) the stats of a backend"""
+        key = (provider, model)
+        if key not in self._stats:
+            self._stats[key] = BackendStats(self.alpha, self.reservoir_size, self._rng)
+        return self._stats[key]
+
+    def record(self, provider: str, model: str, latency_ms: float, ok: bool) -> None:
+        """Record the outcome of a call"""
+        self.stats_for(provider, model).record(latency_ms, ok)
+
+    def is_healthy(self, provider: str, model: str) -> bool:
+        return self.stats_for(provider, model).error_rate < self.max_error_rate
+
+    def weights(self, candidates: list[tuple[str, str]]) -> dict[tuple[str, str], float]:
+        """Traffic share of each candidate, excluding exploration"""
+        healthy = [b for b in candidates if self.is_healthy(*b)]
+        if not healthy:
+            # Everything is failing: send traffic where it fails least
+            best = min(candidates, key=lambda b: self.stats_for(*b).error_rate)
+            return {b: float(b == best) for b in candidates}
+
+        warming = [b for b in healthy if self.stats_for(*b).calls < self.min_samples]
+        if warming:
+            return {b: (1.0 / len(warming) if b in warming else 0.0) for b in candidates}
+
+        latencies = {b: self.stats_for(*b).ewma_latency_ms or math.inf for b in healthy}
+        fastest = min(latencies.values())
+        raw = {b: (fastest / latencies[b]) ** WEIGHT_EXPONENT if b in latencies else 0.0 for b in candidates}
+        total = sum(raw.values())
+        return {b: w / total for b, w in raw.items()}
+
+    def choose(self, candidates: list[tuple[str, str]]) -> tuple[str, str]:
+        """Pick a backend for one request"""
+        self.routed += 1
+        healthy = [b for b in candidates if self.is_healthy(*b)]
+        if len(healthy) > 1 and self._rng.random() < self.exploration_rate:
+            self.explored += 1
+            return self._rng.choice(healthy)
+        weights = self.weights(candidates)
+        return self._rng.choices(list(weights), weights=list(weights.values()))[0]
+
+    def routing_table(self, candidates: list[tuple[str, str]]) -> dict:
+        """Snapshot of backend statistics and current traffic weights"""
+        weights = self.weights(candidates) if candidates else {}
+        backends = []
+        for key in sorted(set(candidates) | set(self._stats)):
+            stats = self.stats_for(*key)
+            backends.append({
+                "provider": key[0],
+                "model": key[1],
+                "routable": key in weights,
+                "healthy": self.is_healthy(*key),
+                "weight": round(weights.get(key, 0.0), 4),
+                "calls": stats.calls,
+                "errors": stats.errors,
+                "ewma_latency_ms": _round_ms(stats.ewma_latency_ms),
+                "error_rate": round(stats.error_rate, 4),
+                "p50_ms": _round_ms(stats.percentile(50)),
+                "p95_ms": _round_ms(stats.percentile(95)),
+                "p99_ms": _round_ms(stats.percentile(99)),
+            })
+        return {
+            "mode": get_settings().routing_mode,
+            "exploration_rate": self.exploration_rate,
+            "routed": self.routed,
+            "explored": self.explored,
+            "backends": backends,
+        }
+
+
+class MeteredProvider(TranscriptionProvider):
+    """
+    Records every call's latency and outcome with the router and, when
+    breakers are given, refuses calls while the backend's breaker is open.
+
+    `model` pins the model used when the caller does not pass one (the
+    router's choice for requests without a provider).
+    """
+
+    def __init__(
+        self,
+        provider: TranscriptionProvider,
+        router: AdaptiveRouter,
+        model: Optional[str] = None,
+        breakers: Optional[CircuitBreakers] = None,
+    ):
+        self.provider = provider
+        self.router = router
+        self.breakers = breakers
+        self.name = provider.name
+        self.supported_models = provider.supported_models
+        self.default_model = model or provider.default_model
+
+    async def transcribe(
+        self,
+        audio_bytes: bytes,
+        audio_format: str,
+        model: Optional[str] = None,
+        language: str = "en",
+        noisy_room: bool = False,
+    ) -> TranscriptionResult:
+        """Transcribe with the wrapped provider, recording the outcome"""
+        model_name = self.validate_model(model)
+        breaker = self.breakers.get(self.name, model_name) if self.breakers is not None else None
+        if breaker is not None and not breaker.allow():
+            raise ProviderUnavailableError(
+                f"Circuit breaker open for {breaker.name}",
+                provider=self.name,
+                model=model_name,
+                retry_after_s=breaker.retry_after_s(),
+            )
+
+        start = time.monotonic()
+        try:
+            result = await self.provider.transcribe(
+                audio_bytes=audio_bytes,
+                audio_format=audio_format,
+                model=model_name,
+                language=language,
+                noisy_room=noisy_room,
+            )
+        except (ProviderBusyError, asyncio.CancelledError):
+            # Our own limiter said no, or the caller gave up; not a verdict on the backend
+            if breaker is not None:
+                breaker.release()
+            raise
+        except TranscriptionError as e:
+            if is_client_error(e):
+                # The backend rejected this request's input, it did not fail
+                if breaker is not None:
+                    breaker.release()
+                raise
+            self._record(breaker, model_name, (time.monotonic() - start) * 1000, ok=False)
+            raise
+        self._record(breaker, model_name, (time.monotonic() - start) * 1000, ok=True)
+        return result
+
+    def _record(self, breaker: Optional[CircuitBreaker], model_name: str, latency_ms: float, ok: bool) -> None:
+        self.router.record(self.name, model_name, latency_ms, ok=ok)
+        if breaker is not None:
+            breaker.record(latency_ms, ok=ok)
+
+
+# Singleton instance
+_adaptive_router: Optional[AdaptiveRouter] = None
+
+
+def get_adaptive_router() -> AdaptiveRouter:
+    """Get the shared router (statistics are kept in every routing mode)"""
+    global _adaptive_router
+    if _adaptive_router is None:
+        settings = get_settings()
+        _adaptive_router = AdaptiveRouter(
+            alpha=settings.routing_ewma_alpha,
+            reservoir_size=settings.routing_reservoir_size,
+            exploration_rate=settings.routing_exploration_rate,
+            max_error_rate=settings.routing_max_error_rate,
+            min_samples=settings.routing_min_samples,
+        )
+    return _adaptive_router
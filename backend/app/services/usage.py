@@ -1,21 +1,71 @@
 """Usage tracking and stats service"""
-from datetime import datetime, timedelta, timezone
+from datetime import date, datetime, timedelta, timezone
 from typing import Optional
 
-from supabase import Client
+from postgrest.exceptions import APIError
+from supabase import AsyncClient
 
 from app.core.logging import get_logger
 from app.db.models import TranscriptionRequestCreate
 from app.db.supabase import get_supabase
+from app.services.idempotency import IdempotencyFilter, get_idempotency_filter
+from app.services.stats_cache import StatsCache, get_stats_cache
 
 logger = get_logger(__name__)
 
+# Postgres unique_violation (hit by unique_user_idempotency)
+UNIQUE_VIOLATION = "23505"
+
+# Days of history per stats range (0 = since midnight UTC, None = all time)
+RANGE_DAYS: dict[str, Optional[int]] = {
+    "today": 0,
+    "7d": 7,
+    "30d": 30,
+}
+
+
+def range_start(range_type: str) -> Optional[datetime]:
+    """
+    Get the start of a stats range.
+    
+    'today' starts at midnight UTC; the others are rolling windows ending
+    now. Unknown ranges fall back to today. Returns None for all-time ranges.
+    """
+    days = RANGE_DAYS.get(range_type, 0)
+    if days is None:
+        return None
+    now = datetime.now(timezone.utc)
+    if days == 0:
+        return now.replace(hour=0, minute=0, second=0, microsecond=0)
+    return now - timedelta(days=days)
+
+
+def _first_whole_day(start: datetime) -> date:
+    """First UTC day lying entirely inside a range starting at start"""
+    if start.time() == datetime.min.time():
+        return start.date()
+    return start.date() + timedelta(days=1)
+
+
+class DuplicateTranscriptionError(Exception):
+    """Raised when a transcription with the same idempotency key already exists"""
+    def __init__(self, existing: dict):
+        self.existing = existing
+        super().__init__("Transcription with this idempotency key already exists")
+
 
 class UsageService:
     """Service for tracking transcription usage and retrieving stats"""
     
-    def __init__(self, supabase: Client):
+    def __init__(
+        self,
+        supabase: AsyncClient,
+        stats_cache: StatsCache,
+        idempotency_filter: Optional[IdempotencyFilter] = None,
+    ):
         self.supabase = supabase
+        self.stats_cache = stats_cache
+        self.idempotency_filter = idempotency_filter
     
     async def check_idempotency(
         self,
@@ -25,10 +75,21 @@ class UsageService:
         """
         Check if a transcription with this idempotency key already exists.
         
-        Returns the existing record if found, None otherwise.
+        Returns the existing record if found, None otherwise. Keys the
+        idempotency filter has definitely never seen skip the DB lookup.
         """
+        if self.idempotency_filter and not self.idempotency_filter.might_contain(user_id, idempotency_key):
+            return None
+        
+        return await self._fetch_by_idempotency_key(user_id, idempotency_key)
+    
+    async def _fetch_by_idempotency_key(
+        self,
+        user_id: str,
+        idempotency_key: str,
+    ) -> Optional[dict]:
         try:
-            response = (
+            response = await (
                 self.supabase.table("transcription_requests")
                 .select("*")
                 .eq("user_id", user_id)
@@ -37,6 +98,8 @@ class UsageService:
             )
             
             if response.data and len(response.data) > 0:
+                if self.idempotency_filter:
+                    self.idempotency_filter.add(user_id, idempotency_key)
                 return response.data[0]
             return None
             
@@ -52,29 +115,74 @@ class UsageService:
         Record a successful transcription in the database.
         
         Returns the created record.
+        
+        Raises:
+            DuplicateTranscriptionError: If the idempotency key was already
+                recorded (e.g. by another worker)
         """
         try:
-            response = (
+            response = await (
                 self.supabase.table("transcription_requests")
                 .insert(data.model_dump())
                 .execute()
             )
-            
-            if response.data and len(response.data) > 0:
-                logger.info(
-                    f"Recorded transcription",
-                    extra={
-                        "user_id": data.user_id,
-                        "duration_ms": data.duration_ms,
-                    }
-                )
-                return response.data[0]
-            
-            raise Exception("No data returned from insert")
-            
+        except APIError as e:
+            if e.code == UNIQUE_VIOLATION:
+                existing = await self._fetch_by_idempotency_key(data.user_id, data.idempotency_key)
+                if existing is not None:
+                    raise DuplicateTranscriptionError(existing) from e
+            logger.error(f"Failed to record transcription: {e}")
+            raise
         except Exception as e:
             logger.error(f"Failed to record transcription: {e}")
             raise
+        
+        if not response.data:
+            logger.error("Failed to record transcription: no data returned from insert")
+            raise Exception("No data returned from insert")
+        
+        if self.idempotency_filter:
+            self.idempotency_filter.add(data.user_id, data.idempotency_key)
+        
+        logger.info(
+            f"Recorded transcription",
+            extra={
+                "user_id": data.user_id,
+                "duration_ms": data.duration_ms,
+            }
+        )
+        record = response.data[0]
+        if data.status == "success":
+            await self._increment_daily_usage(data, record["created_at"])
+            await self.stats_cache.invalidate(data.user_id)
+        return record
+    
+    async def _increment_daily_usage(
+        self,
+        data: TranscriptionRequestCreate,
+        created_at: str,
+    ) -> None:
+        """
+        Add a recorded transcription to the usage_daily rollup.
+        
+        Failures are logged rather than raised: the transcription row is
+        already stored, and scripts/backfill_usage_daily.py can rebuild the
+        rollup from it.
+        """
+        try:
+            await self.supabase.rpc(
+                "increment_usage_daily",
+                {
+                    "p_user_id": data.user_id,
+                    "p_created_at": created_at,
+                    "p_provider": data.provider,
+                    "p_model": data.model,
+                    "p_duration_ms": data.duration_ms,
+                    "p_words": data.word_count,
+                },
+            ).execute()
+        except Exception as e:
+            logger.error(f"Failed to update daily usage rollup: {e}", extra={"user_id": data.user_id})
     
     async def get_stats(
         self,
@@ -84,62 +192,95 @@ class UsageService:
         """
         Get usage statistics for a user.
         
+        Served from the stats cache when possible; record_transcription
+        invalidates the user's entries.
+        
         Args:
             user_id: The user's ID
-            range_type: One of 'today', '7d', or '30d'
+            range_type: A key of RANGE_DAYS ('today', '7d' or '30d')
         
         Returns:
             Dictionary with usage statistics
         """
-        # Calculate date range
-        now = datetime.now(timezone.utc)
+        cached = await self.stats_cache.get(user_id, range_type)
+        if cached is not None:
+            return cached
         
-        if range_type == "today":
-            start_date = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        elif range_type == "7d":
-            start_date = now - timedelta(days=7)
-        elif range_type == "30d":
-            start_date = now - timedelta(days=30)
-        else:
-            start_date = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        start = range_start(range_type)
         
         try:
-            response = (
-                self.supabase.table("transcription_requests")
-                .select("duration_ms, transcript_text, created_at")
+            # At most one row per (day, provider, model) for the whole days
+            query = (
+                self.supabase.table("usage_daily")
+                .select("duration_ms, words, requests, last_activity_at")
                 .eq("user_id", user_id)
-                .eq("status", "success")
-                .gte("created_at", start_date.isoformat())
-                .order("created_at", desc=True)
-                .execute()
             )
+            if start is not None:
+                query = query.gte("day", _first_whole_day(start).isoformat())
+            response = await query.execute()
             
-            data = response.data or []
-            
-            # Calculate aggregates
-            total_duration_ms = sum(r.get("duration_ms", 0) for r in data)
-            total_words = sum(
-                len(r.get("transcript_text", "").split())
-                for r in data
-            )
+            rows = response.data or []
+            if start is not None:
+                rows += await self._partial_day_usage(user_id, start)
+            total_duration_ms = sum(r.get("duration_ms", 0) for r in rows)
             
-            last_activity = None
-            if data:
-                last_activity = data[0].get("created_at")
-            
-            return {
+            stats = {
                 "range": range_type,
                 "minutes_transcribed": round(total_duration_ms / 60000, 2),
-                "words_transcribed_est": total_words,
-                "requests": len(data),
-                "last_activity_at": last_activity,
+                "words_transcribed_est": sum(r.get("words", 0) for r in rows),
+                "requests": sum(r.get("requests", 0) for r in rows),
+                "last_activity_at": max(
+                    (
+                        datetime.fromisoformat(r["last_activity_at"])
+                        for r in rows
+                        if r.get("last_activity_at")
+                    ),
+                    default=None,
+                ),
             }
+            await self.stats_cache.set(user_id, range_type, stats)
+            return stats
             
         except Exception as e:
             logger.error(f"Failed to get stats: {e}")
             raise
+    
+    async def _partial_day_usage(
+        self,
+        user_id: str,
+        start: datetime,
+    ) -> list[dict]:
+        """
+        Get usage between start and the end of its UTC day, shaped like
+        usage_daily rows.
+        
+        Rolling ranges begin partway through a day, which the daily rollup
+        can't split, so that edge is read from transcription_requests.
+        """
+        end = datetime.combine(_first_whole_day(start), datetime.min.time(), tzinfo=timezone.utc)
+        if start >= end:
+            return []
+        
+        response = await (
+            self.supabase.table("transcription_requests")
+            .select("duration_ms, word_count, created_at")
+            .eq("user_id", user_id)
+            .eq("status", "success")
+            .gte("created_at", start.isoformat())
+            .lt("created_at", end.isoformat())
+            .execute()
+        )
+        return [
+            {
+                "duration_ms": r.get("duration_ms", 0),
+                "words": r.get("word_count", 0),
+                "requests": 1,
+                "last_activity_at": r.get("created_at"),
+            }
+            for r in response.data or []
+        ]
 
 
-def get_usage_service() -> UsageService:
+async def get_usage_service() -> UsageService:
     """Get usage service instance"""
-    return UsageService(get_supabase())
+    return UsageService(await get_supabase(), get_stats_cache(), get_idempotency_filter())
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""Backfill the usage_daily rollup from transcription_requests
+
+Usage:
+    python scripts/backfill_usage_daily.py              # all history
+    python scripts/backfill_usage_daily.py 2026-01-01   # from a UTC day onwards
+
+Safe to re-run: rollup rows are rebuilt from the raw rows, not incremented.
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+# Add the parent directory to sys.path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.http import get_http_clients
+from app.db.supabase import get_supabase_client
+
+
+async def main():
+    since = sys.argv[1] if len(sys.argv) > 1 else None
+
+    supabase = await get_supabase_client()
+    try:
+        response = await supabase.rpc("backfill_usage_daily", {"p_since": since}).execute()
+        print(f"Rebuilt {response.data} usage_daily rows" + (f" since {since}" if since else ""))
+    finally:
+        await get_http_clients().aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: per-request cost of local vs remote token verification
+
+Remote verification is measured against a mocked Supabase Auth endpoint with
+a simulated network round-trip, so no Supabase project is needed.
+"""
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import httpx
+from jose import jwt
+
+# Add the parent directory to sys.path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.config import Settings
+from app.deps import auth
+
+
+ITERATIONS = 200
+SIMULATED_RTT_S = 0.03
+JWT_SECRET = "bench-secret"
+USER_ID = "00000000-0000-0000-0000-000000000001"
+
+
+async def fake_supabase_user(request: httpx.Request) -> httpx.Response:
+    """Mocked GET /auth/v1/user with a fixed round-trip delay"""
+    await asyncio.sleep(SIMULATED_RTT_S)
+    return httpx.Response(200, json={"id": USER_ID, "email": "bench@example.com"})
+
+
+async def bench(
+    label: str,
+    settings: Settings,
+    token: str,
+    http_client: httpx.AsyncClient,
+) -> list[float]:
+    """Time verify_supabase_token over ITERATIONS sequential requests"""
+    samples = []
+    for _ in range(ITERATIONS):
+        start = time.perf_counter()
+        user = await auth.verify_supabase_token(f"Bearer {token}", settings, http_client)
+        samples.append((time.perf_counter() - start) * 1000)
+        assert user.id == USER_ID
+
+    p50 = statistics.median(samples)
+    p99 = statistics.quantiles(samples, n=100)[98]
+    print(f"{label:>6}: p50={p50:.3f}ms p99={p99:.3f}ms")
+    return samples
+
+
+async def main():
+    token = jwt.encode(
+        {"sub": USER_ID, "aud": "authenticated", "exp": int(time.time()) + 3600},
+        JWT_SECRET,
+        algorithm="HS256",
+    )
+
+    http_client = httpx.AsyncClient(transport=httpx.MockTransport(fake_supabase_user))
+
+    # Token cache disabled so every remote request pays the round-trip
+    base = dict(
+        supabase_url="https://example.supabase.co",
+        supabase_jwt_secret=JWT_SECRET,
+        auth_cache_ttl_seconds=0,
+    )
+    print(f"{ITERATIONS} requests, simulated Supabase RTT {SIMULATED_RTT_S * 1000:.0f}ms")
+    remote = await bench("remote", Settings(auth_verification_mode="remote", **base), token, http_client)
+    local = await bench("local", Settings(auth_verification_mode="local", **base), token, http_client)
+    print(f"speedup (p50): {statistics.median(remote) / statistics.median(local):.0f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Benchmark: wall-clock latency of long recordings, whole vs chunked
+
+Uses a fake provider whose latency grows with the audio length (a fixed
+overhead plus a per-second cost, roughly what hosted models show), so no
+API keys are needed. Requires PyAV (`pip install -e ".[audio]"`).
+"""
+import asyncio
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+# Add the parent directory to sys.path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.audio import AudioChunker, codec
+from app.services.transcription import TranscriptionProvider, TranscriptionResult, transcribe_chunks
+
+from bench_transcode import encode, synth_speech
+
+
+DURATIONS_S = [120, 300, 600]
+PROVIDER_BASE_S = 0.8
+PROVIDER_PER_AUDIO_S = 0.05
+OPUS_BITRATE = 24000
+
+
+class FakeProvider(TranscriptionProvider):
+    """Provider with latency proportional to the (Opus) audio length"""
+    name = "fake"
+    supported_models = ["fake"]
+    default_model = "fake"
+
+    async def transcribe(
+        self,
+        audio_bytes: bytes,
+        audio_format: str,
+        model: Optional[str] = None,
+        language: str = "en",
+        noisy_room: bool = False,
+    ) -> TranscriptionResult:
+        audio_seconds = len(audio_bytes) * 8 / OPUS_BITRATE
+        async with self.limiter:
+            await asyncio.sleep(PROVIDER_BASE_S + PROVIDER_PER_AUDIO_S * audio_seconds)
+        return TranscriptionResult(text="hello world", latency_ms=0, provider=self.name, model=self.default_model)
+
+
+async def main():
+    if not codec.is_available():
+        print("PyAV is not installed: pip install -e \".[audio]\"")
+        return
+
+    provider = FakeProvider()
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        chunker = AudioChunker(
+            sample_rate=16000,
+            min_duration_ms=60_000,
+            target_ms=30_000,
+            overlap_ms=1000,
+            bitrate=OPUS_BITRATE,
+            pool=pool,
+        )
+        for seconds in DURATIONS_S:
+            audio = codec.transcode_to_opus(encode(synth_speech(seconds), "wav", "pcm_s16le"), 16000, OPUS_BITRATE)
+
+            start = time.perf_counter()
+            await provider.transcribe(audio, "ogg")
+            whole = time.perf_counter() - start
+
+            start = time.perf_counter()
+            chunks = await chunker.split(audio, seconds * 1000)
+            split = time.perf_counter() - start
+            await transcribe_chunks(provider, chunks, chunker.encode, "ogg")
+            chunked = time.perf_counter() - start
+
+            print(
+                f"{seconds:>4}s: whole {whole:.2f}s, chunked {chunked:.2f}s "
+                f"({len(chunks)} chunks, split {split:.2f}s)"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Benchmark: connection reuse of the shared HTTP pool under load
+
+Fires concurrent requests at a local keep-alive HTTP server, once with a new
+httpx client per request (the old auth.py behaviour) and once through the
+app's shared pool, and reports how many TCP connections each approach opened.
+"""
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+# Add the parent directory to sys.path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.http import SUPABASE, get_http_clients
+
+
+REQUESTS = 500
+CONCURRENCY = 20
+RESPONSE = b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nContent-Length: 2\r\n\r\n{}"
+
+
+class CountingServer:
+    """Minimal HTTP/1.1 keep-alive server that counts accepted connections"""
+
+    def __init__(self):
+        self.connections = 0
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        try:
+            while await reader.readuntil(b"\r\n\r\n"):
+                writer.write(RESPONSE)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+async def run(label: str, url: str, server: CountingServer, get_client) -> None:
+    """Send REQUESTS requests with CONCURRENCY workers and report reuse"""
+    server.connections = 0
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def one():
+        async with semaphore:
+            await get_client(url)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[one() for _ in range(REQUESTS)])
+    elapsed = time.perf_counter() - start
+
+    reuse_rate = 1 - server.connections / REQUESTS
+    print(
+        f"{label:>10}: {server.connections:>4} connections for {REQUESTS} requests, "
+        f"reuse rate {reuse_rate:.1%}, {REQUESTS / elapsed:.0f} req/s"
+    )
+
+
+async def per_request_client(url: str) -> None:
+    async with httpx.AsyncClient() as client:
+        (await client.get(url)).raise_for_status()
+
+
+async def shared_client(url: str) -> None:
+    (await get_http_clients().get(SUPABASE).get(url)).raise_for_status()
+
+
+async def main():
+    server = CountingServer()
+    tcp_server = await asyncio.start_server(server.handle, "127.0.0.1", 0)
+    port = tcp_server.sockets[0].getsockname()[1]
+    url = f"http://127.0.0.1:{port}/auth/v1/user"
+
+    async with tcp_server:
+        await run("per-request", url, server, per_request_client)
+        await run("shared", url, server, shared_client)
+        await get_http_clients().aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Benchmark: idempotency check latency with and without the Bloom filter
+
+Fresh keys (the common case) are checked against a mocked Supabase REST
+endpoint with a simulated round-trip, so no Supabase project is needed.
+"""
+import asyncio
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+import httpx
+from supabase import AsyncClientOptions, create_async_client
+
+# Add the parent directory to sys.path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.idempotency import IdempotencyFilter
+from app.services.stats_cache import NullStatsCache
+from app.services.usage import UsageService
+
+
+ITERATIONS = 200
+SIMULATED_RTT_S = 0.02
+USER_ID = "00000000-0000-0000-0000-000000000001"
+
+
+async def fake_postgrest(request: httpx.Request) -> httpx.Response:
+    """Mocked transcription_requests lookup that never finds a row"""
+    await asyncio.sleep(SIMULATED_RTT_S)
+    return httpx.Response(200, json=[])
+
+
+async def bench(label: str, service: UsageService) -> float:
+    """Time check_idempotency for ITERATIONS fresh keys, return p50 ms"""
+    samples = []
+    for _ in range(ITERATIONS):
+        start = time.perf_counter()
+        existing = await service.check_idempotency(USER_ID, str(uuid.uuid4()))
+        samples.append((time.perf_counter() - start) * 1000)
+        assert existing is None
+
+    p50 = statistics.median(samples)
+    p99 = statistics.quantiles(samples, n=100)[98]
+    print(f"{label:>10}: p50={p50:.3f}ms p99={p99:.3f}ms")
+    return p50
+
+
+def measure_false_positive_rate(capacity: int = 100_000, error_rate: float = 0.01) -> None:
+    """Fill a filter to capacity and measure how often fresh keys look seen"""
+    bloom = IdempotencyFilter(capacity, error_rate)
+    for _ in range(capacity):
+        bloom.add(USER_ID, str(uuid.uuid4()))
+
+    probes = 100_000
+    false_positives = sum(bloom.might_contain(USER_ID, str(uuid.uuid4())) for _ in range(probes))
+    print(
+        f"filter at capacity ({capacity:,} keys, {bloom.stats()['memory_bytes'] / 1024:.0f} KiB): "
+        f"false-positive rate {false_positives / probes:.2%} (target {error_rate:.0%})"
+    )
+
+
+async def main():
+    supabase = await create_async_client(
+        "https://example.supabase.co",
+        "service-role-key",
+        options=AsyncClientOptions(
+            httpx_client=httpx.AsyncClient(transport=httpx.MockTransport(fake_postgrest)),
+            auto_refresh_token=False,
+            persist_session=False,
+        ),
+    )
+
+    print(f"{ITERATIONS} fresh keys, simulated Supabase RTT {SIMULATED_RTT_S * 1000:.0f}ms")
+    db_only = await bench("db lookup", UsageService(supabase, NullStatsCache()))
+    filtered = await bench(
+        "filter",
+        UsageService(supabase, NullStatsCache(), IdempotencyFilter(1_000_000, 0.01)),
+    )
+    print(f"p50 saving on the transcription path: {db_only - filtered:.2f}ms per request")
+
+    measure_false_positive_rate()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""Benchmark: realtime proxy CPU per session-minute and time to session_ready
+
+Feeds one minute of 20ms PCM16 chunks through RealtimeTranscriptionSession's
+proxy with in-memory stand-ins for the client and upstream sockets, so no
+OpenAI connection is needed. Only the proxy's own work is measured (parsing,
+re-framing, queueing, send calls), not WebSocket frame decoding, which binary
+frames also make smaller.
+
+Then compares OpenAI server VAD with the local VAD on dictation-like audio
+(speech with pauses): audio sent upstream and proxy CPU.
+
+Finally times session_ready for sessions that connect upstream on demand and for
+sessions taken from the pre-warmed pool, against a local fake Realtime server
+with a simulated connection setup delay.
+"""
+import asyncio
+import base64
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import websockets
+
+# Add the parent directory to sys.path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+os.environ.setdefault("OPENAI_API_KEY", "bench-key")  # Enables the session pool
+
+from app.api.v1.routes.realtime import RealtimeTranscriptionSession
+from app.core.config import get_settings
+from app.services import realtime_pool
+from app.services.realtime_vad import AUDIO, SPEECH_STOPPED, StreamingVAD
+
+
+SAMPLE_RATE = 24000
+CHUNK_MS = 20
+SESSION_SECONDS = 60
+ROUNDS = 20
+SESSIONS = 10
+# Dictation pattern for the VAD comparison: speech, then a pause
+SPEECH_S = 4
+PAUSE_S = 3
+# Stand-in for DNS + TLS + WebSocket handshake and the session.created round-trip
+UPSTREAM_SETUP_S = 0.15
+
+
+class FakeUpstreamSocket:
+    """Upstream socket that counts what would be sent and never answers"""
+
+    def __init__(self, expected: int):
+        self.expected = expected
+        self.sent = 0
+        self.sent_bytes = 0
+        self.done = asyncio.Event()
+
+    async def send(self, message, text=None) -> None:
+        self.sent += 1
+        self.sent_bytes += len(message)
+        if self.sent == self.expected:
+            self.done.set()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        await asyncio.Event().wait()
+
+    async def close(self) -> None:
+        pass
+
+
+class FakeClientSocket:
+    """Client socket replaying pre-built ASGI receive messages"""
+
+    def __init__(self, messages: list[dict], upstream: FakeUpstreamSocket):
+        self._messages = iter(messages)
+        self._upstream = upstream
+
+    async def receive(self) -> dict:
+        await asyncio.sleep(0)  # A real socket yields between frames
+        message = next(self._messages, None)
+        if message is None:
+            # Disconnect once everything has reached the upstream
+            await self._upstream.done.wait()
+            return {"type": "websocket.disconnect", "code": 1000}
+        return message
+
+    async def send_json(self, data: dict) -> None:
+        pass
+
+
+def session_messages(binary: bool) -> list[dict]:
+    """One session-minute of client audio messages"""
+    chunk = os.urandom(SAMPLE_RATE * 2 * CHUNK_MS // 1000)
+    count = SESSION_SECONDS * 1000 // CHUNK_MS
+    if binary:
+        message = {"type": "websocket.receive", "bytes": chunk, "text": None}
+    else:
+        text = json.dumps({"type": "audio_chunk", "data": base64.b64encode(chunk).decode()})
+        message = {"type": "websocket.receive", "bytes": None, "text": text}
+    return [message] * count
+
+
+def dictation_messages() -> list[dict]:
+    """One session-minute of binary chunks of noise bursts (speech) and near-silence"""
+    rng = np.random.default_rng(0)
+    cycle = []
+    for seconds, level in ((SPEECH_S, 3000), (PAUSE_S, 10)):
+        cycle.append(rng.normal(0, level, SAMPLE_RATE * seconds).astype("<i2").tobytes())
+    audio = b"".join(cycle) * (SESSION_SECONDS // (SPEECH_S + PAUSE_S) + 1)
+    chunk = SAMPLE_RATE * 2 * CHUNK_MS // 1000
+    return [
+        {"type": "websocket.receive", "bytes": audio[i:i + chunk], "text": None}
+        for i in range(0, SAMPLE_RATE * 2 * SESSION_SECONDS, chunk)
+    ]
+
+
+def upstream_messages(messages: list[dict]) -> int:
+    """Number of messages the session will send upstream for the client messages"""
+    settings = get_settings()
+    if settings.realtime_vad_mode != "local":
+        return len(messages)
+    vad = StreamingVAD(
+        SAMPLE_RATE,
+        threshold_dbfs=settings.realtime_vad_threshold_dbfs,
+        min_speech_ms=settings.realtime_vad_min_speech_ms,
+        prefix_padding_ms=settings.realtime_vad_prefix_padding_ms,
+        silence_duration_ms=settings.realtime_vad_silence_duration_ms,
+    )
+    events = [event for m in messages for event, _ in vad.feed(m["bytes"])]
+    return events.count(AUDIO) + events.count(SPEECH_STOPPED)  # Appends and commits
+
+
+async def bench(label: str, binary: bool, messages: list[dict] = None) -> tuple[float, int]:
+    """Return CPU ms per session-minute and bytes sent upstream"""
+    messages = messages or session_messages(binary)
+    client_bytes = sum(len(m["bytes"] or m["text"]) for m in messages)
+    expected = upstream_messages(messages)
+    cpu = 0.0
+    for _ in range(ROUNDS):
+        upstream = FakeUpstreamSocket(expected)
+        session = RealtimeTranscriptionSession(client_ws=FakeClientSocket(messages, upstream))
+        session.openai_ws = upstream
+        session.is_running = True
+        start = time.process_time()
+        await session.proxy()
+        cpu += time.process_time() - start
+
+    cpu_ms = cpu / ROUNDS * 1000
+    print(
+        f"{label:>7}: {cpu_ms:.1f}ms CPU per session-minute, "
+        f"client {client_bytes / 1024:.0f} KiB, upstream {upstream.sent_bytes / 1024:.0f} KiB"
+    )
+    return cpu_ms, upstream.sent_bytes
+
+
+async def bench_vad() -> None:
+    messages = dictation_messages()
+    print(f"\ndictation: {SPEECH_S}s speech / {PAUSE_S}s pause")
+    os.environ["REALTIME_VAD_MODE"] = "server"
+    get_settings.cache_clear()
+    _, server_bytes = await bench("server", binary=True, messages=messages)
+    os.environ["REALTIME_VAD_MODE"] = "local"
+    get_settings.cache_clear()
+    _, local_bytes = await bench("local", binary=True, messages=messages)
+    del os.environ["REALTIME_VAD_MODE"]
+    get_settings.cache_clear()
+    print(f"local VAD: {1 - local_bytes / server_bytes:.0%} less audio sent upstream")
+
+
+async def fake_realtime_server(ws) -> None:
+    """Answer like the Realtime API: session.created, then session.updated"""
+    await asyncio.sleep(UPSTREAM_SETUP_S)
+    await ws.send(json.dumps({"type": "session.created"}))
+    async for message in ws:
+        if json.loads(message).get("type") == "session.update":
+            await ws.send(json.dumps({"type": "session.updated"}))
+
+
+class ReadyClientSocket:
+    """Client socket that waits for session_ready"""
+
+    def __init__(self):
+        self.ready = asyncio.Event()
+
+    async def receive(self) -> dict:
+        await asyncio.Event().wait()  # The client stays connected
+
+    async def send_json(self, data: dict) -> None:
+        if data["type"] == "session_ready":
+            self.ready.set()
+
+
+async def time_to_ready(label: str) -> float:
+    """Return the median ms from session start to session_ready"""
+    samples = []
+    for _ in range(SESSIONS):
+        client = ReadyClientSocket()
+        session = RealtimeTranscriptionSession(client_ws=client)
+        start = time.perf_counter()
+        task = asyncio.create_task(session.run())
+        await client.ready.wait()
+        samples.append((time.perf_counter() - start) * 1000)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        await session.cleanup()
+        await asyncio.sleep(0.3)  # Let the pool replace the session it handed out
+
+    p50 = statistics.median(samples)
+    print(f"{label:>7}: session_ready p50 {p50:.1f}ms")
+    return p50
+
+
+async def bench_pool() -> None:
+    async with websockets.serve(fake_realtime_server, "127.0.0.1", 0) as server:
+        port = server.sockets[0].getsockname()[1]
+        realtime_pool.OPENAI_REALTIME_URL = f"ws://127.0.0.1:{port}"
+        print(f"\n{SESSIONS} sessions, simulated upstream setup {UPSTREAM_SETUP_S * 1000:.0f}ms")
+
+        realtime_pool._realtime_pool = None
+        os.environ["REALTIME_POOL_SIZE"] = "0"
+        realtime_pool.get_settings.cache_clear()
+        cold = await time_to_ready("cold")
+
+        os.environ["REALTIME_POOL_SIZE"] = "2"
+        realtime_pool.get_settings.cache_clear()
+        pool = realtime_pool.get_realtime_pool()
+        pool.start()
+        await asyncio.sleep(UPSTREAM_SETUP_S * 3)
+        pooled = await time_to_ready("pooled")
+        await pool.close()
+        print(f"pool: {pool.stats()['hits']} hits, {pool.stats()['misses']} misses, {cold - pooled:.0f}ms saved")
+
+
+async def main():
+    logging.disable(logging.INFO)  # Skip per-session log lines
+    print(f"{SESSION_SECONDS}s of {CHUNK_MS}ms PCM16 chunks at {SAMPLE_RATE} Hz, {ROUNDS} rounds")
+    text, _ = await bench("json", binary=False)
+    binary, _ = await bench("binary", binary=True)
+    print(f"binary frames: {1 - binary / text:.0%} less proxy CPU")
+
+    await bench_vad()
+    await bench_pool()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Benchmark: provider payload size with and without Opus transcoding
+
+Synthesizes speech-like WAV, M4A and FLAC inputs, runs them through
+the process-pool AudioTranscoder and reports bytes saved, transcoding time
+and the upload time saved at a given uplink bandwidth. Requires PyAV
+(`pip install -e ".[audio]"`).
+"""
+import asyncio
+import io
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+# Add the parent directory to sys.path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.audio import AudioTranscoder
+from app.services.audio import codec
+
+
+DURATIONS_S = [5, 30, 120]
+SOURCE_RATE = 44100
+UPLINK_MBIT_S = 20
+
+
+def upload_ms(num_bytes: int) -> float:
+    """Time to send num_bytes over the benchmark uplink"""
+    return num_bytes * 8 / (UPLINK_MBIT_S * 1e6) * 1000
+
+
+def synth_speech(seconds: int) -> np.ndarray:
+    """Amplitude-modulated harmonics with pauses, roughly speech-like"""
+    rng = np.random.default_rng(0)
+    t = np.arange(seconds * SOURCE_RATE) / SOURCE_RATE
+    pitch = 140 + 30 * np.sin(2 * np.pi * 0.5 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / SOURCE_RATE
+    voice = sum(np.sin(k * phase) / k for k in range(1, 8))
+    syllables = np.clip(np.sin(2 * np.pi * 3 * t), 0, None) * (np.sin(2 * np.pi * 0.2 * t) > -0.5)
+    signal = 0.3 * voice * syllables + 0.01 * rng.standard_normal(t.size)
+    return (np.clip(signal, -1, 1) * 32767).astype(np.int16)
+
+
+def encode(samples: np.ndarray, container: str, codec_name: str) -> bytes:
+    """Encode mono s16 samples with PyAV"""
+    import av
+
+    output = io.BytesIO()
+    with av.open(output, "w", format=container) as sink:
+        stream = sink.add_stream(codec_name, rate=SOURCE_RATE, layout="mono")
+        frame_size = 1024
+        for start in range(0, samples.size, frame_size):
+            chunk = samples[start:start + frame_size]
+            frame = av.AudioFrame.from_ndarray(chunk.reshape(1, -1), format="s16", layout="mono")
+            frame.sample_rate = SOURCE_RATE
+            frame.pts = start
+            sink.mux(stream.encode(frame))
+        sink.mux(stream.encode(None))
+    return output.getvalue()
+
+
+async def main():
+    if not codec.is_available():
+        print("PyAV is not installed: pip install -e \".[audio]\"")
+        return
+
+    pool = ProcessPoolExecutor(max_workers=2)
+    transcoder = AudioTranscoder(
+        formats={"wav", "m4a", "flac"},
+        min_bytes=0,
+        sample_rate=16000,
+        bitrate=24000,
+        pool=pool,
+    )
+    print(f"upload time at {UPLINK_MBIT_S} Mbit/s")
+    try:
+        for seconds in DURATIONS_S:
+            samples = synth_speech(seconds)
+            inputs = {
+                "wav": encode(samples, "wav", "pcm_s16le"),
+                "m4a": encode(samples, "ipod", "aac"),
+                "flac": encode(samples, "flac", "flac"),
+            }
+            for audio_format, audio_bytes in inputs.items():
+                start = time.perf_counter()
+                result = await transcoder.transcode(audio_bytes, audio_format)
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                print(
+                    f"{seconds:>4}s {audio_format:>4}: {len(audio_bytes) / 1024:>8.0f} KiB -> "
+                    f"{len(result.audio_bytes) / 1024:>6.0f} KiB "
+                    f"(saved {result.bytes_saved / 1024:.0f} KiB), transcode {elapsed_ms:.0f}ms, "
+                    f"upload {upload_ms(len(audio_bytes)):.0f}ms -> {upload_ms(len(result.audio_bytes)):.0f}ms"
+                )
+        print(transcoder.stats())
+    finally:
+        pool.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""Benchmark: per-request CPU of multipart vs raw transcription uploads
+
+Sends the same audio to POST /v1/transcriptions (multipart/form-data) and
+POST /v1/transcriptions:raw (application/octet-stream) in-process, with auth,
+usage recording and the provider replaced by no-op fakes, so the measured
+CPU is request handling and body parsing. Request bodies are built once up
+front, so the client-side cost is the same for both endpoints.
+"""
+import asyncio
+import logging
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+import httpx
+
+# Add the parent directory to sys.path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.deps.auth import CurrentUser, verify_supabase_token
+from app.main import app
+from app.services.transcription import ProviderRegistry, TranscriptionProvider, TranscriptionResult
+from app.services.usage import get_usage_service
+
+
+ITERATIONS = 200
+AUDIO_SIZES = [64 * 1024, 1024 * 1024, 8 * 1024 * 1024]
+BOUNDARY = "bench-boundary-7f3a"
+
+
+class NoopProvider(TranscriptionProvider):
+    """Provider that answers immediately without an upstream call"""
+    name = "bench"
+    supported_models = ["bench"]
+    default_model = "bench"
+
+    async def transcribe(
+        self,
+        audio_bytes: bytes,
+        audio_format: str,
+        model: Optional[str] = None,
+        language: str = "en",
+        noisy_room: bool = False,
+    ) -> TranscriptionResult:
+        return TranscriptionResult(text="hello world", provider=self.name, model=self.default_model, latency_ms=0)
+
+
+class NoopUsageService:
+    """Usage service that never finds or stores anything"""
+
+    async def check_idempotency(self, user_id: str, idempotency_key: str) -> None:
+        return None
+
+    async def record_transcription(self, data) -> dict:
+        return {"id": str(uuid.uuid4()), "created_at": datetime.now(timezone.utc)}
+
+
+def multipart_body(audio: bytes) -> bytes:
+    """Build a multipart/form-data body equivalent to the client's upload"""
+    parts = []
+    for name, value in (("duration_ms", "5000"), ("audio_format", "wav"), ("provider", "bench")):
+        parts.append(
+            f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode()
+        )
+    parts.append(
+        f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="audio"; filename="audio.wav"\r\n'
+        f"Content-Type: audio/wav\r\n\r\n".encode()
+        + audio
+        + b"\r\n"
+    )
+    parts.append(f"--{BOUNDARY}--\r\n".encode())
+    return b"".join(parts)
+
+
+async def bench(client: httpx.AsyncClient, url: str, body: bytes, headers: dict) -> float:
+    """Send ITERATIONS requests sequentially and return CPU ms per request"""
+    start = time.process_time()
+    for _ in range(ITERATIONS):
+        response = await client.post(
+            url,
+            content=body,
+            headers={**headers, "Idempotency-Key": str(uuid.uuid4())},
+        )
+        assert response.status_code == 200, response.text
+    return (time.process_time() - start) * 1000 / ITERATIONS
+
+
+async def main():
+    logging.disable(logging.INFO)  # Skip per-request log lines
+    ProviderRegistry._initialized = True
+    ProviderRegistry.register(NoopProvider())
+    app.dependency_overrides[verify_supabase_token] = lambda: CurrentUser(id="bench-user")
+    app.dependency_overrides[get_usage_service] = lambda: NoopUsageService()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        print(f"{ITERATIONS} requests per endpoint, CPU ms per request")
+        for size in AUDIO_SIZES:
+            audio = os.urandom(size)
+            multipart = await bench(
+                client,
+                "/v1/transcriptions",
+                multipart_body(audio),
+                {"Content-Type": f"multipart/form-data; boundary={BOUNDARY}"},
+            )
+            raw = await bench(
+                client,
+                "/v1/transcriptions:raw?duration_ms=5000&audio_format=wav&provider=bench",
+                audio,
+                {"Content-Type": "application/octet-stream"},
+            )
+            print(
+                f"{size // 1024:>6} KiB: multipart {multipart:.3f}ms, raw {raw:.3f}ms "
+                f"({(1 - raw / multipart):.0%} less CPU)"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -17,6 +17,7 @@ CREATE TABLE IF NOT EXISTS transcription_requests (
     audio_format TEXT,
     language TEXT DEFAULT 'en',
     transcript_text TEXT NOT NULL,
+    word_count INTEGER NOT NULL DEFAULT 0,
     provider TEXT DEFAULT 'gemini',
     model TEXT DEFAULT 'gemini-2.5-flash-lite',
     provider_latency_ms INTEGER,
@@ -31,6 +32,12 @@ CREATE TABLE IF NOT EXISTS transcription_requests (
 CREATE INDEX IF NOT EXISTS idx_transcription_requests_user_created 
 ON transcription_requests (user_id, created_at DESC);
 
+-- Covering index for stats aggregation (index-only scans, no transcript reads)
+CREATE INDEX IF NOT EXISTS idx_transcription_requests_user_stats
+ON transcription_requests (user_id, created_at DESC)
+INCLUDE (duration_ms, word_count)
+WHERE status = 'success';
+
 -- Index for status filtering
 CREATE INDEX IF NOT EXISTS idx_transcription_requests_status 
 ON transcription_requests (status);
@@ -39,6 +46,36 @@ ON transcription_requests (status);
 CREATE INDEX IF NOT EXISTS idx_transcription_requests_provider 
 ON transcription_requests (provider);
 
+-- ============================================
+-- Function: get_usage_stats
+-- Aggregates a user's successful transcriptions since a timestamp
+-- (raw-table aggregate; use it to spot-check the usage_daily rollup)
+-- ============================================
+CREATE OR REPLACE FUNCTION get_usage_stats(p_user_id UUID, p_since TIMESTAMPTZ)
+RETURNS TABLE (
+    total_duration_ms BIGINT,
+    total_words BIGINT,
+    requests BIGINT,
+    last_activity_at TIMESTAMPTZ
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT
+        COALESCE(SUM(duration_ms), 0)::BIGINT,
+        COALESCE(SUM(word_count), 0)::BIGINT,
+        COUNT(*)::BIGINT,
+        MAX(created_at)
+    FROM transcription_requests
+    WHERE user_id = p_user_id
+      AND status = 'success'
+      AND created_at >= p_since;
+$$;
+
+-- Only the backend may call it (it takes an arbitrary user_id)
+REVOKE EXECUTE ON FUNCTION get_usage_stats(UUID, TIMESTAMPTZ) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION get_usage_stats(UUID, TIMESTAMPTZ) TO service_role;
+
 -- ============================================
 -- Row Level Security (RLS)
 -- ============================================
@@ -62,14 +99,124 @@ FOR SELECT
 TO authenticated
 USING (auth.uid() = user_id);
 
+-- ============================================
+-- Table: usage_daily
+-- One row per (user, UTC day, provider, model)
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS usage_daily (
+    user_id UUID NOT NULL,
+    day DATE NOT NULL,
+    provider TEXT NOT NULL,
+    model TEXT NOT NULL,
+    duration_ms BIGINT NOT NULL DEFAULT 0,
+    words BIGINT NOT NULL DEFAULT 0,
+    requests INTEGER NOT NULL DEFAULT 0,
+    last_activity_at TIMESTAMPTZ,
+
+    PRIMARY KEY (user_id, day, provider, model)
+);
+
+ALTER TABLE usage_daily ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Service role has full access"
+ON usage_daily
+FOR ALL
+TO service_role
+USING (true)
+WITH CHECK (true);
+
+-- ============================================
+-- Function: increment_usage_daily
+-- (called via RPC after each insert)
+-- ============================================
+
+CREATE OR REPLACE FUNCTION increment_usage_daily(
+    p_user_id UUID,
+    p_created_at TIMESTAMPTZ,
+    p_provider TEXT,
+    p_model TEXT,
+    p_duration_ms INTEGER,
+    p_words INTEGER
+)
+RETURNS VOID
+LANGUAGE sql
+AS $$
+    INSERT INTO usage_daily (user_id, day, provider, model, duration_ms, words, requests, last_activity_at)
+    VALUES (
+        p_user_id,
+        (p_created_at AT TIME ZONE 'UTC')::DATE,
+        p_provider,
+        p_model,
+        p_duration_ms,
+        p_words,
+        1,
+        p_created_at
+    )
+    ON CONFLICT (user_id, day, provider, model) DO UPDATE SET
+        duration_ms = usage_daily.duration_ms + EXCLUDED.duration_ms,
+        words = usage_daily.words + EXCLUDED.words,
+        requests = usage_daily.requests + 1,
+        last_activity_at = GREATEST(usage_daily.last_activity_at, EXCLUDED.last_activity_at);
+$$;
+
+-- ============================================
+-- Function: backfill_usage_daily (rebuilds rollup rows from transcription_requests)
+-- Idempotent. Increments that race with a running backfill can be
+-- overwritten, so re-run it for recent days (p_since) if writes were live.
+-- ============================================
+
+CREATE OR REPLACE FUNCTION backfill_usage_daily(p_since DATE DEFAULT NULL)
+RETURNS INTEGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    affected INTEGER;
+BEGIN
+    INSERT INTO usage_daily (user_id, day, provider, model, duration_ms, words, requests, last_activity_at)
+    SELECT
+        user_id,
+        (created_at AT TIME ZONE 'UTC')::DATE,
+        COALESCE(provider, 'gemini'),
+        COALESCE(model, 'gemini-2.5-flash-lite'),
+        SUM(duration_ms),
+        SUM(word_count),
+        COUNT(*),
+        MAX(created_at)
+    FROM transcription_requests
+    WHERE status = 'success'
+      AND (p_since IS NULL OR created_at >= p_since::TIMESTAMPTZ)
+    GROUP BY 1, 2, 3, 4
+    ON CONFLICT (user_id, day, provider, model) DO UPDATE SET
+        duration_ms = EXCLUDED.duration_ms,
+        words = EXCLUDED.words,
+        requests = EXCLUDED.requests,
+        last_activity_at = EXCLUDED.last_activity_at;
+
+    GET DIAGNOSTICS affected = ROW_COUNT;
+    RETURN affected;
+END;
+$$;
+
+-- Only the backend may call these
+REVOKE EXECUTE ON FUNCTION increment_usage_daily(UUID, TIMESTAMPTZ, TEXT, TEXT, INTEGER, INTEGER) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION increment_usage_daily(UUID, TIMESTAMPTZ, TEXT, TEXT, INTEGER, INTEGER) TO service_role;
+REVOKE EXECUTE ON FUNCTION backfill_usage_daily(DATE) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION backfill_usage_daily(DATE) TO service_role;
+
 -- ============================================
 -- Comments for documentation
 -- ============================================
 COMMENT ON TABLE transcription_requests IS 'Stores transcription requests and results for usage tracking';
 COMMENT ON COLUMN transcription_requests.idempotency_key IS 'Client-provided key to prevent duplicate processing';
 COMMENT ON COLUMN transcription_requests.duration_ms IS 'Audio duration in milliseconds (client-measured)';
+COMMENT ON COLUMN transcription_requests.word_count IS 'Whitespace-delimited word count of transcript_text, computed at insert';
 COMMENT ON COLUMN transcription_requests.provider IS 'Transcription provider used (gemini, openai, etc.)';
 COMMENT ON COLUMN transcription_requests.model IS 'Specific model used for transcription';
 COMMENT ON COLUMN transcription_requests.provider_latency_ms IS 'Time taken by the transcription provider API';
 COMMENT ON COLUMN transcription_requests.total_latency_ms IS 'Total request processing time';
 COMMENT ON COLUMN transcription_requests.status IS 'Request status: success, failed, etc.';
+COMMENT ON TABLE usage_daily IS 'Per-user daily usage rollup, maintained incrementally by the backend';
+COMMENT ON COLUMN usage_daily.day IS 'UTC calendar day of the transcriptions';
+COMMENT ON COLUMN usage_daily.duration_ms IS 'Total audio duration in milliseconds';
+COMMENT ON COLUMN usage_daily.words IS 'Total estimated words transcribed';
@@ -0,0 +1,70 @@
+-- sayFlow Backend Database Migration: Server-side Stats Aggregation
+-- Run this SQL in your Supabase SQL Editor to move GET /v1/stats aggregation into Postgres
+
+-- ============================================
+-- Step 1: Add a stored word count
+-- ============================================
+
+ALTER TABLE transcription_requests
+ADD COLUMN IF NOT EXISTS word_count INTEGER;
+
+-- Backfill existing rows (matches Python's len(text.split()))
+UPDATE transcription_requests
+SET word_count = CASE
+    WHEN btrim(transcript_text) = '' THEN 0
+    ELSE array_length(regexp_split_to_array(btrim(transcript_text), '\s+'), 1)
+END
+WHERE word_count IS NULL;
+
+ALTER TABLE transcription_requests
+ALTER COLUMN word_count SET DEFAULT 0,
+ALTER COLUMN word_count SET NOT NULL;
+
+-- ============================================
+-- Step 2: Covering index for stats queries
+-- ============================================
+
+CREATE INDEX IF NOT EXISTS idx_transcription_requests_user_stats
+ON transcription_requests (user_id, created_at DESC)
+INCLUDE (duration_ms, word_count)
+WHERE status = 'success';
+
+-- ============================================
+-- Step 3: Aggregation function (called via RPC)
+-- ============================================
+
+CREATE OR REPLACE FUNCTION get_usage_stats(p_user_id UUID, p_since TIMESTAMPTZ)
+RETURNS TABLE (
+    total_duration_ms BIGINT,
+    total_words BIGINT,
+    requests BIGINT,
+    last_activity_at TIMESTAMPTZ
+)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT
+        COALESCE(SUM(duration_ms), 0)::BIGINT,
+        COALESCE(SUM(word_count), 0)::BIGINT,
+        COUNT(*)::BIGINT,
+        MAX(created_at)
+    FROM transcription_requests
+    WHERE user_id = p_user_id
+      AND status = 'success'
+      AND created_at >= p_since;
+$$;
+
+REVOKE EXECUTE ON FUNCTION get_usage_stats(UUID, TIMESTAMPTZ) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION get_usage_stats(UUID, TIMESTAMPTZ) TO service_role;
+
+-- ============================================
+-- Step 4: Update comments
+-- ============================================
+
+COMMENT ON COLUMN transcription_requests.word_count IS 'Whitespace-delimited word count of transcript_text, computed at insert';
+
+-- ============================================
+-- Verification query (run after migration)
+-- ============================================
+
+-- SELECT * FROM get_usage_stats('<user-uuid>', NOW() - INTERVAL '30 days');
@@ -0,0 +1,116 @@
+-- sayFlow Backend Database Migration: Daily Usage Rollup
+-- Run this SQL in your Supabase SQL Editor, then run scripts/backfill_usage_daily.py
+-- (requires scripts/migrate_stats_aggregation.sql for the word_count column)
+
+-- ============================================
+-- Step 1: Rollup table
+-- One row per (user, UTC day, provider, model)
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS usage_daily (
+    user_id UUID NOT NULL,
+    day DATE NOT NULL,
+    provider TEXT NOT NULL,
+    model TEXT NOT NULL,
+    duration_ms BIGINT NOT NULL DEFAULT 0,
+    words BIGINT NOT NULL DEFAULT 0,
+    requests INTEGER NOT NULL DEFAULT 0,
+    last_activity_at TIMESTAMPTZ,
+
+    PRIMARY KEY (user_id, day, provider, model)
+);
+
+ALTER TABLE usage_daily ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Service role has full access"
+ON usage_daily
+FOR ALL
+TO service_role
+USING (true)
+WITH CHECK (true);
+
+-- ============================================
+-- Step 2: Incremental update (called via RPC after each insert)
+-- ============================================
+
+CREATE OR REPLACE FUNCTION increment_usage_daily(
+    p_user_id UUID,
+    p_created_at TIMESTAMPTZ,
+    p_provider TEXT,
+    p_model TEXT,
+    p_duration_ms INTEGER,
+    p_words INTEGER
+)
+RETURNS VOID
+LANGUAGE sql
+AS $$
+    INSERT INTO usage_daily (user_id, day, provider, model, duration_ms, words, requests, last_activity_at)
+    VALUES (
+        p_user_id,
+        (p_created_at AT TIME ZONE 'UTC')::DATE,
+        p_provider,
+        p_model,
+        p_duration_ms,
+        p_words,
+        1,
+        p_created_at
+    )
+    ON CONFLICT (user_id, day, provider, model) DO UPDATE SET
+        duration_ms = usage_daily.duration_ms + EXCLUDED.duration_ms,
+        words = usage_daily.words + EXCLUDED.words,
+        requests = usage_daily.requests + 1,
+        last_activity_at = GREATEST(usage_daily.last_activity_at, EXCLUDED.last_activity_at);
+$$;
+
+-- ============================================
+-- Step 3: Backfill (rebuilds rollup rows from transcription_requests)
+-- Idempotent. Increments that race with a running backfill can be
+-- overwritten, so re-run it for recent days (p_since) if writes were live.
+-- ============================================
+
+CREATE OR REPLACE FUNCTION backfill_usage_daily(p_since DATE DEFAULT NULL)
+RETURNS INTEGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    affected INTEGER;
+BEGIN
+    INSERT INTO usage_daily (user_id, day, provider, model, duration_ms, words, requests, last_activity_at)
+    SELECT
+        user_id,
+        (created_at AT TIME ZONE 'UTC')::DATE,
+        COALESCE(provider, 'gemini'),
+        COALESCE(model, 'gemini-2.5-flash-lite'),
+        SUM(duration_ms),
+        SUM(word_count),
+        COUNT(*),
+        MAX(created_at)
+    FROM transcription_requests
+    WHERE status = 'success'
+      AND (p_since IS NULL OR created_at >= p_since::TIMESTAMPTZ)
+    GROUP BY 1, 2, 3, 4
+    ON CONFLICT (user_id, day, provider, model) DO UPDATE SET
+        duration_ms = EXCLUDED.duration_ms,
+        words = EXCLUDED.words,
+        requests = EXCLUDED.requests,
+        last_activity_at = EXCLUDED.last_activity_at;
+
+    GET DIAGNOSTICS affected = ROW_COUNT;
+    RETURN affected;
+END;
+$$;
+
+-- Only the backend may call these
+REVOKE EXECUTE ON FUNCTION increment_usage_daily(UUID, TIMESTAMPTZ, TEXT, TEXT, INTEGER, INTEGER) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION increment_usage_daily(UUID, TIMESTAMPTZ, TEXT, TEXT, INTEGER, INTEGER) TO service_role;
+REVOKE EXECUTE ON FUNCTION backfill_usage_daily(DATE) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION backfill_usage_daily(DATE) TO service_role;
+
+-- ============================================
+-- Step 4: Comments
+-- ============================================
+
+COMMENT ON TABLE usage_daily IS 'Per-user daily usage rollup, maintained incrementally by the backend';
+COMMENT ON COLUMN usage_daily.day IS 'UTC calendar day of the transcriptions';
+COMMENT ON COLUMN usage_daily.duration_ms IS 'Total audio duration in milliseconds';
+COMMENT ON COLUMN usage_daily.words IS 'Total estimated words transcribed';
@@ -0,0 +1,543 @@
+#!/usr/bin/env python3
+"""Concurrency check for transcription providers
+
+Runs N simultaneous transcriptions against a fake upstream with a fixed
+latency and verifies they finish in roughly the time of one call. A provider
+that blocks the event loop would take N times as long.
+"""
+import asyncio
+import os
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from types import SimpleNamespace
+
+import httpx
+from jose import jwt
+
+# Add the parent directory to sys.path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core import admission as admission_module
+from app.core.admission import AdmissionController, AdmissionRejected
+from app.core.config import Settings, get_settings
+from app.core.singleflight import SingleFlight
+from app.deps.token_cache import TokenCache
+from app.services.transcription import gemini
+from app.services.transcription import openai as openai_provider
+from app.services.transcription.base import (
+    ConcurrencyLimiter,
+    ProviderBusyError,
+    ProviderUnavailableError,
+    TranscriptionError,
+    TranscriptionProvider,
+    TranscriptionResult,
+)
+from app.services.transcription.breaker import BreakerState, CircuitBreaker
+from app.services.transcription.hedging import HedgedProvider, HedgingPolicy
+from app.services.transcription.registry import ProviderRegistry, get_provider
+from bench_upload import CurrentUser, NoopProvider, NoopUsageService, app, get_usage_service, verify_supabase_token
+
+
+UPSTREAM_LATENCY_S = 0.5
+CONCURRENCY = 10
+
+
+class FakeGeminiModels:
+    """Stand-in for client.aio.models with a fixed response latency"""
+
+    async def generate_content(self, **kwargs):
+        await asyncio.sleep(UPSTREAM_LATENCY_S)
+        return SimpleNamespace(text="hello world")
+
+
+class FakeGeminiClient:
+    """Stand-in for genai.Client exposing only the async surface"""
+
+    def __init__(self):
+        self.aio = SimpleNamespace(models=FakeGeminiModels())
+
+
+class FakeOpenAITranscriptions:
+    """Stand-in for AsyncOpenAI.audio.transcriptions"""
+
+    async def create(self, **kwargs):
+        await asyncio.sleep(UPSTREAM_LATENCY_S)
+        return "hello world"
+
+
+class FakeOpenAIClient:
+    """Stand-in for AsyncOpenAI exposing only the transcription surface"""
+
+    def __init__(self):
+        self.audio = SimpleNamespace(transcriptions=FakeOpenAITranscriptions())
+
+
+async def run_concurrent(provider, n: int) -> float:
+    """Run n transcriptions concurrently and return wall-clock seconds"""
+    start = time.perf_counter()
+    results = await asyncio.gather(*[
+        provider.transcribe(audio_bytes=b"\x00" * 1024, audio_format="wav")
+        for _ in range(n)
+    ])
+    elapsed = time.perf_counter() - start
+    assert all(r.text == "hello world" for r in results)
+    return elapsed
+
+
+async def check_gemini() -> bool:
+    """Check Gemini transcriptions overlap instead of running serially"""
+    gemini.get_genai_client = lambda: FakeGeminiClient()
+    provider = gemini.GeminiTranscriptionProvider()
+
+    single = await run_concurrent(provider, 1)
+    many = await run_concurrent(provider, CONCURRENCY)
+    ok = many < single * 2
+
+    print(f"gemini: 1 call {single:.2f}s, {CONCURRENCY} concurrent {many:.2f}s -> {'OK' if ok else 'FAIL'}")
+    return ok
+
+
+async def check_openai() -> bool:
+    """Check OpenAI transcriptions overlap instead of running serially"""
+    openai_provider.get_openai_client = lambda: FakeOpenAIClient()
+    provider = openai_provider.OpenAITranscriptionProvider()
+
+    single = await run_concurrent(provider, 1)
+    many = await run_concurrent(provider, CONCURRENCY)
+    ok = many < single * 2
+
+    print(f"openai: 1 call {single:.2f}s, {CONCURRENCY} concurrent {many:.2f}s -> {'OK' if ok else 'FAIL'}")
+    return ok
+
+
+async def check_limiter() -> bool:
+    """Check calls beyond the concurrency + queue limit are rejected"""
+    limiter = ConcurrencyLimiter("fake", max_concurrent=2, max_queued=3)
+
+    async def call():
+        async with limiter:
+            await asyncio.sleep(0.1)
+
+    results = await asyncio.gather(*[call() for _ in range(8)], return_exceptions=True)
+    rejected = sum(isinstance(r, ProviderBusyError) for r in results)
+    ok = rejected == 3
+
+    print(f"limiter: 8 calls, 2 concurrent + 3 queued -> {rejected} rejected {'OK' if ok else 'FAIL'}")
+    return ok
+
+
+async def check_admission() -> bool:
+    """Check waiters are shed at their deadline and a full queue is rejected"""
+    admission = AdmissionController("fake", max_concurrent=2, max_queued=4, max_wait_ms=250)
+
+    async def call():
+        async with admission:
+            await asyncio.sleep(0.2)
+
+    results = await asyncio.gather(*[call() for _ in range(8)], return_exceptions=True)
+    reasons = [r.reason for r in results if isinstance(r, AdmissionRejected)]
+    stats = admission.stats()
+    # 2 run at once, 2 get a slot after 0.2s, the 2 after them pass 250ms, 2 find the queue full
+    ok = (
+        reasons.count("queue_full") == 2
+        and reasons.count("deadline") == 2
+        and stats["in_flight"] == 0
+        and stats["queued"] == 0
+    )
+
+    print(
+        f"admission: 8 calls, 2 concurrent + 4 queued, 250ms deadline -> "
+        f"{reasons.count('queue_full')} queue full, {reasons.count('deadline')} shed, "
+        f"wait p95 {stats['wait_ms_p95']}ms {'OK' if ok else 'FAIL'}"
+    )
+    return ok
+
+
+async def check_singleflight() -> bool:
+    """Check duplicate in-flight requests share one upstream call"""
+    singleflight = SingleFlight()
+    calls = 0
+
+    async def transcribe():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.1)
+        return "hello world"
+
+    results = await asyncio.gather(*[
+        singleflight.do(("user", "idempotency-key"), transcribe) for _ in range(CONCURRENCY)
+    ])
+    ok = calls == 1 and all(r == "hello world" for r in results)
+
+    print(f"singleflight: {CONCURRENCY} duplicate requests -> {calls} upstream call(s) {'OK' if ok else 'FAIL'}")
+    return ok
+
+
+async def check_token_cache() -> bool:
+    """Check cached tokens expire, the least recently used is evicted, and misses are shared"""
+    cache = TokenCache(max_entries=2, ttl_seconds=0.1)
+    calls = 0
+
+    async def verify(user="user", fail=False):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        if fail:
+            raise ValueError("invalid token")
+        return user
+
+    # Concurrent misses share one verification; a hit makes no call
+    await asyncio.gather(*[cache.get_or_verify("a", verify) for _ in range(CONCURRENCY)])
+    await cache.get_or_verify("a", verify)
+    coalesced = calls == 1
+
+    # "a" was used more recently than "b", so adding "c" evicts "b"
+    await cache.get_or_verify("b", verify)
+    await cache.get_or_verify("a", verify)
+    await cache.get_or_verify("c", verify)
+    calls = 0
+    await cache.get_or_verify("a", verify)
+    await cache.get_or_verify("b", verify)
+    evicted = calls == 1 and cache.evictions >= 1
+
+    # Entries expire after the TTL, or at once if the token's exp has passed
+    await asyncio.sleep(0.11)
+    calls = 0
+    await cache.get_or_verify("a", verify)
+    stale = jwt.encode({"exp": int(time.time()) - 1}, "secret")
+    await cache.get_or_verify(stale, verify)
+    await cache.get_or_verify(stale, verify)
+    expired = calls == 3
+
+    # Failures are not cached
+    failures = 0
+    for _ in range(2):
+        try:
+            await cache.get_or_verify("bad", lambda: verify(fail=True))
+        except ValueError:
+            failures += 1
+    not_cached = failures == 2 and calls == 5
+
+    ok = coalesced and evicted and expired and not_cached
+    print(
+        f"token cache: {CONCURRENCY} misses share one call {coalesced}, LRU eviction {evicted}, "
+        f"TTL expiry {expired}, failures not cached {not_cached} {'OK' if ok else 'FAIL'}"
+    )
+    return ok
+
+
+class SlowTailProvider(TranscriptionProvider):
+    """Fake provider where every `slow_every`-th call takes `slow_s`"""
+    supported_models = ["fake"]
+    default_model = "fake"
+
+    def __init__(self, name: str, fast_s: float, slow_s: float = 0.0, slow_every: int = 0):
+        self.name = name
+        self.fast_s = fast_s
+        self.slow_s = slow_s
+        self.slow_every = slow_every
+        self.calls = 0
+        self.cancelled = 0
+
+    async def transcribe(self, audio_bytes, audio_format, model=None, language="en", noisy_room=False):
+        self.calls += 1
+        slow = self.slow_every and self.calls % self.slow_every == 0
+        try:
+            await asyncio.sleep(self.slow_s if slow else self.fast_s)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return TranscriptionResult(text="hello world", latency_ms=0, provider=self.name, model="fake")
+
+
+async def check_hedging() -> bool:
+    """Check slow primary calls are beaten by a hedge and then cancelled"""
+    primary = SlowTailProvider("primary", fast_s=0.02, slow_s=1.0, slow_every=10)
+    secondary = SlowTailProvider("secondary", fast_s=0.05)
+    policy = HedgingPolicy(
+        secondary_provider="secondary",
+        secondary_model=None,
+        percentile=80,
+        min_delay_ms=0,
+        initial_delay_ms=100,
+        window_size=50,
+        min_samples=5,
+    )
+    provider = HedgedProvider(primary, secondary, None, policy)
+
+    latencies = []
+    for _ in range(40):
+        start = time.perf_counter()
+        result = await provider.transcribe(audio_bytes=b"\x00", audio_format="wav")
+        latencies.append(time.perf_counter() - start)
+        assert result.text == "hello world"
+
+    stats = policy.stats()
+    ok = max(latencies) < 0.5 and stats["secondary_wins"] == 4 and primary.cancelled == 4
+
+    print(
+        f"hedging: 40 calls, every 10th primary call 1s -> worst {max(latencies):.2f}s, "
+        f"hedge rate {stats['hedge_rate']:.0%}, secondary wins {stats['secondary_wins']} "
+        f"{'OK' if ok else 'FAIL'}"
+    )
+    return ok
+
+
+def check_breaker() -> bool:
+    """Check a breaker opens on errors, refuses calls, and closes after a good probe"""
+    breaker = CircuitBreaker(
+        "fake/fake",
+        window_size=10,
+        min_calls=4,
+        error_rate=0.5,
+        slow_call_ms=1000,
+        slow_rate=0.8,
+        open_seconds=0.1,
+        half_open_max_calls=1,
+    )
+    for ok in (True, False, True, False):
+        assert breaker.allow()
+        breaker.record(10, ok=ok)
+    opened = breaker.state == BreakerState.OPEN and not breaker.allow()
+
+    time.sleep(0.11)
+    probe = breaker.allow() and breaker.state == BreakerState.HALF_OPEN and not breaker.allow()
+    breaker.record(10, ok=False)
+    reopened = breaker.state == BreakerState.OPEN
+
+    time.sleep(0.11)
+    breaker.allow()
+    breaker.record(10, ok=True)
+    closed = breaker.state == BreakerState.CLOSED and breaker.allow()
+
+    ok = opened and probe and reopened and closed
+    print(
+        f"breaker: opens at 50% errors {opened}, one half-open probe {probe}, "
+        f"failed probe re-opens {reopened}, good probe closes {closed} {'OK' if ok else 'FAIL'}"
+    )
+    return ok
+
+
+class UpstreamStatusError(Exception):
+    """Stand-in for an SDK error carrying the provider's HTTP status"""
+
+    def __init__(self, status_code: int):
+        self.status_code = status_code
+        super().__init__(f"HTTP {status_code}")
+
+
+class ScriptedProvider(TranscriptionProvider):
+    """Fake provider that fails with `error` (an exception to raise) until it is cleared"""
+
+    def __init__(self, name: str, models: list[str]):
+        self.name = name
+        self.supported_models = models
+        self.default_model = models[0]
+        self.error: Exception = None
+        self.calls = 0
+
+    async def transcribe(self, audio_bytes, audio_format, model=None, language="en", noisy_room=False):
+        model_name = self.validate_model(model)
+        self.calls += 1
+        if isinstance(self.error, UpstreamStatusError):
+            raise TranscriptionError("Transcription failed", provider=self.name, model=model_name) from self.error
+        if self.error is not None:
+            raise self.error
+        return TranscriptionResult(text="hello world", latency_ms=0, provider=self.name, model=model_name)
+
+
+async def check_failover() -> bool:
+    """Check which failures move a request to another provider"""
+    primary = ScriptedProvider("gemini", ["gemini-model"])
+    other = ScriptedProvider("openai", ["openai-model"])
+    ProviderRegistry.reset()
+    ProviderRegistry._providers = {"gemini": primary, "openai": other}
+    ProviderRegistry._initialized = True
+
+    async def outcome(name, model=None, error=None) -> str:
+        primary.error = error
+        primary.calls = other.calls = 0
+        try:
+            provider = get_provider(name, model)
+            result = await provider.transcribe(audio_bytes=b"\x00", audio_format="wav", model=model)
+        except TranscriptionError as e:
+            return f"{type(e).__name__} after {primary.calls}+{other.calls} calls"
+        return f"{result.provider} after {primary.calls}+{other.calls} calls"
+
+    cases = {
+        # Pinned provider with another vendor's model: rejected, no call made
+        ("gemini", "openai-model", None): "TranscriptionError after 0+0 calls",
+        ("gemini", None, UpstreamStatusError(500)): "TranscriptionError after 1+0 calls",
+        (None, None, UpstreamStatusError(500)): "openai after 1+1 calls",
+        (None, None, UpstreamStatusError(400)): "TranscriptionError after 1+0 calls",
+        (None, None, ProviderBusyError("busy", provider="gemini")): "ProviderBusyError after 1+0 calls",
+        (None, None, ProviderUnavailableError("open", provider="gemini")): "openai after 1+1 calls",
+    }
+    ok = True
+    with settings_env(breaker_enabled=True):
+        for (name, model, error), expected in cases.items():
+            got = await outcome(name, model, error)
+            if got != expected:
+                ok = False
+                print(f"failover: provider={name} model={model} error={error!r}: {got}, expected {expected}")
+    ProviderRegistry.reset()
+
+    print(f"failover: {len(cases)} cases, only upstream failures and open breakers fail over {'OK' if ok else 'FAIL'}")
+    return ok
+
+
+@contextmanager
+def settings_env(**values):
+    """Override settings through the environment for the duration of a check"""
+    saved = {name: os.environ.get(name.upper()) for name in values}
+    os.environ.update({name.upper(): str(value) for name, value in values.items()})
+    get_settings.cache_clear()
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name.upper(), None)
+            else:
+                os.environ[name.upper()] = value
+        get_settings.cache_clear()
+
+
+def upload_client(**settings) -> httpx.AsyncClient:
+    """In-process client for the app with auth, usage recording and settings overridden"""
+    ProviderRegistry.reset()
+    ProviderRegistry.register(NoopProvider())
+    ProviderRegistry._initialized = True
+    app.dependency_overrides = {
+        verify_supabase_token: lambda: CurrentUser(id="user"),
+        get_usage_service: NoopUsageService,
+        get_settings: lambda: Settings(**settings),
+    }
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+async def check_upload_limits() -> bool:
+    """Check oversized uploads get 413 and incomplete ones 422, on both upload endpoints"""
+    limit = 1024 * 1024
+    big = b"\x00" * (limit + 1)
+
+    async def chunks():
+        for _ in range(4):
+            yield b"\x00" * (limit // 2)
+
+    def multipart(fields: dict, audio: bytes = None) -> dict:
+        boundary = "check-boundary"
+        parts = [
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode()
+            for name, value in fields.items()
+        ]
+        if audio is not None:
+            parts.append(
+                f'--{boundary}\r\nContent-Disposition: form-data; name="audio"; filename="a.wav"\r\n\r\n'.encode()
+                + audio
+                + b"\r\n"
+            )
+        parts.append(f"--{boundary}--\r\n".encode())
+        return {
+            "content": b"".join(parts),
+            "headers": {"Content-Type": f"multipart/form-data; boundary={boundary}"},
+        }
+
+    form = {"duration_ms": "1000", "audio_format": "wav", "provider": "bench"}
+    multi = "/v1/transcriptions"
+    raw = "/v1/transcriptions:raw?duration_ms=1000&audio_format=wav&provider=bench"
+    raw_no_duration = "/v1/transcriptions:raw?audio_format=wav"
+    octet = {"Content-Type": "application/octet-stream"}
+    cases = [
+        ("multipart ok", multi, multipart(form, b"RIFF"), 200, None),
+        ("multipart too large", multi, multipart(form, big), 413, None),
+        ("multipart no audio", multi, multipart(form), 422, "audio"),
+        ("multipart no duration", multi, multipart({"audio_format": "wav"}, b"RIFF"), 422, "duration_ms"),
+        ("raw ok", raw, {"content": b"RIFF", "headers": octet}, 200, None),
+        ("raw too large", raw, {"content": big, "headers": octet}, 413, None),
+        ("raw streamed too large", raw, {"content": chunks(), "headers": octet}, 413, None),
+        ("raw no duration", raw_no_duration, {"content": b"RIFF", "headers": octet}, 422, "duration_ms"),
+    ]
+    ok = True
+    async with upload_client(max_audio_mb=1) as client:
+        for label, url, request, expected, field in cases:
+            request["headers"] = {**request["headers"], "Idempotency-Key": str(uuid.uuid4())}
+            response = await client.post(url, **request)
+            fields = [e["loc"][-1] for e in response.json()["detail"]] if response.status_code == 422 else []
+            if response.status_code != expected or (field is not None and field not in fields):
+                ok = False
+                print(f"upload: {label}: {response.status_code} {response.text[:200]}, expected {expected}")
+    app.dependency_overrides = {}
+    ProviderRegistry.reset()
+
+    print(f"upload: {len(cases)} cases, 413 past {limit // 1024}KB, 422 for missing fields {'OK' if ok else 'FAIL'}")
+    return ok
+
+
+async def check_admission_route() -> bool:
+    """Check rejected transcriptions get 429 (queue full) or 503 (deadline) with Retry-After"""
+
+    class SlowProvider(NoopProvider):
+        async def transcribe(self, *args, **kwargs) -> TranscriptionResult:
+            await asyncio.sleep(0.2)
+            return await super().transcribe(*args, **kwargs)
+
+    async def wave(client: httpx.AsyncClient, n: int) -> list[tuple[int, str]]:
+        async def post():
+            response = await client.post(
+                "/v1/transcriptions:raw?duration_ms=1000&audio_format=wav&provider=bench",
+                content=b"RIFF",
+                headers={"Content-Type": "application/octet-stream", "Idempotency-Key": str(uuid.uuid4())},
+            )
+            return response.status_code, response.headers.get("Retry-After")
+
+        return sorted(await asyncio.gather(*[post() for _ in range(n)]), key=str)
+
+    with settings_env(admission_enabled=True):
+        async with upload_client() as client:
+            ProviderRegistry.register(SlowProvider())
+            # 1 runs, 1 waits, the third finds the queue full
+            admission_module._request_admission = AdmissionController("transcriptions", 1, 1)
+            queue_full = await wave(client, 3)
+            # With a 200ms hold time measured, a 100ms deadline sheds every waiter
+            admission_module._request_admission.max_wait_s = 0.1
+            deadline = await wave(client, 3)
+    admission_module._request_admission = None
+    app.dependency_overrides = {}
+    ProviderRegistry.reset()
+
+    ok = queue_full == [(200, None), (200, None), (429, "1")] and deadline == [
+        (200, None),
+        (503, "1"),
+        (503, "1"),
+    ]
+    print(
+        f"admission route: queue full -> {[code for code, _ in queue_full]}, "
+        f"deadline -> {[code for code, _ in deadline]}, all rejections carry Retry-After {'OK' if ok else 'FAIL'}"
+    )
+    return ok
+
+
+async def main():
+    results = [
+        await check_gemini(),
+        await check_openai(),
+        await check_limiter(),
+        await check_admission(),
+        await check_singleflight(),
+        await check_token_cache(),
+        await check_hedging(),
+        check_breaker(),
+        await check_failover(),
+        await check_upload_limits(),
+        await check_admission_route(),
+    ]
+    if not all(results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())